@@ -0,0 +1,245 @@
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.db import connections
+from django.db.models import DateField, FloatField, Func
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from menu.models import Category
+from orders.models import Earning, Order, OrderItem
+from tables.models import Table
+
+BUCKETS = ('hour', 'day', 'week', 'month')
+SOURCES = ('orders', 'earnings')
+BREAKDOWNS = ('order_type', 'table', 'category')
+# Longest range a report may cover, in days; a year of hourly buckets is ~9k.
+MAX_RANGE_DAYS = 400
+
+
+class ReportError(ValueError):
+    pass
+
+
+class Epoch(Func):
+    """
+    Seconds since 1970 as a float, computed by the database so rows skip the
+    per-row datetime parsing and timezone conversion.
+    """
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template="((julianday(%(expressions)s) - 2440587.5) * 86400.0)", **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='EXTRACT(EPOCH FROM %(expressions)s)::float', **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='UNIX_TIMESTAMP(%(expressions)s)', **extra_context)
+
+    def as_oracle(self, compiler, connection, **extra_context):
+        template = "((CAST(SYS_EXTRACT_UTC(%(expressions)s) AS DATE) - DATE '1970-01-01') * 86400)"
+        return self.as_sql(compiler, connection, template=template, **extra_context)
+
+
+def _float(field):
+    return Cast(field, FloatField())
+
+
+def _local_midnight(day, tz=None):
+    return datetime.combine(day, time.min, tzinfo=tz or timezone.get_current_timezone())
+
+
+def _next_midnight(day, bucket, tz):
+    if bucket == 'day':
+        day += timedelta(days=1)
+    elif bucket == 'week':
+        day += timedelta(days=7)
+    elif day.month == 12:
+        day = day.replace(year=day.year + 1, month=1)
+    else:
+        day = day.replace(month=day.month + 1)
+    return _local_midnight(day, tz)
+
+
+def bucket_edges(start, end, bucket):
+    """Local bucket start times covering [start, end), plus the final edge."""
+    tz = timezone.get_current_timezone()
+    local = start.astimezone(tz)
+    if bucket == 'hour':
+        # Absolute hours, so DST changes give 23- or 25-bucket days.
+        first = local.replace(minute=0, second=0, microsecond=0).timestamp()
+        count = int(-(-(end.timestamp() - first) // 3600))
+        return [datetime.fromtimestamp(first + 3600 * position, tz) for position in range(max(count, 1) + 1)]
+    day = local.date()
+    if bucket == 'week':
+        day -= timedelta(days=day.weekday())
+    elif bucket == 'month':
+        day = day.replace(day=1)
+    edges = [_local_midnight(day, tz)]
+    while edges[-1] < end:
+        edges.append(_next_midnight(edges[-1].date(), bucket, tz))
+    return edges
+
+
+def check_range(start, end):
+    if end <= start:
+        raise ReportError('end must be after start')
+    if end - start > timedelta(days=MAX_RANGE_DAYS):
+        raise ReportError(f'Reports cover at most {MAX_RANGE_DAYS} days')
+
+
+def _fetch(queryset):
+    """
+    Rows of a values_list() queryset straight from the cursor: the columns
+    are already plain numbers, so skip the ORM's per-row converters.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _column(values, dtype=np.float64):
+    values = list(values)
+    return np.fromiter(values, dtype=dtype, count=len(values))
+
+
+def load_orders(start, end):
+    """(created_at timestamps, total amounts, order types, table ids; 0 for none) for orders in [start, end)."""
+    rows = _fetch(
+        Order.objects.filter(created_at__gte=start, created_at__lt=end)
+        .order_by()
+        .values_list(Epoch('created_at'), _float('total_amount'), 'order_type', 'table_id')
+    )
+    if not rows:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=object), np.empty(0, dtype=np.int64)
+    timestamps, amounts, order_types, table_ids = zip(*rows)
+    return (
+        _column(timestamps),
+        _column(amounts),
+        np.array(order_types, dtype=object),
+        _column((table_id or 0 for table_id in table_ids), dtype=np.int64),
+    )
+
+
+def load_earnings(start, end):
+    """(timestamps, amounts) for earnings in [start, end); rows without completed_at count at local midnight."""
+    rows = _fetch(
+        Earning.objects.filter(date__gte=timezone.localtime(start).date(), date__lt=timezone.localtime(end).date() + timedelta(days=1))
+        .order_by()
+        .values_list('date', Epoch('completed_at'), _float('amount'))
+    )
+    to_date = DateField().to_python
+    timestamps = _column(
+        completed_at if completed_at is not None else _local_midnight(to_date(day)).timestamp()
+        for day, completed_at, _ in rows
+    )
+    amounts = _column(amount for _, _, amount in rows)
+    inside = (timestamps >= start.timestamp()) & (timestamps < end.timestamp())
+    return timestamps[inside], amounts[inside]
+
+
+def _bucket_index(timestamps, edges):
+    return np.searchsorted(np.array([edge.timestamp() for edge in edges]), timestamps, side='right') - 1
+
+
+def moving_average(values, window):
+    """Trailing mean over ``window`` buckets (fewer at the start of the series)."""
+    totals = np.cumsum(np.concatenate(([0.0], values)))
+    upper = np.arange(1, len(values) + 1)
+    lower = np.maximum(upper - window, 0)
+    return (totals[upper] - totals[lower]) / (upper - lower)
+
+
+def sales_series(start, end, bucket='day', source='orders', window=None):
+    """Revenue and counts per bucket in [start, end), zero-filled, with an optional moving average."""
+    check_range(start, end)
+    if source == 'earnings':
+        timestamps, amounts = load_earnings(start, end)
+    else:
+        timestamps, amounts, _, _ = load_orders(start, end)
+
+    edges = bucket_edges(start, end, bucket)
+    count = len(edges) - 1
+    index = _bucket_index(timestamps, edges)
+    revenue = np.bincount(index, weights=amounts, minlength=count)
+    counts = np.bincount(index, minlength=count)
+    average = moving_average(revenue, window) if window else None
+
+    series = []
+    for position in range(count):
+        point = {
+            'bucket': edges[position],
+            'revenue': round(float(revenue[position]), 2),
+            'count': int(counts[position]),
+        }
+        if average is not None:
+            point['moving_average'] = round(float(average[position]), 2)
+        series.append(point)
+    return {
+        'revenue': round(float(amounts.sum()), 2),
+        'count': int(len(amounts)),
+        'series': series,
+    }
+
+
+def _grouped(keys, amounts, quantities=None):
+    """Sum ``amounts`` (and count rows, or sum ``quantities``) per distinct key."""
+    if not len(keys):
+        return []
+    unique, inverse = np.unique(keys, return_inverse=True)
+    revenue = np.bincount(inverse, weights=amounts)
+    counts = np.bincount(inverse, weights=quantities) if quantities is not None else np.bincount(inverse)
+    return [
+        (key, round(float(revenue[position]), 2), int(counts[position]))
+        for position, key in enumerate(unique.tolist())
+    ]
+
+
+def breakdown(start, end, by):
+    """Revenue and volume per order type, table or menu category in [start, end), biggest first."""
+    check_range(start, end)
+    if by == 'category':
+        rows = _fetch(
+            OrderItem.objects.filter(order__created_at__gte=start, order__created_at__lt=end)
+            .order_by()
+            .values_list('dish__category_id', _float('price'), 'quantity')
+        )
+        category_ids, prices, quantities = zip(*rows) if rows else ((), (), ())
+        groups = _grouped(_column(category_ids, dtype=np.int64), _column(prices), _column(quantities))
+        labels = dict(Category.objects.filter(pk__in=[key for key, _, _ in groups]).values_list('pk', 'name'))
+        result = [{'key': key, 'label': labels.get(key, ''), 'revenue': revenue, 'quantity': count} for key, revenue, count in groups]
+    else:
+        _, amounts, order_types, table_ids = load_orders(start, end)
+        if by == 'order_type':
+            groups = _grouped(order_types.astype(str), amounts)
+            labels = {}
+        else:
+            groups = _grouped(table_ids, amounts)
+            labels = dict(Table.objects.filter(pk__in=[key for key, _, _ in groups]).values_list('pk', 'table_number'))
+            groups = [(key or None, revenue, count) for key, revenue, count in groups]
+        result = [
+            {'key': key, 'label': labels.get(key, key if by == 'order_type' else 'No table'), 'revenue': revenue, 'orders': count}
+            for key, revenue, count in groups
+        ]
+    return sorted(result, key=lambda row: -row['revenue'])
+
+
+def heatmap(start, end):
+    """
+    Orders and revenue by local weekday (0 = Monday) and hour of day in
+    [start, end), as two 7x24 grids.
+    """
+    check_range(start, end)
+    timestamps, amounts, _, _ = load_orders(start, end)
+    edges = bucket_edges(start, end, 'hour')
+    # Weekday/hour cell of every hourly bucket, so DST is handled by the edges.
+    cells = np.array([edge.weekday() * 24 + edge.hour for edge in edges[:-1]], dtype=np.int64)
+    cell = cells[_bucket_index(timestamps, edges)] if len(timestamps) else np.empty(0, dtype=np.int64)
+    orders = np.bincount(cell, minlength=7 * 24).reshape(7, 24)
+    revenue = np.bincount(cell, weights=amounts, minlength=7 * 24).reshape(7, 24)
+    return {
+        'orders': orders.tolist(),
+        'revenue': np.round(revenue, 2).tolist(),
+    }
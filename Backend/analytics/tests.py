@@ -0,0 +1,90 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from menu.models import Category, Dish
+from orders.models import Earning, Order, OrderItem
+from tables.models import Table
+from .reports import bucket_edges, moving_average
+
+
+class AnalyticsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.mains = Category.objects.create(name='Mains')
+        cls.drinks = Category.objects.create(name='Drinks')
+        cls.curry = Dish.objects.create(name='Curry', description='', price=Decimal('200.00'), category=cls.mains)
+        cls.lassi = Dish.objects.create(name='Lassi', description='', price=Decimal('50.00'), category=cls.drinks)
+        cls.table = Table.objects.create(table_number='T1', seats=4)
+        cls.day = timezone.localdate() - timedelta(days=10)
+        cls.noon = timezone.make_aware(datetime.combine(cls.day, time(12, 30)))
+
+        orders = [
+            (cls.noon, 'Dine In', cls.table, [(cls.curry, 2), (cls.lassi, 1)]),
+            (cls.noon + timedelta(hours=1), 'Takeaway', None, [(cls.curry, 1)]),
+            (cls.noon + timedelta(days=2), 'Dine In', cls.table, [(cls.lassi, 2)]),
+        ]
+        for created_at, order_type, table, lines in orders:
+            total = sum(dish.price * quantity for dish, quantity in lines)
+            order = Order.objects.create(customer_name='Guest', order_type=order_type, table=table, total_amount=total, status='Completed')
+            Order.objects.filter(pk=order.pk).update(created_at=created_at)
+            OrderItem.objects.bulk_create([
+                OrderItem(order=order, dish=dish, quantity=quantity, price=dish.price * quantity) for dish, quantity in lines
+            ])
+            Earning.objects.create(order=order, date=created_at.date(), completed_at=created_at, amount=total)
+
+    def report(self, name, **params):
+        params.setdefault('start', (self.day - timedelta(days=1)).isoformat())
+        params.setdefault('end', (self.day + timedelta(days=3)).isoformat())
+        return self.client.get(f'/api/analytics/{name}/', params)
+
+    def test_daily_sales_are_zero_filled(self):
+        with self.assertNumQueries(1):
+            response = self.report('sales', moving_average=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([point['revenue'] for point in response.data['series']], [0, 650, 0, 100, 0])
+        self.assertEqual([point['count'] for point in response.data['series']], [0, 2, 0, 1, 0])
+        self.assertEqual([point['moving_average'] for point in response.data['series']], [0, 325, 325, 50, 50])
+        self.assertEqual(response.data['revenue'], 750)
+
+        earnings = self.report('sales', source='earnings', bucket='hour')
+        hours = [point for point in earnings.data['series'] if point['count']]
+        self.assertEqual([(point['bucket'].hour, point['revenue']) for point in hours], [(12, 450), (13, 200), (12, 100)])
+
+    def test_breakdowns(self):
+        by_type = self.report('breakdown', by='order_type').data['results']
+        self.assertEqual(by_type, [
+            {'key': 'Dine In', 'label': 'Dine In', 'revenue': 550, 'orders': 2},
+            {'key': 'Takeaway', 'label': 'Takeaway', 'revenue': 200, 'orders': 1},
+        ])
+        by_table = self.report('breakdown', by='table').data['results']
+        self.assertEqual([(row['key'], row['label']) for row in by_table], [(self.table.pk, 'T1'), (None, 'No table')])
+        by_category = self.report('breakdown', by='category').data['results']
+        self.assertEqual(by_category, [
+            {'key': self.mains.pk, 'label': 'Mains', 'revenue': 600, 'quantity': 3},
+            {'key': self.drinks.pk, 'label': 'Drinks', 'revenue': 150, 'quantity': 3},
+        ])
+
+    def test_heatmap(self):
+        grids = self.report('heatmap').data
+        weekday = self.day.weekday()
+        self.assertEqual(grids['orders'][weekday][12], 1)
+        self.assertEqual(grids['revenue'][weekday][13], 200)
+        self.assertEqual(sum(map(sum, grids['orders'])), 3)
+
+    def test_validation(self):
+        self.assertEqual(self.report('sales', bucket='fortnight').status_code, 400)
+        self.assertEqual(self.report('sales', moving_average='0').status_code, 400)
+        self.assertEqual(self.report('breakdown', by='waiter').status_code, 400)
+        self.assertEqual(self.report('sales', start='2020-01-01', end='2026-01-01').status_code, 400)
+        self.assertEqual(self.report('heatmap', start='yesterday').status_code, 400)
+
+    def test_bucket_edges_and_moving_average(self):
+        start = timezone.make_aware(datetime(2026, 1, 15, 10))
+        months = bucket_edges(start, start + timedelta(days=60), 'month')
+        self.assertEqual([edge.date().isoformat() for edge in months], ['2026-01-01', '2026-02-01', '2026-03-01', '2026-04-01'])
+        weeks = bucket_edges(start, start + timedelta(days=1), 'week')
+        self.assertEqual(weeks[0].weekday(), 0)
+        self.assertEqual(moving_average([1.0, 2.0, 3.0, 4.0], 3).tolist(), [1.0, 1.5, 2.0, 3.0])
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from orders.filters import parse_bound
+from . import reports
+from .reports import BREAKDOWNS, BUCKETS, SOURCES, ReportError
+
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """
+    Sales reports over any date range, computed in memory from one columnar
+    query per report:
+
+    ?start=2026-01-01&end=2026-12-31 (inclusive local days or ISO datetimes;
+    defaults to the last 30 days)
+    """
+
+    def get_range(self, request):
+        params = request.query_params
+        end = parse_bound('end', params['end'], end_of_day=True) if params.get('end') else timezone.now()
+        start = parse_bound('start', params['start']) if params.get('start') else end - timedelta(days=30)
+        return start, end
+
+    def error(self, message):
+        return Response({'error': message}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'])
+    def sales(self, request):
+        """
+        Revenue and count per bucket: ?bucket=hour|day|week|month
+        ?source=orders|earnings ?moving_average=<buckets>
+        """
+        bucket = request.query_params.get('bucket', 'day')
+        source = request.query_params.get('source', 'orders')
+        window = request.query_params.get('moving_average')
+        if bucket not in BUCKETS:
+            return self.error(f"bucket must be one of {', '.join(BUCKETS)}")
+        if source not in SOURCES:
+            return self.error(f"source must be one of {', '.join(SOURCES)}")
+        if window is not None and (not window.isdigit() or int(window) < 1):
+            return self.error('moving_average must be a positive number of buckets')
+        start, end = self.get_range(request)
+        try:
+            report = reports.sales_series(start, end, bucket=bucket, source=source, window=int(window) if window else None)
+        except ReportError as exc:
+            return self.error(str(exc))
+        return Response({'start': start, 'end': end, 'bucket': bucket, 'source': source, **report})
+
+    @action(detail=False, methods=['get'])
+    def breakdown(self, request):
+        """Revenue per ?by=order_type|table|category."""
+        by = request.query_params.get('by', 'order_type')
+        if by not in BREAKDOWNS:
+            return self.error(f"by must be one of {', '.join(BREAKDOWNS)}")
+        start, end = self.get_range(request)
+        try:
+            rows = reports.breakdown(start, end, by)
+        except ReportError as exc:
+            return self.error(str(exc))
+        return Response({'start': start, 'end': end, 'by': by, 'results': rows})
+
+    @action(detail=False, methods=['get'])
+    def heatmap(self, request):
+        """Orders and revenue by weekday (rows, Monday first) and hour of day (columns)."""
+        start, end = self.get_range(request)
+        try:
+            grids = reports.heatmap(start, end)
+        except ReportError as exc:
+            return self.error(str(exc))
+        return Response({'start': start, 'end': end, **grids})
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.template.loader import render_to_string
+
+from core.jobs import job
+from userauth.models import User
+
+
+def send_templated_email(subject, template, context, to):
+    text_body = render_to_string(f'email/{template}.txt', context)
+    html_body = render_to_string(f'email/{template}.html', context)
+
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=to,
+        body=text_body
+    )
+
+    msg.attach_alternative(html_body, "text/html")
+    msg.send()
+
+
+@job('emails.password_reset')
+def send_password_reset_email(user_id):
+    user = User.objects.get(pk=user_id)
+    context = {
+        'otp': user.otp,
+        'user': user,
+    }
+    send_templated_email('DineEase Password Reset Request', 'password_reset', context, [user.email])
+
+
+@job('emails.password_changed')
+def send_password_changed_email(user_id, timestamp):
+    user = User.objects.get(pk=user_id)
+    context = {
+        'user': user,
+        'timestamp': timestamp,
+    }
+    send_templated_email('Your DineEase Password Has Been Changed', 'password_changed', context, [user.email])
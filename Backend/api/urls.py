@@ -16,6 +16,9 @@ urlpatterns = [
     path('', include('tables.urls')),
     path('', include('menu.urls')),
     path('', include('orders.urls')),
+    path('', include('customers.urls')),
+    path('', include('core.urls')),
+    path('', include('analytics.urls')),
 
     path('user/token/', api_views.MyTokenObtainPairView.as_view(), name='Token Obtain Pair View'),
     path('user/token/refresh/', api_views.MyTokenRefreshView.as_view(), name="Token Refresh View"),
@@ -4,12 +4,10 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound
 from django.utils import timezone
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.conf import settings
 import pytz
 
 from api import serializers as api_serializers
+from core.jobs import enqueue
 from userauth.models import User
 from .serializers import UserSerializer, UserProfileSerializer
 
@@ -76,24 +74,7 @@ class PasswordResetEmailVerifyAPIView(generics.GenericAPIView):
         user.otp = generate_otp(6)
         user.save()
 
-        context = {
-            'otp': user.otp,
-            'user': user,
-        }
-
-        subject = 'DineEase Password Reset Request'
-        text_body = render_to_string('email/password_reset.txt', context)
-        html_body = render_to_string('email/password_reset.html', context)
-
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[user.email],
-            body=text_body
-        )
-
-        msg.attach_alternative(html_body, "text/html")
-        msg.send()
+        enqueue('emails.password_reset', user_id=user.pk)
 
         return Response({"detail": "Password reset OTP has been sent to your email."}, status=status.HTTP_200_OK)
 
@@ -131,25 +112,12 @@ class PasswordChangeAPIView(generics.CreateAPIView):
             now_utc = timezone.now()
             ist = pytz.timezone('Asia/Kolkata')
             now_ist = now_utc.astimezone(ist)
-            context = {
-                'user': user,
-                'timestamp': now_ist.strftime('%B %d, %Y at %I:%M %p %Z')
-            }
-
-            subject = 'Your DineEase Password Has Been Changed'
-            text_body = render_to_string('email/password_changed.txt', context)
-            html_body = render_to_string('email/password_changed.html', context)
-
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[user.email],
-                body=text_body
+            enqueue(
+                'emails.password_changed',
+                user_id=user.pk,
+                timestamp=now_ist.strftime('%B %d, %Y at %I:%M %p %Z'),
             )
 
-            msg.attach_alternative(html_body, "text/html")
-            msg.send()
-
             return Response({"detail": "Password reset successful."}, status=status.HTTP_201_CREATED)
 
         return Response({"detail": "Invalid OTP or user."}, status=status.HTTP_400_BAD_REQUEST)
@@ -1,4 +1,6 @@
 
+# Serve with an ASGI server (e.g. `uvicorn backend.asgi:application`) so the
+# /api/events/ stream runs as coroutines instead of pinning worker threads.
 import os
 
 from django.core.asgi import get_asgi_application
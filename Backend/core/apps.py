@@ -1,5 +1,17 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .db import configure_sqlite
+        from .sync import connect_tombstones
+
+        connection_created.connect(configure_sqlite, dispatch_uid='core-configure-sqlite')
+        connect_tombstones()
+        # Register @job functions declared in each app's tasks module.
+        autodiscover_modules('tasks')
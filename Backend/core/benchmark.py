@@ -0,0 +1,280 @@
+import json
+import math
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+# Account created by seed_restaurant and used for the auth scenarios.
+BENCH_EMAIL = 'bench@dineease.local'
+BENCH_PASSWORD = 'bench-pass-123'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+class InProcessTransport:
+    """Drives the app through Django's test client, counting queries per request."""
+
+    counts_queries = True
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def request(self, method, path, body=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.generic(
+                method,
+                path,
+                json.dumps(body) if body is not None else '',
+                content_type='application/json',
+            )
+        return response.status_code, response.content, len(queries)
+
+    def close(self):
+        connection.close()
+
+
+class HttpTransport:
+    """Drives a running server (runserver, gunicorn, uvicorn) over HTTP."""
+
+    counts_queries = False
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.read(), None
+        except urllib.error.HTTPError as error:
+            return error.code, error.read(), None
+
+    def close(self):
+        pass
+
+
+class Fixtures:
+    """Ids the scenarios pick from, read once before the run."""
+
+    def __init__(self):
+        from menu.models import Dish
+        from orders.models import ACTIVE_STATUSES, Order
+        from tables.models import Table
+
+        self.dish_ids = list(Dish.objects.values_list('pk', flat=True)[:500])
+        self.table_ids = list(Table.objects.values_list('pk', flat=True))
+        self.open_order_ids = list(
+            Order.objects.filter(status__in=ACTIVE_STATUSES).order_by('-created_at').values_list('pk', flat=True)[:500]
+        )
+
+
+class Session:
+    """Per-worker state: a refresh token to rotate and the orders it created."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.refresh = None
+        self.order_ids = []
+
+
+def order_payload(fixtures, rng):
+    return {
+        'customer_name': f'Bench Guest {rng.randint(1, 500)}',
+        'order_type': rng.choice(['Dine In', 'Takeaway']),
+        'status': 'Pending',
+        'items': [
+            {'dish': dish, 'quantity': rng.randint(1, 3)}
+            for dish in rng.sample(fixtures.dish_ids, min(len(fixtures.dish_ids), rng.randint(1, 4)))
+        ],
+    }
+
+
+def orders_list(fixtures, session):
+    yield 'orders.list', 'GET', '/api/orders/?page_size=50', None
+
+
+def orders_create(fixtures, session):
+    status_code, content = yield 'orders.create', 'POST', '/api/orders/', order_payload(fixtures, session.rng)
+    if status_code == 201:
+        session.order_ids.append(json.loads(content)['id'])
+
+
+def orders_patch(fixtures, session):
+    candidates = session.order_ids or fixtures.open_order_ids
+    if not candidates:
+        return
+    order_id = session.rng.choice(candidates)
+    status = session.rng.choice(['Pending', 'In Progress'])
+    yield 'orders.patch', 'PATCH', f'/api/orders/{order_id}/', {'status': status}
+
+
+def earnings_performance(fixtures, session):
+    yield 'earnings.performance', 'GET', '/api/earnings/performance/', None
+
+
+def analytics_sales(fixtures, session):
+    yield 'analytics.sales', 'GET', '/api/analytics/sales/?bucket=day&moving_average=7', None
+
+
+def menu_snapshot(fixtures, session):
+    yield 'menu.snapshot', 'GET', '/api/menu/snapshot/', None
+
+
+def tables_book(fixtures, session):
+    if not fixtures.table_ids:
+        return
+    table_id = session.rng.choice(fixtures.table_ids)
+    status_code, _content = yield 'tables.book', 'POST', f'/api/tables/{table_id}/book/', {
+        'customer_name': 'Bench Booking',
+        'booking_time': '2030-01-01T19:00:00Z',
+    }
+    if status_code < 400:
+        yield 'tables.free', 'POST', f'/api/tables/{table_id}/free/', None
+
+
+def auth_token(fixtures, session):
+    status_code, content = yield 'auth.token', 'POST', '/api/user/token/', {
+        'email': BENCH_EMAIL,
+        'password': BENCH_PASSWORD,
+    }
+    if status_code == 200:
+        session.refresh = json.loads(content)['refresh']
+
+
+def auth_refresh(fixtures, session):
+    if session.refresh is None:
+        yield from auth_token(fixtures, session)
+    if session.refresh is None:
+        return
+    status_code, content = yield 'auth.refresh', 'POST', '/api/user/token/refresh/', {'refresh': session.refresh}
+    if status_code == 200:
+        session.refresh = json.loads(content).get('refresh', session.refresh)
+
+
+# Each scenario is a generator yielding (label, method, path, body) and
+# receiving (status_code, content) back, so one step can chain requests.
+SCENARIOS = {
+    'orders.list': orders_list,
+    'orders.create': orders_create,
+    'orders.patch': orders_patch,
+    'earnings.performance': earnings_performance,
+    'analytics.sales': analytics_sales,
+    'menu.snapshot': menu_snapshot,
+    'tables.book': tables_book,
+    'auth.token': auth_token,
+    'auth.refresh': auth_refresh,
+}
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+
+    def add(self, label, status_code, elapsed, queries):
+        with self._lock:
+            self.samples.setdefault(label, []).append((status_code, elapsed, queries))
+
+
+def run_step(transport, recorder, scenario, fixtures, session):
+    steps = scenario(fixtures, session)
+    try:
+        label, method, path, body = next(steps)
+        while True:
+            started = time.perf_counter()
+            try:
+                status_code, content, queries = transport.request(method, path, body)
+                outcome = status_code
+            except Exception as exc:
+                # Reported under the exception name instead of a status code.
+                status_code, content, queries = 0, b'', None
+                outcome = type(exc).__name__
+            recorder.add(label, outcome, time.perf_counter() - started, queries)
+            label, method, path, body = steps.send((status_code, content))
+    except StopIteration:
+        pass
+
+
+def summarize(samples, wall_time):
+    latencies = sorted(elapsed * 1000 for _status, elapsed, _queries in samples)
+    queries = [count for _status, _elapsed, count in samples if count is not None]
+    status_counts = {}
+    for outcome, _elapsed, _queries in samples:
+        status_counts[str(outcome)] = status_counts.get(str(outcome), 0) + 1
+    return {
+        'requests': len(samples),
+        'errors': sum(
+            1 for outcome, _elapsed, _queries in samples
+            if not (isinstance(outcome, int) and 200 <= outcome < 400)
+        ),
+        'status_counts': status_counts,
+        'rps': round(len(samples) / wall_time, 1) if wall_time else None,
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies), 2),
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2),
+        },
+        'queries_per_request': round(statistics.fmean(queries), 2) if queries else None,
+    }
+
+
+def run_benchmark(transport, scenarios, requests=200, concurrency=8, seed=0):
+    """
+    Run each scenario ``requests`` times across ``concurrency`` workers, one
+    scenario at a time so their numbers don't mix. Returns a JSON-ready dict.
+    """
+    fixtures = Fixtures()
+    sessions = [Session(random.Random(seed + worker)) for worker in range(concurrency)]
+    results = {}
+
+    for name in scenarios:
+        scenario = SCENARIOS[name]
+        recorder = Recorder()
+
+        def worker(index):
+            session = sessions[index]
+            try:
+                for _ in range(index, requests, concurrency):
+                    run_step(transport, recorder, scenario, fixtures, session)
+            finally:
+                transport.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(worker, range(concurrency)))
+        wall_time = time.perf_counter() - started
+
+        for label, samples in recorder.samples.items():
+            results[label] = summarize(samples, wall_time)
+
+    return {
+        'transport': type(transport).__name__,
+        'concurrency': concurrency,
+        'requests_per_scenario': requests,
+        'results': results,
+    }
@@ -0,0 +1,9 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+
+def day_bounds(day):
+    """The aware [start, end) datetimes of the local calendar ``day``."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
@@ -0,0 +1,18 @@
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created receiver applying SQLITE_PRAGMAS to SQLite connections."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def use_trigram_search(using='default'):
+    """Whether fuzzy search should use PostgreSQL's pg_trgm (SEARCH_TRIGRAM)."""
+    from django.db import connections
+
+    return getattr(settings, 'SEARCH_TRIGRAM', False) and connections[using].vendor == 'postgresql'
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Event(NamedTuple):
+    id: str
+    type: str
+    data: dict
+
+    def encode(self):
+        """Server-sent events wire format."""
+        payload = json.dumps(self.data, cls=DjangoJSONEncoder)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class BaseBroker:
+    """
+    Fan-out of restaurant events to stream subscribers.
+
+    ``read(after_id, timeout)`` returns ``(events, reset)``: the events
+    published after ``after_id`` (waiting up to ``timeout`` seconds for at
+    least one), and whether ``after_id`` has fallen out of the retained
+    history so the client has to reload its state instead of resuming.
+    """
+
+    def publish(self, event_type, data):
+        raise NotImplementedError
+
+    def latest_id(self):
+        raise NotImplementedError
+
+    def read(self, after_id, timeout=0):
+        raise NotImplementedError
+
+    async def aread(self, after_id, timeout=0):
+        from asgiref.sync import sync_to_async
+
+        return await sync_to_async(self.read, thread_sensitive=False)(after_id, timeout)
+
+
+class InMemoryBroker(BaseBroker):
+    """Process-local broker keeping the last ``history`` events for resume."""
+
+    def __init__(self, history=1000):
+        self._events = deque(maxlen=history)
+        self._next_id = 1
+        self._condition = threading.Condition()
+        self._waiters = set()
+
+    def publish(self, event_type, data):
+        with self._condition:
+            event = Event(str(self._next_id), event_type, data)
+            self._next_id += 1
+            self._events.append(event)
+            self._condition.notify_all()
+            waiters = list(self._waiters)
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(waiter.set)
+        return event
+
+    def latest_id(self):
+        with self._condition:
+            return str(self._next_id - 1)
+
+    def _collect(self, after_id):
+        try:
+            after = int(after_id)
+        except (TypeError, ValueError):
+            return [], True
+        if after >= self._next_id:
+            # Id from before a restart.
+            return [], True
+        if self._events and after < int(self._events[0].id) - 1:
+            return [], True
+        return [event for event in self._events if int(event.id) > after], False
+
+    def read(self, after_id, timeout=0):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                events, reset = self._collect(after_id)
+                remaining = deadline - time.monotonic()
+                if events or reset or remaining <= 0:
+                    return events, reset
+                self._condition.wait(remaining)
+
+    async def aread(self, after_id, timeout=0):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._condition:
+            events, reset = self._collect(after_id)
+            if events or reset or timeout <= 0:
+                return events, reset
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                self._waiters.discard(waiter)
+        with self._condition:
+            return self._collect(after_id)
+
+
+class RedisBroker(BaseBroker):
+    """
+    Broker backed by a Redis stream so every worker process sees the same
+    events. Requires the ``redis`` package.
+    """
+
+    def __init__(self, url='redis://localhost:6379/0', stream='dineease:events', history=10000):
+        import redis
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._stream = stream
+        self._history = history
+
+    def publish(self, event_type, data):
+        payload = json.dumps(data, cls=DjangoJSONEncoder)
+        event_id = self._client.xadd(
+            self._stream,
+            {'type': event_type, 'data': payload},
+            maxlen=self._history,
+            approximate=True,
+        )
+        return Event(event_id, event_type, data)
+
+    def latest_id(self):
+        entries = self._client.xrevrange(self._stream, count=1)
+        return entries[0][0] if entries else '0-0'
+
+    def read(self, after_id, timeout=0):
+        oldest = self._client.xrange(self._stream, count=1)
+        if oldest and after_id not in ('0', '0-0') and self._compare(after_id, oldest[0][0]) < 0:
+            return [], True
+        block = int(timeout * 1000) or None
+        response = self._client.xread({self._stream: after_id}, block=block)
+        events = []
+        for _stream, entries in response or ():
+            for event_id, fields in entries:
+                events.append(Event(event_id, fields['type'], json.loads(fields['data'])))
+        return events, False
+
+    @staticmethod
+    def _compare(left, right):
+        def key(value):
+            millis, _, seq = value.partition('-')
+            return int(millis), int(seq or 0)
+        try:
+            return (key(left) > key(right)) - (key(left) < key(right))
+        except ValueError:
+            return -1
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = getattr(settings, 'EVENT_BROKER', {})
+                backend = import_string(config.get('BACKEND', 'core.events.InMemoryBroker'))
+                _broker = backend(**config.get('OPTIONS', {}))
+    return _broker
+
+
+def publish(event_type, **data):
+    """Publish an event once the current transaction (if any) commits."""
+    transaction.on_commit(lambda: get_broker().publish(event_type, data))
@@ -0,0 +1,101 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+# Running jobs whose worker went away are re-queued after this long.
+STALE_AFTER = timedelta(minutes=10)
+
+
+def job(name):
+    """
+    Register a function as a background job:
+
+        @job('emails.password_reset')
+        def send_password_reset_email(user_id): ...
+
+    Job kwargs are stored as JSON, so pass ids rather than model instances.
+    Modules named ``tasks`` in installed apps are imported at startup.
+    """
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, *, delay=None, max_attempts=5, **kwargs):
+    """Queue a registered job. Written in the caller's transaction."""
+    if name not in _registry:
+        raise KeyError(f"Unknown job: {name}")
+    run_at = timezone.now() + (delay or timedelta())
+    return Job.objects.create(name=name, kwargs=kwargs, run_at=run_at, max_attempts=max_attempts)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def requeue_stale():
+    return Job.objects.filter(status='running', locked_at__lt=timezone.now() - STALE_AFTER).update(
+        status='queued',
+        locked_at=None,
+    )
+
+
+def claim_batch(limit=10):
+    """Claim up to ``limit`` due jobs with conditional updates (safe across workers)."""
+    now = timezone.now()
+    candidates = Job.objects.filter(status='queued', run_at__lte=now).order_by('run_at', 'pk').values_list('pk', flat=True)[:limit]
+    claimed = []
+    for pk in candidates:
+        if Job.objects.filter(pk=pk, status='queued').update(status='running', locked_at=now, attempts=F('attempts') + 1):
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'pk'))
+
+
+def execute(job_row):
+    func = _registry.get(job_row.name)
+    try:
+        if func is None:
+            raise KeyError(f"Unknown job: {job_row.name}")
+        func(**job_row.kwargs)
+    except Exception:
+        job_row.last_error = traceback.format_exc()
+        job_row.locked_at = None
+        if job_row.attempts >= job_row.max_attempts:
+            job_row.status = 'failed'
+            job_row.finished_at = timezone.now()
+            logger.error("Job %s failed permanently after %s attempts", job_row, job_row.attempts)
+        else:
+            job_row.status = 'queued'
+            job_row.run_at = timezone.now() + retry_delay(job_row.attempts)
+            logger.warning("Job %s failed, retrying at %s", job_row, job_row.run_at)
+        job_row.save(update_fields=['status', 'run_at', 'locked_at', 'finished_at', 'last_error'])
+        return False
+
+    job_row.status = 'done'
+    job_row.finished_at = timezone.now()
+    job_row.save(update_fields=['status', 'finished_at'])
+    return True
+
+
+def run_pending(limit=10):
+    """Run one batch of due jobs. Returns (succeeded, failed)."""
+    requeue_stale()
+    succeeded = failed = 0
+    for job_row in claim_batch(limit):
+        if execute(job_row):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
@@ -0,0 +1,81 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmark import SCENARIOS, HttpTransport, InProcessTransport, run_benchmark
+
+
+class Command(BaseCommand):
+    help = "Drive the main API endpoints with concurrent clients and report latency, throughput and queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenarios",
+            default=",".join(SCENARIOS),
+            help=f"Comma separated scenarios to run (default: all of {', '.join(SCENARIOS)}).",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Requests per scenario.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients.")
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Benchmark a running server (e.g. http://127.0.0.1:8000) instead of the in-process client. "
+                "It must use the same database, since dish, table and order ids are read from it."
+            ),
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for payloads.")
+        parser.add_argument("--json", dest="json_path", help="Write the results as JSON to this file ('-' for stdout).")
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options["scenarios"].split(",") if name.strip()]
+        unknown = [name for name in scenarios if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(unknown)}")
+
+        if options["base_url"]:
+            report = self.run(HttpTransport(options["base_url"]), scenarios, options)
+        else:
+            # The test client needs 'testserver' allowed and a non-sending mail backend.
+            try:
+                setup_test_environment()
+                owns_environment = True
+            except RuntimeError:
+                # Already set up by the test runner.
+                owns_environment = False
+            try:
+                report = self.run(InProcessTransport(), scenarios, options)
+            finally:
+                if owns_environment:
+                    teardown_test_environment()
+
+        json_path = options["json_path"]
+        if json_path == "-":
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        if json_path:
+            with open(json_path, "w") as handle:
+                json.dump(report, handle, indent=2)
+
+        self.stdout.write(
+            f"{'endpoint':<22}{'reqs':>7}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}"
+        )
+        for label, result in report["results"].items():
+            latency = result["latency_ms"]
+            queries = result["queries_per_request"]
+            self.stdout.write(
+                f"{label:<22}{result['requests']:>7}{result['errors']:>8}{result['rps']:>9}"
+                f"{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}"
+                f"{'-' if queries is None else queries:>9}"
+            )
+        if json_path:
+            self.stdout.write(self.style.SUCCESS(f"Results written to {json_path}"))
+
+    def run(self, transport, scenarios, options):
+        return run_benchmark(
+            transport,
+            scenarios,
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            seed=options["seed"],
+        )
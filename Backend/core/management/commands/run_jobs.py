@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (emails and other deferred work)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the jobs that are due now and exit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Jobs claimed per batch.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        total_ok = total_failed = 0
+
+        while True:
+            succeeded, failed = run_pending(limit=batch_size)
+            total_ok += succeeded
+            total_failed += failed
+            if succeeded or failed:
+                self.stdout.write(f"Ran {succeeded + failed} jobs ({failed} failed).")
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total_ok} succeeded, {total_failed} failed."))
@@ -0,0 +1,150 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.benchmark import BENCH_EMAIL, BENCH_PASSWORD
+from customers.directory import rebuild_customers
+from menu.cache import invalidate_menu
+from menu.models import Category, Dish
+from orders.dish_sales import rebuild_dish_sales
+from orders.models import Earning, Order, OrderItem
+from orders.rollups import rebuild_rollups
+from tables.models import Table
+
+CATEGORY_NAMES = ('Starters', 'Soups', 'Salads', 'Mains', 'Breads', 'Rice', 'Desserts', 'Drinks', 'Sides', 'Specials')
+DISH_WORDS = ('Paneer', 'Chicken', 'Dal', 'Masala', 'Tikka', 'Biryani', 'Korma', 'Naan', 'Lassi', 'Kulfi', 'Aloo', 'Gobi')
+
+
+class Command(BaseCommand):
+    help = "Seed a synthetic restaurant (tables, menu, order history) for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tables", type=int, default=40, help="Tables to create.")
+        parser.add_argument("--dishes", type=int, default=300, help="Dishes to create.")
+        parser.add_argument("--orders", type=int, default=100_000, help="Orders to create.")
+        parser.add_argument("--days", type=int, default=365, help="Spread orders over this many past days.")
+        parser.add_argument("--customers", type=int, default=5000, help="Distinct customer names to draw from.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Orders written per transaction.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible data.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        started = time.monotonic()
+
+        self.seed_user()
+        tables = self.seed_tables(options["tables"])
+        dishes = self.seed_menu(rng, options["dishes"])
+        self.stdout.write(f"{len(tables)} tables and {len(dishes)} dishes ready.")
+
+        now = timezone.now()
+        horizon = timedelta(days=options["days"])
+        remaining = options["orders"]
+        written = 0
+        while remaining > 0:
+            size = min(options["batch_size"], remaining)
+            with transaction.atomic():
+                self.seed_orders(rng, size, tables, dishes, now, horizon, options["customers"])
+            remaining -= size
+            written += size
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"Seeded {written} orders ({written / elapsed:.0f} orders/s)")
+
+        # Bulk writes skip the signals that maintain these.
+        rows = rebuild_rollups()
+        rebuild_dish_sales()
+        rebuild_customers()
+        invalidate_menu()
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {written} orders and {rows} rollup rows in {time.monotonic() - started:.1f}s. "
+            f"Benchmark login: {BENCH_EMAIL} / {BENCH_PASSWORD}"
+        ))
+
+    def seed_user(self):
+        User = get_user_model()
+        if not User.objects.filter(email=BENCH_EMAIL).exists():
+            User.objects.create_user(
+                username="bench",
+                email=BENCH_EMAIL,
+                password=BENCH_PASSWORD,
+                first_name="Bench",
+                last_name="Runner",
+            )
+
+    def seed_tables(self, count):
+        Table.objects.bulk_create(
+            [Table(table_number=f"T{number}", seats=(2, 4, 4, 6, 8)[number % 5]) for number in range(1, count + 1)],
+            ignore_conflicts=True,
+        )
+        return list(Table.objects.values_list("pk", flat=True))
+
+    def seed_menu(self, rng, count):
+        categories = Category.objects.bulk_create([Category(name=name) for name in CATEGORY_NAMES])
+        dishes = Dish.objects.bulk_create([
+            Dish(
+                name=f"{rng.choice(DISH_WORDS)} {rng.choice(DISH_WORDS)} {number}",
+                description="",
+                price=Decimal(rng.randrange(80, 900, 10)),
+                category=rng.choice(categories),
+                is_veg=rng.random() < 0.6,
+            )
+            for number in range(1, count + 1)
+        ])
+        return [(dish.pk, dish.price) for dish in dishes]
+
+    def seed_orders(self, rng, count, tables, dishes, now, horizon, customers):
+        orders = []
+        lines = []
+        for _ in range(count):
+            created_at = now - horizon * rng.random() ** 2
+            age = now - created_at
+            if age < timedelta(hours=2):
+                status = rng.choice(("Pending", "In Progress", "Ready"))
+            else:
+                status = "Cancelled" if rng.random() < 0.05 else "Completed"
+            order_type = "Takeaway" if rng.random() < 0.3 else "Dine In"
+            items = [
+                (dish_id, price, rng.randint(1, 3))
+                for dish_id, price in rng.sample(dishes, min(len(dishes), rng.randint(1, 5)))
+            ]
+            orders.append(Order(
+                table_id=rng.choice(tables) if order_type == "Dine In" and tables else None,
+                customer_name=f"Guest {rng.randint(1, customers)}",
+                status=status,
+                order_type=order_type,
+                total_amount=sum(price * quantity for _dish, price, quantity in items),
+            ))
+            lines.append((created_at, items))
+
+        orders = Order.objects.bulk_create(orders)
+        # auto_now_add overwrote created_at on insert; backdate it.
+        for order, (created_at, _items) in zip(orders, lines):
+            order.created_at = created_at
+        Order.objects.bulk_update(orders, ["created_at"], batch_size=1000)
+
+        OrderItem.objects.bulk_create(
+            [
+                OrderItem(order_id=order.pk, dish_id=dish_id, quantity=quantity, price=price * quantity)
+                for order, (_created_at, items) in zip(orders, lines)
+                for dish_id, price, quantity in items
+            ],
+            batch_size=2000,
+        )
+        Earning.objects.bulk_create(
+            [
+                Earning(
+                    order_id=order.pk,
+                    date=timezone.localdate(order.created_at),
+                    completed_at=order.created_at,
+                    amount=order.total_amount,
+                )
+                for order in orders
+                if order.status == "Completed"
+            ],
+            batch_size=2000,
+        )
@@ -0,0 +1,156 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Timings collected while a single request is handled."""
+
+    def __init__(self, track_queries=False):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        # (sql, seconds) pairs, kept only for the query detector.
+        self.queries = [] if track_queries else None
+
+    def record_query(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.db_queries += 1
+            self.db_time += duration
+            if self.queries is not None:
+                self.queries.append((sql, duration))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def start_request(track_queries=False):
+    metrics = RequestMetrics(track_queries=track_queries)
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current_metrics():
+    """The RequestMetrics of the request being handled, if any."""
+    return _current.get()
+
+
+@contextmanager
+def serializer_timer():
+    """Add the time spent in the block to the current request's serializer time."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - started
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Per-route request histograms, kept in process memory."""
+
+    METRICS = (
+        ('request_duration_seconds', 'Time spent handling the request.', DURATION_BUCKETS),
+        ('db_duration_seconds', 'Time spent in database queries per request.', DURATION_BUCKETS),
+        ('serializer_duration_seconds', 'Time spent in serializer .data per request.', DURATION_BUCKETS),
+        ('render_duration_seconds', 'Time spent rendering the response body per request.', DURATION_BUCKETS),
+        ('db_queries', 'Database queries per request.', QUERY_BUCKETS),
+    )
+
+    def __init__(self, prefix='dineease'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, view, method, status_code, metrics, response_bytes):
+        values = (metrics.elapsed(), metrics.db_time, metrics.serializer_time, metrics.render_time, metrics.db_queries)
+        with self._lock:
+            route = self._routes.get((view, method))
+            if route is None:
+                route = self._routes[(view, method)] = {
+                    'histograms': [Histogram(buckets) for _name, _help, buckets in self.METRICS],
+                    'bytes': 0,
+                    'statuses': {},
+                }
+            for histogram, value in zip(route['histograms'], values):
+                histogram.observe(value)
+            route['bytes'] += response_bytes or 0
+            route['statuses'][status_code] = route['statuses'].get(status_code, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render(self):
+        """Prometheus text exposition format."""
+        with self._lock:
+            routes = [((_label(view), method), route) for (view, method), route in sorted(self._routes.items())]
+            lines = []
+            for index, (name, help_text, buckets) in enumerate(self.METRICS):
+                metric = f'{self.prefix}_{name}'
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for (view, method), route in routes:
+                    histogram = route['histograms'][index]
+                    labels = f'view="{view}",method="{method}"'
+                    cumulative = 0
+                    for bound, count in zip(buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+
+            metric = f'{self.prefix}_response_bytes_total'
+            lines.append(f'# HELP {metric} Response body bytes sent.')
+            lines.append(f'# TYPE {metric} counter')
+            for (view, method), route in routes:
+                lines.append(f'{metric}{{view="{view}",method="{method}"}} {route["bytes"]}')
+
+            metric = f'{self.prefix}_responses_total'
+            lines.append(f'# HELP {metric} Responses by status code.')
+            lines.append(f'# TYPE {metric} counter')
+            for (view, method), route in routes:
+                for status_code, count in sorted(route['statuses'].items()):
+                    lines.append(f'{metric}{{view="{view}",method="{method}",status="{status_code}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
@@ -0,0 +1,82 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .metrics import current_metrics, end_request, registry, start_request
+from .querycheck import check_queries, detector_mode
+
+logger = logging.getLogger('dineease.performance')
+
+
+class PerformanceMiddleware:
+    """
+    Times each request (wall, database, serializer and render time, query count and
+    response size), reports it in a ``Server-Timing`` header and a log line,
+    and feeds the per-view histograms behind /api/_metrics/. Also runs the
+    repeated/slow query checks when QUERY_DETECTOR is enabled.
+    Disable with PERFORMANCE_METRICS = False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFORMANCE_METRICS', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics, token = start_request(track_queries=detector_mode() != 'off')
+        try:
+            with connection.execute_wrapper(metrics.record_query):
+                response = self.get_response(request)
+        finally:
+            end_request(token)
+
+        total = metrics.elapsed()
+        response_bytes = None if response.streaming else len(response.content)
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.db_queries} queries"',
+            f'serializer;dur={metrics.serializer_time * 1000:.1f}',
+            f'render;dur={metrics.render_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ))
+        registry.observe(view, request.method, response.status_code, metrics, response_bytes)
+        logger.info(
+            'view=%s method=%s status=%s duration_ms=%.1f db_queries=%d db_ms=%.1f serializer_ms=%.1f render_ms=%.1f bytes=%s',
+            view, request.method, response.status_code, total * 1000,
+            metrics.db_queries, metrics.db_time * 1000, metrics.serializer_time * 1000, metrics.render_time * 1000, response_bytes,
+            extra={
+                'performance': {
+                    'view': view,
+                    'path': request.path,
+                    'method': request.method,
+                    'status': response.status_code,
+                    'duration_ms': round(total * 1000, 1),
+                    'db_queries': metrics.db_queries,
+                    'db_ms': round(metrics.db_time * 1000, 1),
+                    'serializer_ms': round(metrics.serializer_time * 1000, 1),
+                    'render_ms': round(metrics.render_time * 1000, 1),
+                    'bytes': response_bytes,
+                },
+            },
+        )
+        if metrics.queries is not None:
+            check_queries(view, metrics.queries)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered (data to JSON or HTML) right after this
+        # hook; a post-render callback closes the timer.
+        metrics = current_metrics()
+        if metrics is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                metrics.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
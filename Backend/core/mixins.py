@@ -0,0 +1,125 @@
+import hashlib
+from datetime import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import CharField, Count, Max, Value
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from .models import Tombstone
+from .sync import collect_tombstones
+
+
+class EagerLoadingViewSetMixin:
+    """
+    Applies the serializer's ``setup_eager_loading`` (see
+    core.serializers.EagerLoadingMixin) to the view's queryset.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        return queryset
+
+
+class TombstoneBatchMixin:
+    """
+    Writes the tombstones of a delete, cascades included, with one INSERT
+    inside the delete's transaction (see core.sync.collect_tombstones).
+    """
+
+    def perform_destroy(self, instance):
+        with collect_tombstones():
+            super().perform_destroy(instance)
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for list and detail GETs, answering
+    If-None-Match / If-Modified-Since with 304 before anything is serialized.
+
+    The collection version is one aggregate (latest ``updated_at`` plus row
+    count) over the filtered queryset; a detail version is the object's own
+    ``updated_at``. ``conditional_dependencies`` lists further models whose
+    latest ``updated_at`` feeds both, e.g. the dishes behind a nested
+    ``dish_name``; together with the tombstones of the model and its
+    dependencies they cost one more query. Disabled globally with settings.CONDITIONAL_GET = False.
+    """
+    conditional_dependencies = ()
+
+    def conditional_get_enabled(self):
+        return getattr(settings, 'CONDITIONAL_GET', True)
+
+    def get_dependency_versions(self):
+        """
+        Latest ``updated_at`` of each dependency plus the latest tombstone of
+        this view's model or any dependency (so deletes, including cascades,
+        move the validators), in one UNION query.
+        """
+        def latest(model_class, field='updated_at', **filters):
+            return (
+                model_class._default_manager.filter(**filters).order_by()
+                .annotate(source=Value(model_class._meta.label_lower, output_field=CharField()))
+                .values('source')
+                .annotate(latest=Max(field))
+                .values_list('source', 'latest')
+            )
+
+        dependencies = [apps.get_model(label) for label in self.conditional_dependencies]
+        querysets = [latest(model) for model in dependencies]
+        labels = [model._meta.label_lower for model in (self.get_queryset().model, *dependencies)]
+        querysets.append(latest(Tombstone, 'deleted_at', model__in=labels))
+        rows = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+        return [value for _source, value in sorted(rows, key=lambda row: row[0])]
+
+    def get_collection_version(self, queryset):
+        stats = queryset.order_by().aggregate(latest=Max('updated_at'), count=Count('pk'))
+        return stats['latest'], stats['count']
+
+    def build_validators(self, request, *parts):
+        timestamps = [part for part in parts if isinstance(part, datetime)]
+        last_modified = max(timestamps) if timestamps else None
+        fingerprint = '|'.join(str(part) for part in (
+            self.__class__.__name__,
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            *parts,
+        ))
+        etag = quote_etag(hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest())
+        return etag, last_modified
+
+    def conditional_response(self, request, etag, last_modified, respond):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = respond()
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if not self.conditional_get_enabled():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        latest, count = self.get_collection_version(queryset)
+        etag, last_modified = self.build_validators(request, latest, count, *self.get_dependency_versions())
+        return self.conditional_response(
+            request, etag, last_modified,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.conditional_get_enabled():
+            return super().retrieve(request, *args, **kwargs)
+        instance = self.get_object()
+        etag, last_modified = self.build_validators(request, instance.pk, instance.updated_at, *self.get_dependency_versions())
+        return self.conditional_response(
+            request, etag, last_modified,
+            lambda: Response(self.get_serializer(instance).data),
+        )
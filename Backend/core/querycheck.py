@@ -0,0 +1,104 @@
+import logging
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger('dineease.queries')
+
+DEFAULTS = {
+    # 'off', 'log' (staging) or 'strict' (raise; the test runner's default).
+    'MODE': 'off',
+    # Flag a statement shape run this many times within one request.
+    'REPEAT_THRESHOLD': 5,
+    # Flag single queries slower than this.
+    'SLOW_QUERY_MS': 200,
+    # view name -> problem kinds ('repeated', 'slow') to ignore, or '*'.
+    'ALLOWLIST': {},
+}
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+\b')
+_SAVEPOINT = re.compile(r'^(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b')
+
+
+class QueryProblem(NamedTuple):
+    kind: str
+    shape: str
+    count: int
+    duration_ms: float
+
+    def __str__(self):
+        if self.kind == 'repeated':
+            return f'{self.count} queries shaped like: {self.shape}'
+        return f'{self.duration_ms:.0f} ms query: {self.shape}'
+
+
+class QueryProblemError(Exception):
+    pass
+
+
+def detector_settings():
+    return {**DEFAULTS, **getattr(settings, 'QUERY_DETECTOR', {})}
+
+
+def detector_mode():
+    return detector_settings()['MODE']
+
+
+def query_shape(sql):
+    """SQL with literals and IN-list lengths collapsed, so N+1 variants match."""
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _STRING.sub('?', sql)
+    return _NUMBER.sub('?', sql).replace('%s', '?')
+
+
+def find_problems(queries, repeat_threshold, slow_query_ms):
+    """``queries`` is a list of (sql, seconds) pairs."""
+    shapes = defaultdict(lambda: [0, 0.0])
+    problems = []
+    for sql, duration in queries:
+        if _SAVEPOINT.match(sql):
+            continue
+        shape = query_shape(sql)
+        shapes[shape][0] += 1
+        shapes[shape][1] += duration
+        if duration * 1000 >= slow_query_ms:
+            problems.append(QueryProblem('slow', shape, 1, duration * 1000))
+    for shape, (count, duration) in shapes.items():
+        if count >= repeat_threshold:
+            problems.append(QueryProblem('repeated', shape, count, duration * 1000))
+    return problems
+
+
+def check_queries(label, queries):
+    """Log or raise (depending on the mode) for problems in ``queries``."""
+    config = detector_settings()
+    if config['MODE'] == 'off':
+        return []
+    allowed = config['ALLOWLIST'].get(label, ())
+    problems = [
+        problem for problem in find_problems(queries, config['REPEAT_THRESHOLD'], config['SLOW_QUERY_MS'])
+        if allowed != '*' and problem.kind not in allowed
+    ]
+    if problems:
+        message = f'Query problems in {label}:\n' + '\n'.join(f'  {problem}' for problem in problems)
+        if config['MODE'] == 'strict':
+            raise QueryProblemError(message)
+        logger.warning(message)
+    return problems
+
+
+@contextmanager
+def inspect_queries(label):
+    """Check the queries run inside the block, e.g. in a command or test."""
+    from .metrics import RequestMetrics
+
+    metrics = RequestMetrics(track_queries=True)
+    with connection.execute_wrapper(metrics.record_query):
+        yield metrics
+    check_queries(label, metrics.queries)
@@ -0,0 +1,66 @@
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .metrics import serializer_timer
+
+
+class EagerLoadingMixin:
+    """
+    Lets a ModelSerializer declare the relations it reads so views can load
+    them up front instead of once per row:
+
+        class Meta:
+            select_related_fields = ('dish',)
+            prefetch_related_fields = ('tags',)
+
+    Nested serializers that use the mixin are discovered automatically and
+    loaded through a Prefetch whose queryset applies their own declarations.
+    """
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        meta = getattr(cls, 'Meta', None)
+        select_related = getattr(meta, 'select_related_fields', ())
+        prefetch_related = list(getattr(meta, 'prefetch_related_fields', ()))
+
+        for field in cls().fields.values():
+            nested = getattr(field, 'child', field)
+            if not isinstance(nested, EagerLoadingMixin) or field.source == '*':
+                continue
+            related_queryset = nested.Meta.model._default_manager.all()
+            prefetch_related.append(
+                Prefetch(field.source, queryset=type(nested).setup_eager_loading(related_queryset))
+            )
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with serializer_timer():
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Counts the time spent in ``.data`` (instances to primitives, usually the
+    expensive part of a response) as the request's serializer time; see
+    core.metrics. ``many=True`` serializers get TimedListSerializer unless
+    the Meta names its own list_serializer_class.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, 'Meta', None)
+        if meta is not None and not hasattr(meta, 'list_serializer_class'):
+            meta.list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with serializer_timer():
+            return super().data
@@ -0,0 +1,123 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Tombstone
+
+# Client-facing key -> (model, serializer). Every model listed here needs an
+# indexed ``updated_at`` column; deletes are recorded as tombstones.
+SYNC_MODELS = {
+    'tables': ('tables.models.Table', 'tables.serializers.TableSerializer'),
+    'reservations': ('tables.models.Reservation', 'tables.serializers.ReservationSerializer'),
+    'categories': ('menu.models.Category', 'menu.serializers.CategorySerializer'),
+    'dishes': ('menu.models.Dish', 'menu.serializers.DishSerializer'),
+    'orders': ('orders.models.Order', 'orders.serializers.OrderSerializer'),
+    'order_items': ('orders.models.OrderItem', 'orders.serializers.OrderItemSerializer'),
+    'earnings': ('orders.models.Earning', 'orders.serializers.EarningSerializer'),
+    'customers': ('customers.models.Customer', 'customers.serializers.CustomerSerializer'),
+}
+
+# Rows are re-sent if they changed this long before the token, which covers
+# transactions that stamped updated_at before the token but committed after.
+OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def make_token(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_token(token):
+    try:
+        return datetime.fromtimestamp(int(token) / 1_000_000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise InvalidToken(token)
+
+
+def sync_models():
+    for key, (model_path, serializer_path) in SYNC_MODELS.items():
+        yield key, import_string(model_path), import_string(serializer_path)
+
+
+# Set inside collect_tombstones(): {database alias: [Tombstone, ...]}.
+_collected = ContextVar('collected_tombstones', default=None)
+
+
+@contextmanager
+def collect_tombstones():
+    """
+    Run a delete (and its cascades) in a transaction that writes its
+    tombstones with one INSERT per database at the end, instead of one per
+    row. Nested blocks join the outermost one.
+    """
+    if _collected.get() is not None:
+        yield
+        return
+    collected = defaultdict(list)
+    token = _collected.set(collected)
+    try:
+        with transaction.atomic():
+            yield
+            for using, rows in collected.items():
+                Tombstone.objects.using(using).bulk_create(rows)
+    finally:
+        _collected.reset(token)
+
+
+def record_tombstone(sender, instance, using, **kwargs):
+    tombstone = Tombstone(model=sender._meta.label_lower, object_id=instance.pk)
+    collected = _collected.get()
+    if collected is None:
+        tombstone.save(using=using)
+    else:
+        collected[using].append(tombstone)
+
+
+def connect_tombstones():
+    for _key, model, _serializer in sync_models():
+        post_delete.connect(record_tombstone, sender=model, dispatch_uid=f'tombstone-{model._meta.label_lower}')
+
+
+def changes_since(since, context=None):
+    """
+    Rows created, updated or deleted since the ``since`` datetime (None for
+    a full load), keyed like SYNC_MODELS. Returns (changes, token, full).
+    """
+    now = timezone.now()
+    full = since is None or since < now - TOMBSTONE_RETENTION
+    cutoff = None if full else since - OVERLAP
+
+    # Deletes for every model in one query.
+    deleted = defaultdict(set)
+    if cutoff is not None:
+        rows = Tombstone.objects.filter(deleted_at__gte=cutoff).values_list('model', 'object_id')
+        for label, object_id in rows:
+            deleted[label].add(object_id)
+
+    changes = {}
+    for key, model, serializer_class in sync_models():
+        queryset = model._default_manager.all()
+        if cutoff is not None:
+            queryset = queryset.filter(updated_at__gte=cutoff)
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
+
+        changes[key] = {
+            'updated': serializer_class(queryset.order_by('pk'), many=True, context=context or {}).data,
+            'deleted': sorted(deleted[model._meta.label_lower]),
+        }
+    return changes, make_token(now), full
+
+
+def prune_tombstones():
+    return Tombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()[0]
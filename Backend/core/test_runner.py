@@ -0,0 +1,32 @@
+import logging
+import os
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from .querycheck import detector_settings
+
+
+class DineEaseTestRunner(DiscoverRunner):
+    """
+    Runs the suite with the query detector in strict mode, so a request that
+    introduces an N+1 or a slow query fails its test. QUERY_DETECTOR_MODE
+    overrides the mode; PERFORMANCE_LOG_LEVEL=INFO shows per-request lines.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        config = detector_settings()
+        config['MODE'] = os.environ.get('QUERY_DETECTOR_MODE', 'strict')
+        self._query_detector = override_settings(QUERY_DETECTOR=config)
+        self._query_detector.enable()
+
+        performance_logger = logging.getLogger('dineease.performance')
+        self._performance_log_level = performance_logger.level
+        if 'PERFORMANCE_LOG_LEVEL' not in os.environ:
+            performance_logger.setLevel(logging.WARNING)
+
+    def teardown_test_environment(self, **kwargs):
+        logging.getLogger('dineease.performance').setLevel(self._performance_log_level)
+        self._query_detector.disable()
+        super().teardown_test_environment(**kwargs)
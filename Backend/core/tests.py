@@ -1,3 +1,372 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
 
-# Create your tests here.
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.db.models import Sum
+from django.test import AsyncClient, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from customers.models import Customer
+from menu.models import Category, Dish
+from orders.models import Order
+from tables.models import Table
+from userauth.models import User
+from .benchmark import percentile
+from .events import InMemoryBroker
+from .jobs import enqueue, job, run_pending
+from .metrics import registry
+from .querycheck import QueryProblemError, find_problems, inspect_queries
+from .models import Job, Tombstone
+from .sync import collect_tombstones, make_token
+
+
+class InMemoryBrokerTests(SimpleTestCase):
+    def test_resume_after_last_event_id(self):
+        broker = InMemoryBroker()
+        first = broker.publish('order.created', {'id': 1})
+        broker.publish('order.status_changed', {'id': 1, 'status': 'Ready'})
+
+        events, reset = broker.read(first.id)
+        self.assertFalse(reset)
+        self.assertEqual([event.type for event in events], ['order.status_changed'])
+
+    def test_expired_or_unknown_id_requests_reset(self):
+        broker = InMemoryBroker(history=2)
+        for index in range(5):
+            broker.publish('table.freed', {'id': index})
+
+        self.assertTrue(broker.read('1')[1])
+        self.assertTrue(broker.read('99')[1])
+        self.assertEqual(len(broker.read('3')[0]), 2)
+
+    def test_waiting_readers_are_woken_by_publish(self):
+        broker = InMemoryBroker()
+        start = broker.latest_id()
+        threading.Timer(0.05, broker.publish, args=('table.booked', {'id': 3})).start()
+
+        events, reset = asyncio.run(broker.aread(start, timeout=5))
+        self.assertEqual([event.data for event in events], [{'id': 3}])
+
+    def test_read_times_out_without_events(self):
+        broker = InMemoryBroker()
+        self.assertEqual(broker.read(broker.latest_id(), timeout=0.01), ([], False))
+
+
+class EventStreamTests(APITestCase):
+    def setUp(self):
+        self.broker = InMemoryBroker()
+        patcher = mock.patch('core.events._broker', self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def published(self, write):
+        start = self.broker.latest_id()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = write()
+        self.assertLess(response.status_code, 300)
+        return [(event.type, event.data) for event in self.broker.read(start)[0]]
+
+    def test_order_writes_publish_events(self):
+        category = Category.objects.create(name='Mains')
+        dish = Dish.objects.create(name='Dal', description='', price=Decimal('180.00'), category=category)
+
+        events = self.published(lambda: self.client.post('/api/orders/', {
+            'customer_name': 'Asha', 'items': [{'dish': dish.pk, 'quantity': 2}],
+        }, format='json'))
+        self.assertEqual([event_type for event_type, _data in events], ['order.created'])
+        order_id = events[0][1]['id']
+        self.assertEqual(events[0][1]['total_amount'], Decimal('360.00'))
+
+        events = self.published(lambda: self.client.patch(f'/api/orders/{order_id}/', {'status': 'Ready'}, format='json'))
+        self.assertEqual([event_type for event_type, _data in events], ['order.status_changed'])
+        self.assertEqual(events[0][1]['previous_status'], 'Pending')
+
+        events = self.published(lambda: self.client.delete(f'/api/orders/{order_id}/'))
+        self.assertEqual(events, [('order.deleted', {'id': order_id, 'table': None})])
+
+    def test_table_writes_publish_events(self):
+        table = Table.objects.create(table_number='T1', seats=4)
+        url = f'/api/tables/{table.pk}/'
+
+        events = self.published(lambda: self.client.post(
+            url + 'book/', {'customer_name': 'Asha', 'booking_time': '2030-01-01T19:00:00Z'}, format='json',
+        ))
+        self.assertEqual([(event_type, data['customer_name']) for event_type, data in events], [('table.booked', 'Asha')])
+        self.assertEqual(self.published(lambda: self.client.post(url + 'free/'))[0][0], 'table.freed')
+        # Freeing an Available table, or saving it unchanged, publishes nothing.
+        self.assertEqual(self.published(lambda: self.client.post(url + 'free/')), [])
+        self.assertEqual(self.published(lambda: self.client.patch(url, {'seats': 6}, format='json')), [])
+
+    def test_stream_resumes_after_last_event_id(self):
+        first = self.broker.publish('order.created', {'id': 1})
+        self.broker.publish('order.status_changed', {'id': 1, 'status': 'Ready'})
+        self.broker.publish('table.freed', {'id': 2})
+
+        response = self.client.get('/api/events/', HTTP_LAST_EVENT_ID=first.id)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), b'retry: 3000\n\n')
+        chunk = next(stream).decode()
+        self.assertEqual(
+            [line for line in chunk.splitlines() if line.startswith(('id:', 'event:'))],
+            ['id: 2', 'event: order.status_changed', 'id: 3', 'event: table.freed'],
+        )
+
+    def test_stream_resets_unknown_ids_and_keeps_alive(self):
+        with mock.patch('core.views.KEEPALIVE_SECONDS', 0):
+            response = self.client.get('/api/events/', {'last_event_id': '99'})
+            stream = iter(response.streaming_content)
+            next(stream)
+            self.assertIn('event: reset', next(stream).decode())
+            self.assertEqual(next(stream), b': keepalive\n\n')
+
+    async def test_async_stream_resumes_after_last_event_id(self):
+        first = self.broker.publish('order.created', {'id': 1})
+        self.broker.publish('table.freed', {'id': 2})
+
+        response = await AsyncClient().get('/api/events/', headers={'Last-Event-ID': first.id})
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+        self.assertTrue((await anext(stream)).startswith(b'id: 2\nevent: table.freed\n'))
+        await stream.aclose()
+
+
+class SyncViewTests(APITestCase):
+    def test_full_load_without_token(self):
+        Category.objects.create(name='Starters')
+        response = self.client.get('/api/sync/')
+        self.assertTrue(response.data['full'])
+        self.assertEqual(len(response.data['changes']['categories']['updated']), 1)
+
+    def test_changes_since_token(self):
+        category = Category.objects.create(name='Starters')
+        dish = Dish.objects.create(name='Samosa', description='', price=40, category=category)
+        stale = timezone.now() - timedelta(minutes=5)
+        Category.objects.filter(pk=category.pk).update(updated_at=stale)
+        Dish.objects.filter(pk=dish.pk).update(updated_at=stale)
+        token = make_token(timezone.now() - timedelta(minutes=1))
+
+        Dish.objects.create(name='Pakora', description='', price=60, category=category)
+        deleted_pk = dish.pk
+        dish.delete()
+
+        response = self.client.get('/api/sync/', {'since': token})
+        changes = response.data['changes']
+        self.assertFalse(response.data['full'])
+        self.assertEqual(changes['categories'], {'updated': [], 'deleted': []})
+        self.assertEqual([row['name'] for row in changes['dishes']['updated']], ['Pakora'])
+        self.assertEqual(changes['dishes']['deleted'], [deleted_pk])
+
+    def test_collected_tombstones_share_the_delete_transaction(self):
+        category = Category.objects.create(name='Starters')
+        for name in ('Samosa', 'Pakora', 'Tikki'):
+            Dish.objects.create(name=name, description='', price=40, category=category)
+        category_pk = category.pk
+        with self.assertRaises(RuntimeError), collect_tombstones():
+            category.delete()
+            raise RuntimeError
+        self.assertEqual((Dish.objects.count(), Tombstone.objects.count()), (3, 0))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(f'/api/categories/{category_pk}/')
+        self.assertEqual(response.status_code, 204)
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "core_tombstone"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Tombstone.objects.filter(model='menu.dish').count(), 3)
+
+    def test_invalid_token(self):
+        self.assertEqual(self.client.get('/api/sync/', {'since': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/sync/', {'since': '9' * 23}).status_code, 400)
+
+
+attempts_seen = []
+
+
+@job('tests.flaky')
+def flaky_job(fail_times):
+    attempts_seen.append(fail_times)
+    if len(attempts_seen) <= fail_times:
+        raise RuntimeError('relay timeout')
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class JobQueueTests(APITestCase):
+    def test_password_reset_email_is_sent_by_worker(self):
+        User.objects.create_user(username='chef', email='chef@example.com', password='x', first_name='A', last_name='B')
+
+        response = self.client.post('/api/user/password-reset/', {'email': 'chef@example.com'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+
+        call_command('run_jobs', '--once', stdout=open(os.devnull, 'w'))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(User.objects.get().otp, mail.outbox[0].body)
+        self.assertEqual(Job.objects.get().status, 'done')
+
+    def test_failed_job_is_retried_with_backoff(self):
+        attempts_seen.clear()
+        queued = enqueue('tests.flaky', max_attempts=2, fail_times=5)
+
+        self.assertEqual(run_pending(), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('queued', 1))
+        self.assertGreater(queued.run_at, timezone.now())
+        self.assertIn('relay timeout', queued.last_error)
+
+        # Not due yet.
+        self.assertEqual(run_pending(), (0, 0))
+
+        Job.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        self.assertEqual(run_pending(), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'failed')
+
+
+class SqliteTuningTests(SimpleTestCase):
+    def test_pragmas_applied_to_new_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = dict(connection.settings_dict, NAME=os.path.join(directory, 'tuned.sqlite3'))
+            wrapper = DatabaseWrapper(settings_dict, alias='tuned')
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone()[0], 'wal')
+                    cursor.execute('PRAGMA synchronous')
+                    self.assertEqual(cursor.fetchone()[0], 1)
+                    cursor.execute('PRAGMA busy_timeout')
+                    self.assertEqual(cursor.fetchone()[0], 5000)
+            finally:
+                wrapper.close()
+
+
+class BenchmarkTests(TransactionTestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+    def test_seed_and_benchmark(self):
+        call_command('seed_restaurant', '--orders', '30', '--dishes', '5', '--tables', '3', stdout=io.StringIO())
+        self.assertEqual(Dish.objects.count(), 5)
+        visits = Order.objects.exclude(status='Cancelled').count()
+        self.assertEqual(Customer.objects.aggregate(visits=Sum('visit_count'))['visits'], visits)
+
+        out = io.StringIO()
+        call_command(
+            'benchmark_api', '--scenarios', 'orders.list,orders.create', '--requests', '4', '--concurrency', '2',
+            '--json', '-', stdout=out,
+        )
+        results = json.loads(out.getvalue())['results']
+        self.assertEqual(results['orders.list']['requests'], 4)
+        self.assertEqual(results['orders.create']['status_counts'], {'201': 4})
+        self.assertIsNotNone(results['orders.list']['queries_per_request'])
+
+
+class PerformanceMiddlewareTests(APITestCase):
+    def setUp(self):
+        registry.reset()
+        Category.objects.create(name='Mains')
+
+    def test_server_timing_and_log_line(self):
+        with self.assertLogs('dineease.performance', 'INFO') as logs:
+            response = self.client.get('/api/categories/')
+
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('render;dur=', timing)
+        self.assertIn('total;dur=', timing)
+        self.assertIn('view=category-list method=GET status=200', logs.output[0])
+        self.assertEqual(logs.records[0].performance['bytes'], len(response.content))
+
+    def test_serializer_and_render_time_are_separate(self):
+        Table.objects.create(table_number='T1', seats=4)
+        with self.assertLogs('dineease.performance', 'INFO') as logs:
+            response = self.client.get('/api/tables/')
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+        self.assertIn('render;dur=', response['Server-Timing'])
+        self.assertIn('serializer_ms', logs.records[0].performance)
+
+        sums = {
+            line.split('_sum{')[0]: float(line.split()[-1])
+            for line in registry.render().splitlines()
+            if '_duration_seconds_sum{view="table-list"' in line
+        }
+        self.assertGreater(sums['dineease_serializer_duration_seconds'], 0)
+        self.assertGreater(sums['dineease_render_duration_seconds'], 0)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.get('/api/categories/')
+        self.assertEqual(self.client.get('/api/_metrics/').status_code, 401)
+
+        admin = User.objects.create_user(
+            username='boss', email='boss@example.com', password='x', first_name='A', last_name='B', is_staff=True,
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.get('/api/_metrics/')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('dineease_request_duration_seconds_bucket{view="category-list",method="GET",le="+Inf"} 1', body)
+        self.assertIn('dineease_responses_total{view="category-list",method="GET",status="200"} 1', body)
+
+
+class QueryDetectorTests(APITestCase):
+    def test_shapes_ignore_literals_and_in_list_length(self):
+        queries = [
+            ('SELECT * FROM "menu_dish" WHERE "id" = %s', 0.001),
+            ('SELECT * FROM "menu_dish" WHERE "id" = 42', 0.001),
+            ('SELECT * FROM "menu_dish" WHERE "id" IN (%s, %s)', 0.001),
+            ('SELECT * FROM "menu_dish" WHERE "id" IN (%s, %s, %s)', 0.3),
+        ]
+        problems = find_problems(queries, repeat_threshold=2, slow_query_ms=200)
+        self.assertEqual(sorted((problem.kind, problem.count) for problem in problems), [
+            ('repeated', 2), ('repeated', 2), ('slow', 1),
+        ])
+
+    @override_settings(QUERY_DETECTOR={'MODE': 'strict', 'REPEAT_THRESHOLD': 3})
+    def test_strict_mode_raises_on_n_plus_one(self):
+        from orders.models import Order, OrderItem
+        from orders.serializers import OrderItemSerializer
+
+        category = Category.objects.create(name='Mains')
+        order = Order.objects.create(customer_name='Guest')
+        for index in range(3):
+            dish = Dish.objects.create(name=f'Dish {index}', description='', price=100, category=category)
+            OrderItem.objects.create(order=order, dish=dish, quantity=1, price=100)
+
+        with self.assertRaisesMessage(QueryProblemError, '3 queries shaped like'):
+            with inspect_queries('order items'):
+                OrderItemSerializer(OrderItem.objects.all(), many=True).data
+
+        with inspect_queries('order items'):
+            OrderItemSerializer(OrderItemSerializer.setup_eager_loading(OrderItem.objects.all()), many=True).data
+
+    def test_modes_and_allowlist_on_requests(self):
+        Category.objects.create(name='Mains')
+        every_query_is_slow = {'REPEAT_THRESHOLD': 5, 'SLOW_QUERY_MS': 0}
+
+        with override_settings(QUERY_DETECTOR={**every_query_is_slow, 'MODE': 'strict'}):
+            with self.assertRaises(QueryProblemError):
+                self.client.get('/api/categories/')
+
+        with override_settings(QUERY_DETECTOR={**every_query_is_slow, 'MODE': 'log'}):
+            with self.assertLogs('dineease.queries', 'WARNING'):
+                self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+
+        allowlist = {'category-list': ('slow',)}
+        with override_settings(QUERY_DETECTOR={**every_query_is_slow, 'MODE': 'strict', 'ALLOWLIST': allowlist}):
+            self.assertEqual(self.client.get('/api/categories/').status_code, 200)
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import MetricsView, SearchView, SyncView, event_stream
+
+urlpatterns = [
+    path('events/', event_stream, name='event-stream'),
+    path('sync/', SyncView.as_view(), name='sync'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('_metrics/', MetricsView.as_view(), name='metrics'),
+]
@@ -0,0 +1,43 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class VersionStamp:
+    """
+    Version of some process-local derived data (the menu snapshot, the
+    kitchen queue). Without a cache alias in ``settings.<setting>`` it's a
+    per-process counter; with one, a random stamp kept under ``key`` in that
+    cache, so every worker sees the others' bumps. Callers serialise
+    ``bump()`` with their own lock.
+    """
+
+    def __init__(self, key, setting):
+        self.key = key
+        self.setting = setting
+        self._local = 0
+
+    def shared_cache(self):
+        alias = getattr(settings, self.setting, None)
+        return caches[alias] if alias else None
+
+    def current(self):
+        cache = self.shared_cache()
+        if cache is None:
+            return str(self._local)
+        version = cache.get(self.key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(self.key, version, timeout=None):
+                version = cache.get(self.key, version)
+        return version
+
+    def bump(self):
+        self._local += 1
+        cache = self.shared_cache()
+        if cache is None:
+            return str(self._local)
+        version = uuid.uuid4().hex
+        cache.set(self.key, version, timeout=None)
+        return version
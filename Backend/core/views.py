@@ -1,3 +1,141 @@
-from django.shortcuts import render
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from customers.directory import search_customers
+from menu.search import MATCH_NAMES, search_dishes
+from .events import Event, get_broker
+from .metrics import registry
+from .sync import InvalidToken, changes_since, parse_token
+
+KEEPALIVE_SECONDS = 15
+
+
+def _resume_from(request, broker):
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    return last_id or broker.latest_id()
+
+
+def _step(broker, last_id, events, reset):
+    """
+    Turn one broker read into the text to send and the id to resume from:
+    a reset event, the new events, or a keepalive comment if there were none.
+    """
+    if reset:
+        events = [Event(broker.latest_id(), 'reset', {'detail': 'History expired, reload state.'})]
+    if not events:
+        return ': keepalive\n\n', last_id
+    return ''.join(event.encode() for event in events), events[-1].id
+
+
+async def _async_stream(broker, last_id):
+    yield 'retry: 3000\n\n'
+    while True:
+        chunk, last_id = _step(broker, last_id, *await broker.aread(last_id, KEEPALIVE_SECONDS))
+        yield chunk
+
+
+def _sync_stream(broker, last_id):
+    yield 'retry: 3000\n\n'
+    while True:
+        chunk, last_id = _step(broker, last_id, *broker.read(last_id, KEEPALIVE_SECONDS))
+        yield chunk
+
+
+@require_GET
+def event_stream(request):
+    """
+    Server-sent event stream of order and table changes. Clients resume
+    with the standard ``Last-Event-ID`` header (or ``?last_event_id=``).
+    Under ASGI each connection is a coroutine; under WSGI it holds a worker
+    thread, so deploy behind backend.asgi for more than a few terminals.
+    """
+    broker = get_broker()
+    last_id = _resume_from(request, broker)
+    if isinstance(request, ASGIRequest):
+        stream = _async_stream(broker, last_id)
+    else:
+        stream = _sync_stream(broker, last_id)
+
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class SyncView(APIView):
+    """
+    GET /api/sync/?since=<token>
+
+    Returns the tables, categories, dishes, orders, order items and earnings
+    created, updated or deleted since ``token`` plus a new token to pass
+    next time. Without a token (or with one older than the tombstone
+    retention window) everything is returned and ``full`` is true.
+    """
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        try:
+            since = parse_token(since) if since else None
+        except InvalidToken:
+            return Response({'error': 'Invalid sync token'}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes, token, full = changes_since(since, context={'request': request})
+        return Response({'token': token, 'full': full, 'changes': changes})
+
+
+class SearchView(APIView):
+    """
+    Type-ahead search: GET /api/search/?q=pan&limit=10&types=dishes,customers
+
+    Dishes come from the in-memory menu index and are ranked exact match,
+    name prefix, word prefixes, category words, then fuzzy (trigram)
+    matches. Customers are matched by name prefix.
+    """
+    TYPES = ('dishes', 'customers')
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        limit = request.query_params.get('limit', '10')
+        types = request.query_params.get('types', ','.join(self.TYPES)).split(',')
+        if not limit.isdigit() or not 0 < int(limit) <= self.MAX_LIMIT:
+            return Response({'error': f'limit must be between 1 and {self.MAX_LIMIT}'}, status=status.HTTP_400_BAD_REQUEST)
+        unknown = [name for name in types if name not in self.TYPES]
+        if unknown:
+            return Response({'error': f"Unknown types: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        limit = int(limit)
+        results = {}
+        if 'dishes' in types:
+            results['dishes'] = [
+                {
+                    'id': match.dish.id,
+                    'name': match.dish.name,
+                    'price': str(match.dish.price),
+                    'category': match.dish.category_id,
+                    'category_name': match.dish.category_name,
+                    'is_veg': match.dish.is_veg,
+                    'match': MATCH_NAMES[match.match],
+                    'score': round(match.similarity, 3),
+                }
+                for match in (search_dishes(query, limit) if query else [])
+            ]
+        if 'customers' in types:
+            results['customers'] = [
+                {'id': customer.pk, 'name': customer.name, 'phone': customer.phone, 'visit_count': customer.visit_count}
+                for customer in (search_customers(query, limit) if query else [])
+            ]
+        return Response(results)
+
+
+class MetricsView(APIView):
+    """Per-view request histograms in Prometheus text format."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import Customer
+
+
+@admin.register(Customer)
+class CustomerAdmin(admin.ModelAdmin):
+    list_display = ('name', 'phone', 'visit_count', 'lifetime_spend', 'first_visit', 'last_visit')
+    search_fields = ('^normalized_name', 'phone')
+    readonly_fields = ('name', 'normalized_name', 'first_visit', 'last_visit', 'visit_count', 'lifetime_spend')
+    ordering = ('normalized_name',)
+
+    def has_add_permission(self, request):
+        return False
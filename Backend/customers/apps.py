@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CustomersConfig(AppConfig):
+    name = 'customers'
+
+    def ready(self):
+        from . import directory  # noqa: F401  (connects the order_changed receiver)
@@ -0,0 +1,176 @@
+import unicodedata
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest, Least
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.db import use_trigram_search
+from orders.models import Order
+from orders.signals import order_changed
+from .models import Customer
+
+CHUNK_SIZE = 2000
+NORMALIZED_NAME_LENGTH = Customer._meta.get_field('normalized_name').max_length
+
+
+def normalize_name(name):
+    """
+    Case-folded with whitespace collapsed, so 'Asha  K' and 'asha k' are one
+    customer. NFKC and case folding can lengthen a name ('ß' becomes 'ss'),
+    so the result is cut to fit the column.
+    """
+    name = ' '.join(unicodedata.normalize('NFKC', name or '').split()).casefold()
+    return name[:NORMALIZED_NAME_LENGTH].rstrip()
+
+
+def prefix_filter(queryset, prefix):
+    """
+    Customers whose normalized name starts with ``prefix``. The range lets
+    every backend walk the unique index; startswith keeps the exact semantics.
+    """
+    prefix = normalize_name(prefix)
+    if not prefix:
+        return queryset
+    return queryset.filter(
+        normalized_name__gte=prefix,
+        normalized_name__lt=prefix + '\uffff',
+        normalized_name__startswith=prefix,
+    )
+
+
+def search_customers(query, limit=10):
+    """
+    Customers whose name starts with ``query``, in name order, topped up
+    with trigram-similar names when pg_trgm search is enabled.
+    """
+    customers = Customer.objects.filter(visit_count__gt=0)
+    found = list(prefix_filter(customers, query)[:limit])
+    if len(found) < limit and len(normalize_name(query)) >= 3 and use_trigram_search():
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        found += list(
+            customers.annotate(similarity=TrigramSimilarity('normalized_name', normalize_name(query)))
+            .filter(similarity__gte=0.3)
+            .exclude(pk__in=[customer.pk for customer in found])
+            .order_by('-similarity', 'normalized_name')[:limit - len(found)]
+        )
+    return found
+
+
+def _counts(snapshot):
+    # Cancelled orders aren't visits and didn't spend anything.
+    return snapshot is not None and snapshot.status != 'Cancelled' and bool(normalize_name(snapshot.customer_name))
+
+
+def _customer_deltas(before, after):
+    deltas = defaultdict(lambda: {'visits': 0, 'spend': Decimal('0'), 'name': None, 'visit': None, 'previous': None})
+    for snapshot, sign in ((before, -1), (after, 1)):
+        if not _counts(snapshot):
+            continue
+        delta = deltas[normalize_name(snapshot.customer_name)]
+        delta['visits'] += sign
+        delta['spend'] += sign * snapshot.total_amount
+        visit = (' '.join(snapshot.customer_name.split()), snapshot.created_at)
+        if sign > 0:
+            delta['name'], delta['visit'] = visit
+        else:
+            delta['previous'] = visit
+    return deltas
+
+
+def apply_customer_change(before, after):
+    """Fold an order change into the customer rows it affects."""
+    # Edits that leave a customer's visit, spend and name as they were (a
+    # status change, say) write nothing.
+    deltas = {
+        key: delta for key, delta in _customer_deltas(before, after).items()
+        if delta['visits'] or delta['spend']
+        or (delta['visit'] is not None and (delta['name'], delta['visit']) != delta['previous'])
+    }
+    if not deltas:
+        return
+    with transaction.atomic():
+        Customer.objects.bulk_create(
+            [
+                Customer(normalized_name=key, name=delta['name'], first_visit=delta['visit'], last_visit=delta['visit'])
+                for key, delta in deltas.items()
+                if delta['visit'] is not None
+            ],
+            ignore_conflicts=True,
+        )
+        for key, delta in deltas.items():
+            changes = {
+                'visit_count': F('visit_count') + delta['visits'],
+                'lifetime_spend': F('lifetime_spend') + delta['spend'],
+                'updated_at': timezone.now(),
+            }
+            if delta['visit'] is not None:
+                # Removing a visit leaves first/last visit as they were.
+                changes['name'] = delta['name']
+                changes['first_visit'] = Least(F('first_visit'), Value(delta['visit']))
+                changes['last_visit'] = Greatest(F('last_visit'), Value(delta['visit']))
+            Customer.objects.filter(normalized_name=key).update(**changes)
+
+
+@receiver(order_changed)
+def update_customers(sender, before=None, after=None, **kwargs):
+    apply_customer_change(before, after)
+
+
+def rebuild_customers():
+    """
+    Recompute every customer's name, visits and spend from the orders,
+    repairing drift (e.g. from bulk writes that bypass order_changed). Rows
+    are updated in place, keeping their ids and phone numbers; customers
+    with no orders left drop to zero visits. Returns (created, updated).
+    """
+    totals = {}
+    orders = (
+        Order.objects.exclude(status='Cancelled')
+        .order_by('pk')
+        .values_list('customer_name', 'created_at', 'total_amount')
+    )
+    for customer_name, created_at, total_amount in orders.iterator(chunk_size=CHUNK_SIZE):
+        key = normalize_name(customer_name)
+        if not key:
+            continue
+        row = totals.get(key)
+        if row is None:
+            row = totals[key] = {
+                'name': ' '.join(customer_name.split()),
+                'first_visit': created_at,
+                'last_visit': created_at,
+                'visit_count': 0,
+                'lifetime_spend': Decimal('0'),
+            }
+        row['visit_count'] += 1
+        row['lifetime_spend'] += total_amount or 0
+        row['first_visit'] = min(row['first_visit'], created_at)
+        if created_at >= row['last_visit']:
+            row['last_visit'] = created_at
+            row['name'] = ' '.join(customer_name.split())
+
+    fields = ('name', 'first_visit', 'last_visit', 'visit_count', 'lifetime_spend')
+    now = timezone.now()
+    changed = []
+    with transaction.atomic():
+        for customer in Customer.objects.select_for_update().iterator(chunk_size=CHUNK_SIZE):
+            row = totals.pop(customer.normalized_name, None)
+            if row is None:
+                # Keep the row (and its phone); it just has no visits now.
+                row = {'visit_count': 0, 'lifetime_spend': Decimal('0')}
+            if any(getattr(customer, field) != value for field, value in row.items()):
+                for field, value in row.items():
+                    setattr(customer, field, value)
+                customer.updated_at = now
+                changed.append(customer)
+        Customer.objects.bulk_update(changed, (*fields, 'updated_at'), batch_size=CHUNK_SIZE)
+        Customer.objects.bulk_create(
+            [Customer(normalized_name=key, **row) for key, row in totals.items()],
+            batch_size=CHUNK_SIZE,
+        )
+    return len(totals), len(changed)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from customers.directory import rebuild_customers
+
+
+class Command(BaseCommand):
+    help = "Rebuild the customer directory's names, visits and spend from order history."
+
+    def handle(self, *args, **options):
+        created, updated = rebuild_customers()
+        self.stdout.write(self.style.SUCCESS(f"Created {created} and updated {updated} customers."))
@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Customer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_name', models.CharField(max_length=100, unique=True)),
+                ('phone', models.CharField(blank=True, default='', max_length=20)),
+                ('first_visit', models.DateTimeField()),
+                ('last_visit', models.DateTimeField()),
+                ('visit_count', models.IntegerField(default=0)),
+                ('lifetime_spend', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'ordering': ('normalized_name',),
+                'indexes': [models.Index(fields=['last_visit'], name='customer_last_visit_idx')],
+            },
+        ),
+    ]
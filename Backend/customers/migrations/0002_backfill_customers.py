@@ -0,0 +1,60 @@
+import unicodedata
+from decimal import Decimal
+
+from django.db import migrations
+
+CHUNK_SIZE = 2000
+
+
+def normalize_name(name):
+    # Frozen copy of customers.directory.normalize_name.
+    name = ' '.join(unicodedata.normalize('NFKC', name or '').split()).casefold()
+    return name[:100].rstrip()
+
+
+def backfill_customers(apps, schema_editor):
+    Customer = apps.get_model('customers', 'Customer')
+    Order = apps.get_model('orders', 'Order')
+    db_alias = schema_editor.connection.alias
+
+    customers = {}
+    orders = (
+        Order.objects.using(db_alias)
+        .exclude(status='Cancelled')
+        .order_by('pk')
+        .values_list('customer_name', 'created_at', 'total_amount')
+    )
+    for customer_name, created_at, total_amount in orders.iterator(chunk_size=CHUNK_SIZE):
+        key = normalize_name(customer_name)
+        if not key:
+            continue
+        customer = customers.get(key)
+        if customer is None:
+            customer = customers[key] = Customer(
+                normalized_name=key,
+                name=' '.join(customer_name.split()),
+                first_visit=created_at,
+                last_visit=created_at,
+                visit_count=0,
+                lifetime_spend=Decimal('0'),
+            )
+        customer.visit_count += 1
+        customer.lifetime_spend += total_amount or 0
+        customer.first_visit = min(customer.first_visit, created_at)
+        if created_at >= customer.last_visit:
+            customer.last_visit = created_at
+            customer.name = ' '.join(customer_name.split())
+
+    Customer.objects.using(db_alias).bulk_create(customers.values(), batch_size=CHUNK_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        ('orders', '0010_dish_sales'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_customers, migrations.RunPython.noop),
+    ]
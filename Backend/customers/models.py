@@ -0,0 +1,26 @@
+from django.db import models
+
+
+class Customer(models.Model):
+    """
+    One row per distinct (normalized) order customer name, kept current from
+    order writes so listing customers never scans the orders table.
+    """
+    name = models.CharField(max_length=100)
+    normalized_name = models.CharField(max_length=100, unique=True)
+    phone = models.CharField(max_length=20, blank=True, default='')
+    first_visit = models.DateTimeField()
+    last_visit = models.DateTimeField()
+    visit_count = models.IntegerField(default=0)
+    lifetime_spend = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ('normalized_name',)
+        indexes = [
+            models.Index(fields=('last_visit',), name='customer_last_visit_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
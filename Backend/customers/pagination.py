@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CustomerCursorPagination(CursorPagination):
+    """Keyset pagination in name order, which is also the prefix search's index order."""
+    ordering = ('normalized_name',)
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,11 @@
+from rest_framework import serializers
+
+from core.serializers import TimedSerializerMixin
+from .models import Customer
+
+
+class CustomerSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = ('id', 'name', 'phone', 'first_visit', 'last_visit', 'visit_count', 'lifetime_spend', 'updated_at')
+        read_only_fields = ('name', 'first_visit', 'last_visit', 'visit_count', 'lifetime_spend', 'updated_at')
@@ -0,0 +1,108 @@
+import importlib
+import io
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from menu.models import Category, Dish
+from orders.models import Order
+from .models import Customer
+
+backfill = importlib.import_module('customers.migrations.0002_backfill_customers')
+
+
+class CustomerDirectoryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Mains')
+        cls.dish = Dish.objects.create(name='Dal', description='', price=Decimal('100.00'), category=category)
+
+    def order(self, customer_name, quantity=1):
+        response = self.client.post('/api/orders/', {
+            'customer_name': customer_name,
+            'items': [{'dish': self.dish.pk, 'quantity': quantity}],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_orders_maintain_customers(self):
+        first = self.order('Asha  Rao', quantity=2)
+        self.order('asha rao')
+        customer = Customer.objects.get()
+        self.assertEqual((customer.normalized_name, customer.visit_count, customer.lifetime_spend), ('asha rao', 2, Decimal('300.00')))
+
+        self.client.patch(f'/api/orders/{first}/', {'customer_name': 'Ravi'}, format='json')
+        self.client.patch(f'/api/orders/{first}/', {'status': 'Cancelled'}, format='json')
+        self.order('Ravi', quantity=3)
+        counts = dict(Customer.objects.values_list('normalized_name', 'visit_count'))
+        self.assertEqual(counts, {'asha rao': 1, 'ravi': 1})
+        self.assertEqual(Customer.objects.get(normalized_name='ravi').lifetime_spend, Decimal('300.00'))
+
+        self.client.delete(f'/api/orders/{first}/')
+        self.assertEqual(Customer.objects.get(normalized_name='ravi').visit_count, 1)
+
+    def test_status_only_edits_leave_customers_alone(self):
+        order_id = self.order('Asha')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(f'/api/orders/{order_id}/', {'status': 'Ready'}, format='json')
+        self.assertFalse([query for query in queries if 'customers_customer' in query['sql']])
+
+        # Same customer, new spelling: only the display name changes.
+        self.client.patch(f'/api/orders/{order_id}/', {'customer_name': 'ASHA'}, format='json')
+        customer = Customer.objects.get()
+        self.assertEqual((customer.name, customer.visit_count), ('ASHA', 1))
+
+    def test_long_expanding_names_fit(self):
+        name = 'ß' * 100
+        self.order(name)
+        customer = Customer.objects.get()
+        self.assertEqual(customer.normalized_name, 'ss' * 50)
+        self.assertEqual(customer.name, name)
+
+    def test_prefix_search_and_pagination(self):
+        for name in ('Asha', 'Ashok', 'Ravi', 'asher'):
+            self.order(name)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/customers/', {'search': 'ASH', 'page_size': 2})
+        self.assertEqual([row['name'] for row in response.data['results']], ['Asha', 'asher'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['name'] for row in response.data['results']], ['Ashok'])
+        self.assertIsNone(response.data['next'])
+
+    def test_only_phone_is_writable(self):
+        self.order('Asha')
+        customer = Customer.objects.get()
+        response = self.client.patch(f'/api/customers/{customer.pk}/', {'phone': '98450 00000', 'visit_count': 99}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['phone'], response.data['visit_count']), ('98450 00000', 1))
+
+    def test_backfill_migration(self):
+        for name, amount, status in (('Asha', '100.00', 'Completed'), ('ASHA', '50.00', 'Pending'), ('Ravi', '80.00', 'Cancelled')):
+            Order.objects.create(customer_name=name, total_amount=Decimal(amount), status=status)
+        Customer.objects.all().delete()
+
+        backfill.backfill_customers(apps, SimpleNamespace(connection=connection))
+        customer = Customer.objects.get()
+        self.assertEqual((customer.name, customer.visit_count, customer.lifetime_spend), ('ASHA', 2, Decimal('150.00')))
+
+    def test_rebuild_repairs_drift(self):
+        self.order('Asha', quantity=2)
+        self.order('Ravi')
+        asha = Customer.objects.get(normalized_name='asha')
+        Customer.objects.filter(pk=asha.pk).update(phone='98450 00000', visit_count=7, lifetime_spend=0)
+        Customer.objects.filter(normalized_name='ravi').delete()
+        # Bulk writes skip order_changed.
+        Order.objects.create(customer_name='Meera', total_amount=Decimal('80.00'))
+        Customer.objects.create(normalized_name='ghost', name='Ghost', first_visit=asha.first_visit, last_visit=asha.last_visit, visit_count=3)
+
+        call_command('rebuild_customers', stdout=io.StringIO())
+        rows = dict(Customer.objects.values_list('normalized_name', 'visit_count'))
+        self.assertEqual(rows, {'asha': 1, 'ghost': 0, 'meera': 1, 'ravi': 1})
+        asha.refresh_from_db()
+        self.assertEqual((asha.phone, asha.lifetime_spend), ('98450 00000', Decimal('200.00')))
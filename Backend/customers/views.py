@@ -0,0 +1,25 @@
+from rest_framework import mixins, viewsets
+
+from .directory import prefix_filter
+from .models import Customer
+from .pagination import CustomerCursorPagination
+from .serializers import CustomerSerializer
+
+
+class CustomerViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet):
+    """
+    Customers derived from orders, alphabetically. ?search=<prefix> matches
+    the start of the name, case-insensitively. Only ``phone`` is writable.
+    """
+    queryset = Customer.objects.all()
+    serializer_class = CustomerSerializer
+    pagination_class = CustomerCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.filter(visit_count__gt=0)
+            search = self.request.query_params.get('search')
+            if search:
+                queryset = prefix_filter(queryset, search)
+        return queryset
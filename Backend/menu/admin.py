@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Category, Dish
+from .search import get_index, search_dishes
 
 
 @admin.register(Category)
@@ -13,3 +14,13 @@ class DishAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'category', 'price', 'is_veg')
     list_filter = ('category', 'is_veg')
     search_fields = ('name', 'description')
+
+    def get_search_results(self, request, queryset, search_term):
+        # The default name/description search, plus every dish the menu index
+        # matches (accent-insensitive word prefixes, category words, typos).
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if not search_term:
+            return results, may_have_duplicates
+        limit = max(len(get_index().menu.dishes), 1)
+        ids = [match.dish.id for match in search_dishes(search_term, limit=limit)]
+        return results | queryset.filter(pk__in=ids), may_have_duplicates
@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class MenuConfig(AppConfig):
     name = 'menu'
+
+    def ready(self):
+        from .cache import menu_changed
+        from .models import Category, Dish
+
+        for model in (Category, Dish):
+            post_save.connect(menu_changed, sender=model, dispatch_uid=f'menu-cache-save-{model.__name__}')
+            post_delete.connect(menu_changed, sender=model, dispatch_uid=f'menu-cache-delete-{model.__name__}')
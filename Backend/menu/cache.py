@@ -0,0 +1,147 @@
+import threading
+import time
+from functools import cached_property
+from typing import NamedTuple
+
+from django.db import connection, transaction
+
+from core.versions import VersionStamp
+from .models import Category, Dish
+
+VERSION_KEY = 'menu:snapshot:version'
+version_stamp = VersionStamp(VERSION_KEY, 'MENU_CACHE_ALIAS')
+# Rebuild from the database at least this often. Without MENU_CACHE_ALIAS
+# each worker only sees its own writes, so this bounds how long it serves a
+# menu changed through another worker.
+MAX_AGE = 60
+
+
+class DishEntry(NamedTuple):
+    id: int
+    name: str
+    description: str
+    price: object
+    category_id: int
+    category_name: str
+    is_veg: bool
+
+
+class MenuSnapshot:
+    """
+    Immutable, process-local copy of the menu: dish and category entries
+    keyed by id, their pre-serialized API rows and the version it was built
+    for. Never mutate a snapshot; invalidation builds a new one.
+    """
+
+    def __init__(self, version, categories, dishes, category_rows, dish_rows, last_modified):
+        self.version = version
+        self.categories = categories
+        self.dishes = dishes
+        self.category_rows = category_rows
+        self.dish_rows = dish_rows
+        self.last_modified = last_modified
+        self.built_at = time.monotonic()
+
+    @cached_property
+    def compact(self):
+        """The columnar /api/menu/snapshot/ body, encoded once per snapshot."""
+        from .compact import CompactMenu
+
+        return CompactMenu(self)
+
+    def dish_instances(self, ids):
+        """Unsaved-state Dish instances for pricing, without a query."""
+        field_names = ('id', 'name', 'description', 'price', 'category_id', 'is_veg')
+        found = {}
+        for pk in ids:
+            entry = self.dishes.get(pk)
+            if entry is not None:
+                found[pk] = Dish.from_db(
+                    'default',
+                    field_names,
+                    (entry.id, entry.name, entry.description, entry.price, entry.category_id, entry.is_veg),
+                )
+        return found
+
+
+_snapshot = None
+_lock = threading.Lock()
+# Set while this thread has uncommitted menu writes; snapshots it builds then
+# are kept private so a rollback can't leave them behind as current.
+_pending = threading.local()
+
+
+def _fresh(snapshot, version):
+    return snapshot is not None and snapshot.version == version and time.monotonic() - snapshot.built_at < MAX_AGE
+
+
+def _build(version):
+    from .serializers import CategorySerializer, DishSerializer
+
+    categories = list(Category.objects.order_by('pk'))
+    dishes = list(Dish.objects.select_related('category').order_by('pk'))
+    names = {category.pk: category.name for category in categories}
+    latest = [
+        value for value in (
+            max((category.updated_at for category in categories), default=None),
+            max((dish.updated_at for dish in dishes), default=None),
+        ) if value is not None
+    ]
+    return MenuSnapshot(
+        version=version,
+        categories=names,
+        dishes={
+            dish.pk: DishEntry(dish.pk, dish.name, dish.description, dish.price, dish.category_id, names.get(dish.category_id, ''), dish.is_veg)
+            for dish in dishes
+        },
+        category_rows=CategorySerializer(categories, many=True).data,
+        dish_rows=DishSerializer(dishes, many=True).data,
+        last_modified=max(latest) if latest else None,
+    )
+
+
+def get_menu():
+    """Return the current snapshot, rebuilding it if the version moved or it's stale."""
+    global _snapshot
+    if getattr(_pending, 'dirty', False):
+        if connection.in_atomic_block:
+            return _build(version_stamp.current())
+        _pending.dirty = False
+
+    current = version_stamp.current()
+    snapshot = _snapshot
+    if _fresh(snapshot, current):
+        return snapshot
+    with _lock:
+        if not _fresh(_snapshot, current):
+            # Read the version before the rows so a write racing the rebuild
+            # leaves this snapshot stale rather than wrongly current.
+            _snapshot = _build(current)
+        return _snapshot
+
+
+def pricing_dishes(ids):
+    """
+    Dish instances to price an order with, keyed by id. They come from the
+    snapshot only when its version is shared between workers; otherwise a
+    price changed through another worker may not have reached this one yet,
+    so they're read from the database (one query).
+    """
+    if version_stamp.shared_cache() is None:
+        return Dish.objects.in_bulk(ids)
+    return get_menu().dish_instances(ids)
+
+
+def invalidate_menu():
+    _pending.dirty = False
+    with _lock:
+        version_stamp.bump()
+
+
+def menu_changed(sender, **kwargs):
+    """post_save/post_delete receiver for Dish and Category."""
+    if connection.in_atomic_block:
+        _pending.dirty = True
+        transaction.on_commit(invalidate_menu)
+    else:
+        invalidate_menu()
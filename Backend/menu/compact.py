@@ -0,0 +1,80 @@
+import gzip
+import hashlib
+import json
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Preferred first when the client accepts several.
+ENCODINGS = ('br', 'gzip', 'identity') if brotli is not None else ('gzip', 'identity')
+
+
+def columnar(menu):
+    """The menu as parallel arrays: only what a POS terminal needs to ring up orders."""
+    categories = sorted(menu.categories.items())
+    dishes = [menu.dishes[pk] for pk in sorted(menu.dishes)]
+    return {
+        'categories': {
+            'id': [pk for pk, _ in categories],
+            'name': [name for _, name in categories],
+        },
+        'dishes': {
+            'id': [dish.id for dish in dishes],
+            'name': [dish.name for dish in dishes],
+            'price': [str(dish.price) for dish in dishes],
+            'category': [dish.category_id for dish in dishes],
+            'is_veg': [dish.is_veg for dish in dishes],
+        },
+    }
+
+
+class CompactMenu:
+    """
+    A snapshot's columnar body, rendered and compressed once, with a strong
+    ETag per encoding (each encoding is a different byte sequence).
+    """
+
+    def __init__(self, menu):
+        payload = columnar(menu)
+        digest = hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()).hexdigest()[:32]
+        body = json.dumps({'version': digest, **payload}, separators=(',', ':')).encode()
+        self.version = digest
+        self.last_modified = menu.last_modified
+        self.bodies = {
+            'identity': body,
+            # mtime=0 keeps the bytes, and so the ETag, stable across workers.
+            'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(body)
+        self.etags = {encoding: f'"{digest}-{encoding}"' for encoding in self.bodies}
+
+    def negotiate(self, accept_encoding):
+        """Best encoding allowed by an Accept-Encoding header value."""
+        accepted = {}
+        for part in (accept_encoding or '').split(','):
+            coding, _, params = part.strip().partition(';')
+            quality = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            if coding:
+                accepted[coding.strip().lower()] = quality
+        for encoding in ENCODINGS:
+            quality = accepted.get(encoding, accepted.get('*', 1.0 if encoding == 'identity' else 0.0))
+            if quality > 0:
+                return encoding
+        return 'identity'
+
+    def matches(self, if_none_match):
+        """Whether If-None-Match names any encoding of this version."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return any(etag in tags for etag in self.etags.values())
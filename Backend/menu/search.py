@@ -0,0 +1,172 @@
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import NamedTuple
+
+from core.db import use_trigram_search
+from .cache import get_menu
+from .models import Dish
+
+_WORD = re.compile(r'\w+')
+
+# Match kinds, best first.
+EXACT, NAME_PREFIX, NAME_WORDS, CATEGORY_WORDS, FUZZY = range(5)
+MATCH_NAMES = {
+    EXACT: 'exact',
+    NAME_PREFIX: 'prefix',
+    NAME_WORDS: 'word',
+    CATEGORY_WORDS: 'category',
+    FUZZY: 'fuzzy',
+}
+# Same default cut-off as pg_trgm's similarity_threshold.
+SIMILARITY_THRESHOLD = 0.3
+
+
+class DishMatch(NamedTuple):
+    dish: object
+    match: int
+    similarity: float
+
+    @property
+    def rank(self):
+        return (self.match, -self.similarity, len(self.dish.name), self.dish.name.casefold(), self.dish.id)
+
+
+def fold(text):
+    """Lower-cased, accent-free and whitespace-collapsed, for matching."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.split()).casefold()
+
+
+def trigrams(text):
+    """pg_trgm-style trigrams: each word padded with two spaces in front and one behind."""
+    grams = set()
+    for word in _WORD.findall(fold(text)):
+        padded = f'  {word} '
+        grams.update(padded[position:position + 3] for position in range(len(padded) - 2))
+    return grams
+
+
+class DishIndex:
+    """
+    Search structures for one menu snapshot: a sorted array of (term, kind,
+    dish id) searched with bisect for prefixes, and an inverted trigram index
+    for fuzzy matches. Built once per snapshot, never mutated.
+    """
+
+    def __init__(self, menu):
+        self.menu = menu
+        entries = []
+        self.names = {}
+        self.name_trigrams = {}
+        self.by_trigram = defaultdict(set)
+        for dish in menu.dishes.values():
+            name = fold(dish.name)
+            self.names[dish.id] = name
+            # The whole name (so 'paneer ti' matches) plus every later word.
+            entries.append((name, NAME_WORDS, dish.id))
+            for word in _WORD.findall(name)[1:]:
+                entries.append((word, NAME_WORDS, dish.id))
+            for word in _WORD.findall(fold(dish.category_name)):
+                entries.append((word, CATEGORY_WORDS, dish.id))
+            grams = trigrams(dish.name)
+            self.name_trigrams[dish.id] = grams
+            for gram in grams:
+                self.by_trigram[gram].add(dish.id)
+        entries.sort()
+        self.terms = [term for term, _, _ in entries]
+        self.entries = entries
+
+    def prefixed(self, prefix):
+        """{dish id: best kind} for terms starting with ``prefix``."""
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + '\uffff', start)
+        found = {}
+        for _, kind, dish_id in self.entries[start:end]:
+            if kind < found.get(dish_id, FUZZY):
+                found[dish_id] = kind
+        return found
+
+    def prefix_matches(self, query):
+        """Dishes where every query word prefixes a word of the name or category."""
+        folded = fold(query)
+        words = _WORD.findall(folded)
+        if not words:
+            return {}
+        matches = None
+        for word in words:
+            found = self.prefixed(word)
+            if matches is None:
+                matches = found
+            else:
+                matches = {dish_id: max(kind, found[dish_id]) for dish_id, kind in matches.items() if dish_id in found}
+        for dish_id in self.prefixed(folded):
+            name = self.names[dish_id]
+            if name.startswith(folded):
+                matches[dish_id] = EXACT if name == folded else NAME_PREFIX
+        return matches
+
+    def fuzzy_matches(self, query, exclude=()):
+        """{dish id: similarity} for names at least SIMILARITY_THRESHOLD similar to ``query``."""
+        grams = trigrams(query)
+        shared = defaultdict(int)
+        for gram in grams:
+            for dish_id in self.by_trigram.get(gram, ()):
+                shared[dish_id] += 1
+        found = {}
+        for dish_id, count in shared.items():
+            if dish_id in exclude:
+                continue
+            score = count / (len(grams) + len(self.name_trigrams[dish_id]) - count)
+            if score >= SIMILARITY_THRESHOLD:
+                found[dish_id] = score
+        return found
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """The index for the current menu snapshot, rebuilt whenever the menu changes."""
+    global _index
+    menu = get_menu()
+    index = _index
+    if index is not None and index.menu is menu:
+        return index
+    with _lock:
+        if _index is None or _index.menu is not menu:
+            _index = DishIndex(menu)
+        return _index
+
+
+def _database_fuzzy(query, exclude, limit):
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    rows = (
+        Dish.objects.annotate(similarity=TrigramSimilarity('name', query))
+        .filter(similarity__gte=SIMILARITY_THRESHOLD)
+        .exclude(pk__in=exclude)
+        .order_by('-similarity')
+        .values_list('pk', 'similarity')[:limit]
+    )
+    return dict(rows)
+
+
+def search_dishes(query, limit=10):
+    """Ranked DishMatch results: exact, name prefix, word prefixes, category, then fuzzy."""
+    index = get_index()
+    dishes = index.menu.dishes
+    matches = [DishMatch(dishes[dish_id], kind, 1.0) for dish_id, kind in index.prefix_matches(query).items()]
+    if len(matches) < limit and len(fold(query)) >= 3:
+        exclude = {match.dish.id for match in matches}
+        if use_trigram_search():
+            fuzzy = _database_fuzzy(query, exclude, limit - len(matches))
+        else:
+            fuzzy = index.fuzzy_matches(query, exclude)
+        matches += [DishMatch(dishes[dish_id], FUZZY, score) for dish_id, score in fuzzy.items() if dish_id in dishes]
+    return heapq.nsmallest(limit, matches, key=lambda match: match.rank)
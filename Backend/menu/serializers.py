@@ -1,14 +1,16 @@
 from rest_framework import serializers
+
+from core.serializers import TimedSerializerMixin
 from .models import Category, Dish
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
 
 
-class DishSerializer(serializers.ModelSerializer):
+class DishSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Dish
         fields = '__all__'
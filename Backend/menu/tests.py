@@ -1,3 +1,217 @@
-from django.test import TestCase
+import gzip
+import json
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import caches
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from customers.models import Customer
+from userauth.models import User
+from . import cache as menu_cache
+from .cache import VERSION_KEY, get_menu, invalidate_menu, pricing_dishes
+from .models import Category, Dish
+from .search import MATCH_NAMES, get_index, search_dishes
+
+
+class ConditionalGetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Breads')
+        cls.dish = Dish.objects.create(name='Naan', description='', price=Decimal('40.00'), category=cls.category)
+
+    def test_list_not_modified(self):
+        response = self.client.get('/api/dishes/')
+        self.assertIn('ETag', response)
+
+        with self.assertNumQueries(2):
+            cached = self.client.get('/api/dishes/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+    def test_list_changes_after_write(self):
+        etag = self.client.get('/api/dishes/')['ETag']
+        Dish.objects.create(name='Kulcha', description='', price=Decimal('50.00'), category=self.category)
+        response = self.client.get('/api/dishes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+    def test_detail_etag(self):
+        url = f'/api/dishes/{self.dish.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.patch(url, {'price': '45.00'}, format='json')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class MenuSnapshotTests(TransactionTestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Curries')
+        self.dish = Dish.objects.create(name='Korma', description='', price=Decimal('220.00'), category=self.category)
+
+    def test_snapshot_is_reused_until_a_write(self):
+        menu = get_menu()
+        self.assertEqual(menu.dishes[self.dish.pk].category_name, 'Curries')
+        with self.assertNumQueries(0):
+            self.assertIs(get_menu(), menu)
+
+        self.dish.price = Decimal('240.00')
+        self.dish.save()
+        self.assertEqual(get_menu().dishes[self.dish.pk].price, Decimal('240.00'))
+
+        self.category.delete()
+        self.assertEqual(get_menu().dishes, {})
+
+    @override_settings(MENU_CACHE_ALIAS='default')
+    def test_shared_version(self):
+        menu = get_menu()
+        # Another worker bumping the shared version forces a rebuild here.
+        caches['default'].set(VERSION_KEY, 'other-worker')
+        self.assertIsNot(get_menu(), menu)
+        self.assertEqual(get_menu().version, 'other-worker')
+
+    def test_snapshot_expires_after_max_age(self):
+        menu = get_menu()
+        # A write through another worker: no signal reaches this process.
+        Dish.objects.filter(pk=self.dish.pk).update(price=Decimal('260.00'))
+        self.assertIs(get_menu(), menu)
+        menu.built_at -= menu_cache.MAX_AGE
+        self.assertEqual(get_menu().dishes[self.dish.pk].price, Decimal('260.00'))
+
+    def test_pricing_reads_the_database_without_a_shared_version(self):
+        get_menu()
+        Dish.objects.filter(pk=self.dish.pk).update(price=Decimal('260.00'))
+        with self.assertNumQueries(1):
+            self.assertEqual(pricing_dishes([self.dish.pk])[self.dish.pk].price, Decimal('260.00'))
+
+        with override_settings(MENU_CACHE_ALIAS='default'):
+            get_menu()
+            with self.assertNumQueries(0):
+                self.assertEqual(pricing_dishes([self.dish.pk])[self.dish.pk].price, Decimal('260.00'))
+
+    def test_dish_instances(self):
+        menu = get_menu()
+        with self.assertNumQueries(0):
+            found = menu.dish_instances([self.dish.pk, 999])
+        self.assertEqual(list(found), [self.dish.pk])
+        self.assertEqual(found[self.dish.pk].price, Decimal('220.00'))
+
+
+class MenuSearchTests(TransactionTestCase):
+    def setUp(self):
+        mains = Category.objects.create(name='Tandoor Specials')
+        breads = Category.objects.create(name='Breads')
+        for name, category in (
+            ('Paneer Tikka', mains),
+            ('Paneer Butter Masala', mains),
+            ('Chicken Tikka', mains),
+            ('Butter Naan', breads),
+            ('Crème Brûlée', breads),
+        ):
+            Dish.objects.create(name=name, description='', price=Decimal('100.00'), category=category)
+
+    def names(self, query, limit=10):
+        return [match.dish.name for match in search_dishes(query, limit)]
+
+    def matches(self, query):
+        return [(match.dish.name, MATCH_NAMES[match.match]) for match in search_dishes(query)]
+
+    def test_prefix_ranking(self):
+        self.assertEqual(self.names('paneer'), ['Paneer Tikka', 'Paneer Butter Masala'])
+        self.assertEqual(self.matches('butter'), [('Butter Naan', 'prefix'), ('Paneer Butter Masala', 'word')])
+        self.assertEqual(self.matches('tikka'), [('Paneer Tikka', 'word'), ('Chicken Tikka', 'word')])
+        self.assertEqual(self.matches('tandoor naan'), [])
+        self.assertEqual(
+            self.matches('tandoor'),
+            [('Paneer Tikka', 'category'), ('Chicken Tikka', 'category'), ('Paneer Butter Masala', 'category')],
+        )
+        self.assertEqual(self.matches('CREME brulee'), [('Crème Brûlée', 'exact')])
+
+    def test_fuzzy_matches_rank_last(self):
+        self.assertEqual(self.matches('paneer ti'), [('Paneer Tikka', 'prefix'), ('Paneer Butter Masala', 'fuzzy')])
+        self.assertEqual(self.matches('panner tika'), [('Paneer Tikka', 'fuzzy')])
+        self.assertEqual(self.matches('chiken'), [('Chicken Tikka', 'fuzzy')])
+
+    def test_index_is_reused_until_a_menu_write(self):
+        index = get_index()
+        with self.assertNumQueries(0):
+            self.assertIs(get_index(), index)
+            self.names('naan')
+        Dish.objects.filter(name='Butter Naan').get().delete()
+        self.assertEqual(self.names('naan'), [])
+
+    def test_endpoint(self):
+        now = timezone.now()
+        Customer.objects.create(name='Paneer Lover', normalized_name='paneer lover', first_visit=now, last_visit=now, visit_count=1)
+        response = self.client.get('/api/search/', {'q': 'Pan', 'limit': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['dishes'][0]['name'], 'Paneer Tikka')
+        self.assertEqual(response.data['dishes'][0]['match'], 'prefix')
+        self.assertEqual([customer['name'] for customer in response.data['customers']], ['Paneer Lover'])
+        self.assertEqual(self.client.get('/api/search/', {'q': 'pan', 'types': 'tables'}).status_code, 400)
+
+    def test_admin_search_keeps_description_and_is_not_capped(self):
+        breads = Category.objects.get(name='Breads')
+        Dish.objects.create(name='Kulcha', description='Stuffed with paneer', price=Decimal('90.00'), category=breads)
+        Dish.objects.bulk_create([
+            Dish(name=f'Roti {number}', description='', price=Decimal('20.00'), category=breads) for number in range(250)
+        ])
+        invalidate_menu()
+        self.client.force_login(User.objects.create_superuser(
+            username='owner', email='owner@example.com', password='x', first_name='A', last_name='B',
+        ))
+
+        def admin_search(term):
+            response = self.client.get('/admin/menu/dish/', {'q': term})
+            self.assertEqual(response.status_code, 200)
+            return response.context['cl'].result_count
+
+        self.assertEqual(admin_search('roti'), 250)
+        # Description substring, and accents/typos through the index.
+        self.assertEqual(admin_search('stuffed'), 1)
+        self.assertEqual(admin_search('creme'), 1)
+        self.assertEqual(admin_search('paneer'), 3)
+
+
+class MenuSnapshotEndpointTests(TransactionTestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Curries')
+        self.dish = Dish.objects.create(name='Korma', description='Long text ' * 50, price=Decimal('220.00'), category=self.category)
+
+    def test_columnar_body_and_encodings(self):
+        response = self.client.get('/api/menu/snapshot/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response)
+        body = json.loads(response.content)
+        self.assertEqual(body['dishes'], {
+            'id': [self.dish.pk], 'name': ['Korma'], 'price': ['220.00'], 'category': [self.category.pk], 'is_veg': [True],
+        })
+        self.assertEqual(body['categories'], {'id': [self.category.pk], 'name': ['Curries']})
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        compressed = self.client.get('/api/menu/snapshot/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), response.content)
+        self.assertNotEqual(compressed['ETag'], response['ETag'])
+
+        identity = self.client.get('/api/menu/snapshot/', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertNotIn('Content-Encoding', identity)
+
+    def test_cached_bytes_and_etags(self):
+        first = self.client.get('/api/menu/snapshot/', HTTP_ACCEPT_ENCODING='gzip')
+        with self.assertNumQueries(0):
+            again = self.client.get('/api/menu/snapshot/', HTTP_ACCEPT_ENCODING='gzip')
+            not_modified = self.client.get('/api/menu/snapshot/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.content, first.content)
+        self.assertIs(get_menu().compact.bodies['gzip'], get_menu().compact.bodies['gzip'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], first['ETag'])
+
+        self.dish.price = Decimal('240.00')
+        self.dish.save()
+        changed = self.client.get('/api/menu/snapshot/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+        self.assertEqual(json.loads(gzip.decompress(changed.content))['dishes']['price'], ['240.00'])
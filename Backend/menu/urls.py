@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CategoryViewSet, DishViewSet
+from .views import CategoryViewSet, DishViewSet, MenuSnapshotView
 
 router = DefaultRouter()
 router.register(r'categories', CategoryViewSet)
@@ -8,4 +8,5 @@ router.register(r'dishes', DishViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('menu/snapshot/', MenuSnapshotView.as_view(), name='menu-snapshot'),
 ]
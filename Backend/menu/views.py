@@ -1,13 +1,69 @@
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
 from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.mixins import ConditionalGetMixin, TombstoneBatchMixin
+from .cache import get_menu
 from .models import Category, Dish
 from .serializers import CategorySerializer, DishSerializer
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class MenuSnapshotMixin:
+    """
+    Serves list GETs from the process-wide menu snapshot (see menu.cache)
+    instead of querying and re-serializing. The snapshot version doubles as
+    the collection version for conditional GETs, so a 304 costs no query.
+    """
+    snapshot_rows = None
+
+    def get_collection_version(self, queryset):
+        menu = get_menu()
+        return menu.last_modified, (menu.version, len(getattr(menu, self.snapshot_rows)))
+
+    def get_dependency_versions(self):
+        # Deletes invalidate the snapshot, so tombstones add nothing here.
+        return []
+
+    def list(self, request, *args, **kwargs):
+        return Response(getattr(get_menu(), self.snapshot_rows))
+
+
+class CategoryViewSet(ConditionalGetMixin, TombstoneBatchMixin, MenuSnapshotMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    snapshot_rows = 'category_rows'
 
 
-class DishViewSet(viewsets.ModelViewSet):
+class DishViewSet(ConditionalGetMixin, TombstoneBatchMixin, MenuSnapshotMixin, viewsets.ModelViewSet):
     queryset = Dish.objects.all()
     serializer_class = DishSerializer
+    snapshot_rows = 'dish_rows'
+
+
+class MenuSnapshotView(APIView):
+    """
+    GET /api/menu/snapshot/
+
+    The whole menu as compact parallel arrays (ids, names, prices,
+    categories, is_veg) in one response. The body is rendered and
+    compressed once per menu version, so a request is a version check plus
+    a copy of cached bytes; If-None-Match with the last ETag gets a 304.
+    """
+
+    def get(self, request):
+        compact = get_menu().compact
+        encoding = compact.negotiate(request.headers.get('Accept-Encoding'))
+        if compact.matches(request.headers.get('If-None-Match')):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(compact.bodies[encoding], content_type='application/json')
+            if encoding != 'identity':
+                response['Content-Encoding'] = encoding
+        response['ETag'] = compact.etags[encoding]
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['Cache-Control'] = 'no-cache'
+        if compact.last_modified is not None:
+            response['Last-Modified'] = http_date(compact.last_modified.timestamp())
+        return response
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Order, OrderItem, Earning
+from .models import Order, OrderItem, Earning, SalesRollup, DishSales, DishDailySales
+from .signals import order_changed
+from .snapshots import snapshot_order
 
 
 class OrderItemInline(admin.TabularInline):
@@ -27,6 +29,16 @@ class OrderAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         return False
 
+    def save_model(self, request, obj, form, change):
+        # Snapshot the stored order before the form (and its inlines) change it.
+        obj._before = snapshot_order(Order.objects.get(pk=obj.pk)) if change else None
+        super().save_model(request, obj, form, change)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        order = form.instance
+        order_changed.send(sender=Order, before=order._before, after=snapshot_order(order, items=order.items.all()))
+
 
 class OrderStatusFilter(admin.SimpleListFilter):
     title = 'Order Status'
@@ -65,3 +77,50 @@ class EarningAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(SalesRollup)
+class SalesRollupAdmin(admin.ModelAdmin):
+    list_display = ('id', 'period', 'bucket', 'revenue', 'order_count', 'customer_count', 'dishes_sold')
+    list_filter = ('period', 'date')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DishSales)
+class DishSalesAdmin(admin.ModelAdmin):
+    list_display = ('dish', 'quantity', 'revenue', 'order_count')
+    list_select_related = ('dish',)
+    ordering = ('-quantity',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DishDailySales)
+class DishDailySalesAdmin(admin.ModelAdmin):
+    list_display = ('dish', 'date', 'quantity', 'revenue', 'order_count')
+    list_select_related = ('dish',)
+    list_filter = ('date',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
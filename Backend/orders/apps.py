@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class OrdersConfig(AppConfig):
     name = 'orders'
+
+    def ready(self):
+        from . import dish_sales, kitchen, notifications, rollups  # noqa: F401  (connects order_changed receivers)
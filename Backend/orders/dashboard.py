@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import ACTIVE_STATUSES, Order, SalesRollup
+
+
+def todays_kpis(today_row):
+    """
+    Today's dashboard figures. Sales figures come from the day's rollup row;
+    the live order-state counters are computed in a single filtered-aggregate
+    query over the active orders only.
+    """
+    live = Order.objects.filter(status__in=ACTIVE_STATUSES).aggregate(
+        in_progress=Count('pk', filter=Q(status='In Progress')),
+        active_orders=Count('pk'),
+    )
+    return {
+        'revenue': today_row.revenue,
+        'total_customer': today_row.customer_count,
+        'event_count': today_row.order_count,
+        'total_dishes': today_row.dishes_sold,
+        'in_progress': live['in_progress'],
+        'active_orders': live['active_orders'],
+    }
+
+
+def sales_series(today, days=30):
+    """Daily rollup rows for the ``days`` days up to and including ``today``."""
+    return list(
+        SalesRollup.objects.filter(
+            period='day',
+            date__gte=today - timedelta(days=days),
+            date__lte=today,
+        ).order_by('date')
+    )
+
+
+def dashboard_summary(today=None, days=30):
+    """Everything the performance dashboard needs in two queries."""
+    today = today or timezone.localdate()
+    series = sales_series(today, days=days)
+    today_row = next((row for row in series if row.date == today), None) or SalesRollup(date=today)
+    return {
+        'today': todays_kpis(today_row),
+        'sales_details': [
+            {'created_at__date': row.date, 'daily_total': row.revenue}
+            for row in series
+        ],
+    }
@@ -0,0 +1,142 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import DishDailySales, DishSales, OrderItem
+from .signals import order_changed
+
+COUNTERS = ('quantity', 'revenue', 'order_count')
+# Window name -> number of days ending today; None is lifetime.
+WINDOWS = {'today': 1, '7d': 7, '30d': 30, 'all': None}
+RANKINGS = {'quantity': 'total_quantity', 'revenue': 'total_revenue', 'orders': 'total_orders'}
+
+
+def _empty():
+    return {'quantity': 0, 'revenue': Decimal('0'), 'order_count': 0}
+
+
+def _dish_deltas(before, after):
+    """Counter deltas keyed by dish id, and by (dish id, local date)."""
+    lifetime = defaultdict(_empty)
+    daily = defaultdict(_empty)
+    for snapshot, sign in ((before, -1), (after, 1)):
+        if snapshot is None:
+            continue
+        day = timezone.localtime(snapshot.created_at).date()
+        for item in snapshot.items:
+            for delta in (lifetime[item.dish_id], daily[(item.dish_id, day)]):
+                delta['quantity'] += sign * item.quantity
+                delta['revenue'] += sign * item.price
+                delta['order_count'] += sign
+    return lifetime, daily
+
+
+def _increment(model, deltas):
+    """
+    Add ``deltas`` ({lookup: counter deltas}) to the counter rows, inserting
+    missing rows first. Two queries however many rows are touched.
+    """
+    deltas = {lookup: delta for lookup, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+    model.objects.bulk_create([model(**dict(lookup)) for lookup in deltas], ignore_conflicts=True)
+    conditions = [(Q(**dict(lookup)), delta) for lookup, delta in deltas.items()]
+    model.objects.filter(reduce(or_, (condition for condition, _ in conditions))).update(**{
+        field: F(field) + Case(
+            *[When(condition, then=Value(delta[field])) for condition, delta in conditions],
+            default=Value(0),
+            output_field=model._meta.get_field(field),
+        )
+        for field in COUNTERS
+    })
+
+
+def apply_dish_change(before, after):
+    """Fold the item difference between two order snapshots into the dish counters."""
+    lifetime, daily = _dish_deltas(before, after)
+    with transaction.atomic():
+        _increment(DishSales, {(('dish_id', dish_id),): delta for dish_id, delta in lifetime.items()})
+        _increment(DishDailySales, {
+            (('dish_id', dish_id), ('date', day)): delta for (dish_id, day), delta in daily.items()
+        })
+
+
+@receiver(order_changed)
+def update_dish_sales(sender, before=None, after=None, **kwargs):
+    apply_dish_change(before, after)
+
+
+def top_dishes(window='all', by='quantity', limit=5, today=None):
+    """
+    The ``limit`` best-selling dishes over ``window`` (a WINDOWS key) ranked
+    by ``by`` (a RANKINGS key). Windows sum at most 30 daily rows per dish.
+    """
+    ranking = RANKINGS[by]
+    days = WINDOWS[window]
+    if days is None:
+        rows = DishSales.objects.values(
+            'dish_id',
+            'dish__name',
+            total_quantity=F('quantity'),
+            total_revenue=F('revenue'),
+            total_orders=F('order_count'),
+        )
+    else:
+        today = today or timezone.localdate()
+        rows = (
+            DishDailySales.objects.filter(date__gt=today - timedelta(days=days), date__lte=today)
+            .values('dish_id', 'dish__name')
+            .annotate(
+                total_quantity=Sum('quantity'),
+                total_revenue=Sum('revenue'),
+                total_orders=Sum('order_count'),
+            )
+        )
+    rows = rows.filter(**{f'{ranking}__gt': 0}).order_by(f'-{ranking}', 'dish__name')[:limit]
+    return [
+        {
+            'dish': row['dish_id'],
+            'dish_name': row['dish__name'],
+            'quantity': row['total_quantity'],
+            'revenue': row['total_revenue'],
+            'order_count': row['total_orders'],
+        }
+        for row in rows
+    ]
+
+
+def rebuild_dish_sales():
+    """
+    Recompute every dish counter from the order items, repairing any drift
+    (e.g. from writes that bypass order_changed). Returns the number of
+    (lifetime, daily) rows written.
+    """
+    totals = dict(quantity=Sum('quantity'), revenue=Sum('price'), order_count=Count('pk'))
+    lifetime = [
+        DishSales(dish_id=row.pop('dish_id'), **row)
+        for row in OrderItem.objects.order_by().values('dish_id').annotate(**totals).iterator()
+    ]
+    daily = [
+        DishDailySales(dish_id=row.pop('dish_id'), date=row.pop('day'), **row)
+        for row in (
+            OrderItem.objects.order_by()
+            .annotate(day=TruncDate('order__created_at', tzinfo=timezone.get_current_timezone()))
+            .values('dish_id', 'day')
+            .annotate(**totals)
+            .iterator()
+        )
+    ]
+    with transaction.atomic():
+        DishSales.objects.all().delete()
+        DishDailySales.objects.all().delete()
+        DishSales.objects.bulk_create(lifetime, batch_size=1000)
+        DishDailySales.objects.bulk_create(daily, batch_size=1000)
+    return len(lifetime), len(daily)
@@ -0,0 +1,164 @@
+import csv
+import json
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+from .filters import parse_bound
+from .models import Earning, Order, OrderItem
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+CHUNK_SIZE = 2000
+# Rows are joined into writes of about this many characters, rather than
+# one tiny write per row.
+BUFFER_SIZE = 64 * 1024
+
+ORDER_COLUMNS = (
+    'order_id', 'created_at', 'customer_name', 'table', 'order_type', 'status', 'total_amount',
+    'item_id', 'dish_id', 'dish_name', 'quantity', 'price',
+)
+EARNING_COLUMNS = ('id', 'order_id', 'date', 'completed_at', 'amount')
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each line back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _parse_day(name, value):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({name: 'Enter a date (YYYY-MM-DD).'})
+    return day
+
+
+def order_queryset(start=None, end=None):
+    """Orders created between the inclusive ``start`` and ``end`` dates/datetimes, oldest first."""
+    items = OrderItem.objects.select_related('dish').only('order', 'dish', 'quantity', 'price', 'dish__name')
+    queryset = (
+        Order.objects.select_related('table')
+        .only('created_at', 'customer_name', 'order_type', 'status', 'total_amount', 'table__table_number')
+        .order_by('pk')
+        .prefetch_related(Prefetch('items', queryset=items.order_by('pk')))
+    )
+    if start:
+        queryset = queryset.filter(created_at__gte=parse_bound('start', start))
+    if end:
+        queryset = queryset.filter(created_at__lt=parse_bound('end', end, end_of_day=True))
+    return queryset
+
+
+def earning_queryset(start=None, end=None):
+    """Earnings dated between the inclusive ``start`` and ``end`` days."""
+    queryset = Earning.objects.order_by('pk')
+    if start:
+        queryset = queryset.filter(date__gte=_parse_day('start', start))
+    if end:
+        queryset = queryset.filter(date__lt=_parse_day('end', end) + timedelta(days=1))
+    return queryset
+
+
+def _order_records(queryset, chunk_size):
+    # iterator() with a chunk_size still runs the items prefetch, one query per chunk.
+    for order in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            'order_id': order.pk,
+            'created_at': order.created_at,
+            'customer_name': order.customer_name,
+            'table': order.table.table_number if order.table else None,
+            'order_type': order.order_type,
+            'status': order.status,
+            'total_amount': order.total_amount,
+            'items': [
+                {
+                    'item_id': item.pk,
+                    'dish_id': item.dish_id,
+                    'dish_name': item.dish.name,
+                    'quantity': item.quantity,
+                    'price': item.price,
+                }
+                for item in order.items.all()
+            ],
+        }
+
+
+def _earning_records(queryset, chunk_size):
+    for earning in queryset.values_list(*EARNING_COLUMNS).iterator(chunk_size=chunk_size):
+        yield dict(zip(EARNING_COLUMNS, earning))
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_value(row.get(column)) for column in columns])
+
+
+def _order_csv_rows(records):
+    # One line per item, repeating the order's columns; orders without items get one line.
+    for record in records:
+        items = record.pop('items')
+        if not items:
+            yield record
+        for item in items:
+            yield {**record, **item}
+
+
+def _ndjson_lines(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+
+def _buffered(lines, size=BUFFER_SIZE):
+    buffer = []
+    length = 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def export_orders(export_format, start=None, end=None, chunk_size=CHUNK_SIZE):
+    """Generator of text chunks for orders (with items) in ``export_format``."""
+    records = _order_records(order_queryset(start, end), chunk_size)
+    if export_format == 'csv':
+        return _buffered(_csv_lines(ORDER_COLUMNS, _order_csv_rows(records)))
+    return _buffered(_ndjson_lines(records))
+
+
+def export_earnings(export_format, start=None, end=None, chunk_size=CHUNK_SIZE):
+    """Generator of text chunks for earnings in ``export_format``."""
+    records = _earning_records(earning_queryset(start, end), chunk_size)
+    if export_format == 'csv':
+        return _buffered(_csv_lines(EARNING_COLUMNS, records))
+    return _buffered(_ndjson_lines(records))
+
+
+EXPORTS = {
+    'orders': export_orders,
+    'earnings': export_earnings,
+}
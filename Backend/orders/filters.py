@@ -0,0 +1,75 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Order
+
+
+def parse_bound(name, value, end_of_day=False):
+    """
+    An aware datetime for the ``name`` query parameter. A date is local
+    midnight, or with ``end_of_day`` the following midnight, so it can be
+    used as an exclusive upper bound that still includes the whole day.
+    Raises ValidationError (400) for anything else.
+    """
+    try:
+        # Dates first: parse_datetime() also accepts a bare date, as midnight.
+        day = parse_date(value)
+        moment = None if day is not None else parse_datetime(value)
+    except ValueError:
+        day = moment = None
+    if day is not None:
+        if end_of_day:
+            day += timedelta(days=1)
+        return timezone.make_aware(datetime.combine(day, time.min))
+    if moment is None:
+        raise ValidationError({name: 'Enter a date (YYYY-MM-DD) or an ISO 8601 datetime.'})
+    return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+
+
+class OrderFilterBackend(BaseFilterBackend):
+    """
+    Server-side order filters:
+
+    ?status=Pending,In Progress  ?order_type=Takeaway  ?table=3
+    ?created_after=2026-01-01    ?created_before=2026-01-31
+
+    Dates are inclusive local days; datetimes are used as given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        status = params.get('status')
+        if status:
+            statuses = [value.strip() for value in status.split(',') if value.strip()]
+            valid = {choice for choice, _ in Order.STATUS_CHOICES}
+            unknown = [value for value in statuses if value not in valid]
+            if unknown:
+                raise ValidationError({'status': f"Unknown status: {', '.join(unknown)}"})
+            queryset = queryset.filter(status__in=statuses)
+
+        order_type = params.get('order_type')
+        if order_type:
+            if order_type not in {choice for choice, _ in Order.ORDER_TYPE_CHOICES}:
+                raise ValidationError({'order_type': f"Unknown order type: {order_type}"})
+            queryset = queryset.filter(order_type=order_type)
+
+        table = params.get('table')
+        if table:
+            if not table.isdigit():
+                raise ValidationError({'table': 'Table must be a numeric id.'})
+            queryset = queryset.filter(table_id=int(table))
+
+        created_after = params.get('created_after')
+        if created_after:
+            queryset = queryset.filter(created_at__gte=parse_bound('created_after', created_after))
+
+        created_before = params.get('created_before')
+        if created_before:
+            queryset = queryset.filter(created_at__lt=parse_bound('created_before', created_before, end_of_day=True))
+
+        return queryset
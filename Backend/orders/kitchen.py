@@ -0,0 +1,147 @@
+import threading
+import time
+from typing import NamedTuple, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.dispatch import receiver
+
+from core.versions import VersionStamp
+from menu.cache import get_menu
+from .models import ACTIVE_STATUSES, Order, OrderItem
+from .signals import order_changed
+
+VERSION_KEY = 'kitchen:queue:version'
+version_stamp = VersionStamp(VERSION_KEY, 'KITCHEN_CACHE_ALIAS')
+# Rebuild from the database at least this often, which picks up writes that
+# bypass order_changed (raw or bulk updates).
+MAX_AGE = 60
+# Long-poll waits re-check the shared version this often, for changes made
+# by other worker processes.
+POLL_INTERVAL = 1.0
+
+
+class TicketItem(NamedTuple):
+    dish_id: int
+    dish_name: str
+    quantity: int
+
+
+class Ticket(NamedTuple):
+    id: int
+    customer_name: str
+    table_id: Optional[int]
+    order_type: str
+    status: str
+    created_at: object
+    items: Tuple[TicketItem, ...]
+
+    @property
+    def priority(self):
+        # Takeaway orders have a pickup deadline; then oldest first.
+        return (self.order_type != 'Takeaway', self.created_at, self.id)
+
+
+class KitchenQueue:
+    """Immutable set of open tickets for one version of the queue."""
+
+    def __init__(self, version, tickets):
+        self.version = version
+        self.tickets = tickets
+        self.built_at = time.monotonic()
+        self.ordered = sorted(tickets.values(), key=lambda ticket: ticket.priority)
+
+
+_queue = None
+_condition = threading.Condition()
+
+
+def current_version():
+    return version_stamp.current()
+
+
+def _ticket_items(items):
+    dishes = get_menu().dishes
+    return tuple(
+        TicketItem(item.dish_id, dishes[item.dish_id].name if item.dish_id in dishes else '', item.quantity)
+        for item in items
+    )
+
+
+def _build(version):
+    orders = Order.objects.filter(status__in=ACTIVE_STATUSES).prefetch_related(
+        Prefetch('items', queryset=OrderItem.objects.order_by('pk')),
+    )
+    return KitchenQueue(version, {
+        order.pk: Ticket(
+            order.pk, order.customer_name, order.table_id, order.order_type, order.status,
+            order.created_at, _ticket_items(order.items.all()),
+        )
+        for order in orders
+    })
+
+
+def get_queue():
+    """The current queue, rebuilt from the database if it's stale."""
+    global _queue
+    version = current_version()
+    queue = _queue
+    if queue is not None and queue.version == version and time.monotonic() - queue.built_at < MAX_AGE:
+        return queue
+    with _condition:
+        if _queue is None or _queue.version != version or time.monotonic() - _queue.built_at >= MAX_AGE:
+            # Version first, rows second: a racing write leaves this stale, never wrongly current.
+            _queue = _build(version)
+        return _queue
+
+
+def apply_change(before, after):
+    """
+    Fold a committed order change into the in-memory queue without touching
+    the database, and wake long-polling readers.
+    """
+    global _queue
+    with _condition:
+        previous = current_version()
+        version = version_stamp.bump()
+        queue = _queue
+        if queue is not None and queue.version == previous:
+            tickets = dict(queue.tickets)
+            pk = (after or before).pk
+            tickets.pop(pk, None)
+            if after is not None and after.status in ACTIVE_STATUSES:
+                tickets[pk] = Ticket(
+                    after.pk, after.customer_name, after.table_id, after.order_type, after.status,
+                    after.created_at, _ticket_items(after.items),
+                )
+            updated = KitchenQueue(version, tickets)
+            updated.built_at = queue.built_at
+            _queue = updated
+        _condition.notify_all()
+
+
+def invalidate_queue():
+    """Force a rebuild on the next read, e.g. after bulk edits."""
+    global _queue
+    with _condition:
+        version_stamp.bump()
+        _queue = None
+        _condition.notify_all()
+
+
+def wait_for_change(version, timeout):
+    """Block until the queue version differs from ``version`` or ``timeout`` passes."""
+    deadline = time.monotonic() + timeout
+    with _condition:
+        while current_version() == version:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _condition.wait(min(remaining, POLL_INTERVAL))
+    return True
+
+
+@receiver(order_changed)
+def update_kitchen_queue(sender, before=None, after=None, **kwargs):
+    if (before and before.status in ACTIVE_STATUSES) or (after and after.status in ACTIVE_STATUSES):
+        transaction.on_commit(lambda: apply_change(before, after))
@@ -1,9 +1,19 @@
+import time
+from itertools import islice
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 
 from orders.models import Order, Earning
 
 
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
 class Command(BaseCommand):
     help = "Backfill earnings for completed orders."
 
@@ -13,47 +23,87 @@ class Command(BaseCommand):
             action="store_true",
             help="Show how many earnings would be created without writing to DB.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Orders read and written per batch (default: 2000).",
+        )
+        parser.add_argument(
+            "--since-id",
+            type=int,
+            default=0,
+            help="Only process orders with an id greater than this; use the last id printed to resume.",
+        )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
+        chunk_size = options["chunk_size"]
 
-        completed_orders = Order.objects.filter(status="Completed")
+        completed_orders = (
+            Order.objects.filter(status="Completed", pk__gt=options["since_id"])
+            .order_by("pk")
+            .only("pk", "created_at", "total_amount")
+        )
         created_count = 0
         updated_count = 0
+        unchanged_count = 0
+        processed = 0
+        started = time.monotonic()
 
-        for order in completed_orders:
-            completed_at = order.created_at
-            defaults = {
-                "date": completed_at.date(),
-                "completed_at": completed_at,
-                "amount": order.total_amount,
+        for chunk in chunked(completed_orders.iterator(chunk_size=chunk_size), chunk_size):
+            existing = {
+                earning.order_id: earning
+                for earning in Earning.objects.filter(order_id__in=[order.pk for order in chunk])
             }
+            now = timezone.now()
+            to_create = []
+            to_update = []
 
-            if dry_run:
-                if not Earning.objects.filter(order=order).exists():
-                    created_count += 1
+            for order in chunk:
+                completed_at = order.created_at
+                defaults = {
+                    "date": completed_at.date(),
+                    "completed_at": completed_at,
+                    "amount": order.total_amount,
+                }
+                earning = existing.get(order.pk)
+                if earning is None:
+                    to_create.append(Earning(order_id=order.pk, **defaults))
+                elif any(getattr(earning, field) != value for field, value in defaults.items()):
+                    for field, value in defaults.items():
+                        setattr(earning, field, value)
+                    earning.updated_at = now
+                    to_update.append(earning)
                 else:
-                    updated_count += 1
-                continue
+                    unchanged_count += 1
 
-            earning, created = Earning.objects.update_or_create(
-                order=order,
-                defaults=defaults,
+            if not dry_run:
+                with transaction.atomic():
+                    Earning.objects.bulk_create(to_create)
+                    Earning.objects.bulk_update(to_update, ["date", "completed_at", "amount", "updated_at"])
+
+            created_count += len(to_create)
+            updated_count += len(to_update)
+            processed += len(chunk)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"Processed {processed} orders up to id {chunk[-1].pk} "
+                f"({processed / elapsed if elapsed else 0:.0f} orders/s)"
             )
-            if created:
-                created_count += 1
-            else:
-                updated_count += 1
 
+        elapsed = time.monotonic() - started
         if dry_run:
             self.stdout.write(
                 self.style.WARNING(
-                    f"[DRY RUN] Would create {created_count} and update {updated_count} earnings."
+                    f"[DRY RUN] Would create {created_count} and update {updated_count} earnings "
+                    f"({unchanged_count} unchanged, {processed} orders in {elapsed:.1f}s)."
                 )
             )
         else:
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"Created {created_count} and updated {updated_count} earnings."
+                    f"Created {created_count} and updated {updated_count} earnings "
+                    f"({unchanged_count} unchanged, {processed} orders in {elapsed:.1f}s)."
                 )
             )
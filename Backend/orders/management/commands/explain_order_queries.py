@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+
+from orders.models import ACTIVE_STATUSES, Earning, Order, OrderItem
+from core.dates import day_bounds
+
+# Indexes added for the hot paths below; --compare drops them temporarily.
+HOT_PATH_INDEXES = (
+    (Order, 'order_created_idx'),
+    (Order, 'order_customer_created_idx'),
+    (Order, 'order_active_created_idx'),
+    (Earning, 'earning_date_idx'),
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+def hot_queries():
+    today = timezone.localdate()
+    start, end = day_bounds(today)
+    return [
+        ('Order list page', Order.objects.order_by('-created_at', '-id')[:50]),
+        ("Today's orders", Order.objects.filter(created_at__gte=start, created_at__lt=end)),
+        (
+            'Live order counters',
+            Order.objects.filter(status__in=ACTIVE_STATUSES).values('status').annotate(count=Count('pk')),
+        ),
+        (
+            'Rollup customer check',
+            Order.objects.filter(customer_name='Guest', created_at__gte=start, created_at__lt=end),
+        ),
+        ('Earnings for the last 30 days', Earning.objects.filter(date__gte=today - timedelta(days=30), date__lte=today)),
+        (
+            'Popular dishes',
+            OrderItem.objects.values('dish__name').annotate(count=Count('id')).order_by('-count')[:5],
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Print query plans for the hot order/earning queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Also show the plans without the hot-path indexes (dropped inside a rolled-back transaction).",
+        )
+
+    def handle(self, *args, **options):
+        if options["compare"]:
+            if not connection.features.can_rollback_ddl:
+                raise CommandError(f"--compare needs transactional DDL, which {connection.vendor} does not support.")
+            self.stdout.write(self.style.WARNING("== Without hot-path indexes =="))
+            try:
+                with connection.schema_editor(atomic=True) as schema_editor:
+                    for model, name in HOT_PATH_INDEXES:
+                        index = next(index for index in model._meta.indexes if index.name == name)
+                        schema_editor.remove_index(model, index)
+                    self.explain_all()
+                    raise Rollback
+            except Rollback:
+                pass
+            self.stdout.write(self.style.SUCCESS("== With hot-path indexes =="))
+
+        self.explain_all()
+
+    def explain_all(self):
+        for label, queryset in hot_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain())
+            self.stdout.write("")
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from orders.exports import CHUNK_SIZE, EXPORTS, FORMATS
+
+
+class Command(BaseCommand):
+    help = "Stream orders (with items) or earnings to CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(EXPORTS))
+        parser.add_argument("--format", dest="export_format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--start", help="First day (YYYY-MM-DD) to include.")
+        parser.add_argument("--end", help="Last day (YYYY-MM-DD) to include.")
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="File to write to (default: stdout).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help=f"Rows read from the database per query (default: {CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            stream = EXPORTS[options["dataset"]](
+                options["export_format"],
+                start=options["start"],
+                end=options["end"],
+                chunk_size=options["chunk_size"],
+            )
+        except ValidationError as exc:
+            raise CommandError(exc.detail)
+
+        started = time.monotonic()
+        written = 0
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                for chunk in stream:
+                    output.write(chunk)
+                    written += len(chunk)
+            self.stderr.write(
+                self.style.SUCCESS(
+                    f"Wrote {written} characters to {options['output']} in {time.monotonic() - started:.1f}s."
+                )
+            )
+        else:
+            for chunk in stream:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from orders.dish_sales import rebuild_dish_sales
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-dish sales counters (lifetime and daily) from order items."
+
+    def handle(self, *args, **options):
+        lifetime, daily = rebuild_dish_sales()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {lifetime} lifetime and {daily} daily dish sales rows."))
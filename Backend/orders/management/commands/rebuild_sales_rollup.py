@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily/hourly sales rollup from order history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only rebuild buckets from this date (YYYY-MM-DD) onwards.",
+        )
+
+    def handle(self, *args, **options):
+        since = options["since"]
+        if since:
+            try:
+                since = date.fromisoformat(since)
+            except ValueError:
+                raise CommandError("--since must be a date in YYYY-MM-DD format.")
+
+        written = rebuild_rollups(since=since)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} sales rollup rows."))
@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_earning_order_completed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('hour', 'Hour')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('date', models.DateField()),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('order_count', models.IntegerField(default=0)),
+                ('customer_count', models.IntegerField(default=0)),
+                ('dishes_sold', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ('period', 'bucket'),
+                'indexes': [models.Index(fields=['period', 'date'], name='sales_rollup_period_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'bucket'), name='unique_sales_rollup_bucket')],
+            },
+        ),
+    ]
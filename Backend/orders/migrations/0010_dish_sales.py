@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0002_updated_at'),
+        ('orders', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DishDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('quantity', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('order_count', models.IntegerField(default=0)),
+                ('dish', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='menu.dish')),
+            ],
+            options={
+                'verbose_name_plural': 'dish daily sales',
+                'indexes': [models.Index(fields=['date', 'dish'], name='dish_daily_sales_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('dish', 'date'), name='unique_dish_daily_sales')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DishSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('order_count', models.IntegerField(default=0)),
+                ('dish', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='sales', to='menu.dish')),
+            ],
+            options={
+                'verbose_name_plural': 'dish sales',
+                'indexes': [models.Index(fields=['quantity'], name='dish_sales_quantity_idx'), models.Index(fields=['revenue'], name='dish_sales_revenue_idx')],
+            },
+        ),
+    ]
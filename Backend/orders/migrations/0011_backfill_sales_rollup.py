@@ -0,0 +1,61 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import migrations
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+
+
+def bucket_start(value, period):
+    # Frozen copy of orders.rollups.bucket_bounds (start only).
+    local = timezone.localtime(value)
+    if period == 'day':
+        return timezone.make_aware(datetime.combine(local.date(), time.min))
+    return local.replace(minute=0, second=0, microsecond=0)
+
+
+def backfill_sales_rollup(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    SalesRollup = apps.get_model('orders', 'SalesRollup')
+    db_alias = schema_editor.connection.alias
+
+    totals = {}
+    customers = defaultdict(set)
+    orders = Order.objects.using(db_alias).order_by('created_at').prefetch_related('items')
+    for order in orders.iterator(chunk_size=CHUNK_SIZE):
+        dishes = sum(item.quantity for item in order.items.all())
+        for period in ('day', 'hour'):
+            key = (period, bucket_start(order.created_at, period))
+            row = totals.setdefault(key, {'revenue': Decimal('0'), 'order_count': 0, 'dishes_sold': 0})
+            row['revenue'] += order.total_amount
+            row['order_count'] += 1
+            row['dishes_sold'] += dishes
+            customers[key].add(order.customer_name)
+
+    SalesRollup.objects.using(db_alias).all().delete()
+    SalesRollup.objects.using(db_alias).bulk_create(
+        [
+            SalesRollup(
+                period=period,
+                bucket=bucket,
+                date=bucket.date(),
+                customer_count=len(customers[(period, bucket)]),
+                **values,
+            )
+            for (period, bucket), values in totals.items()
+        ],
+        batch_size=CHUNK_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_dish_sales'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sales_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_dish_sales(apps, schema_editor):
+    # Frozen copy of orders.dish_sales.rebuild_dish_sales.
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    DishSales = apps.get_model('orders', 'DishSales')
+    DishDailySales = apps.get_model('orders', 'DishDailySales')
+    db_alias = schema_editor.connection.alias
+
+    items = OrderItem.objects.using(db_alias).order_by()
+    totals = dict(quantity=Sum('quantity'), revenue=Sum('price'), order_count=Count('pk'))
+    lifetime = [
+        DishSales(dish_id=row.pop('dish_id'), **row)
+        for row in items.values('dish_id').annotate(**totals).iterator()
+    ]
+    daily = [
+        DishDailySales(dish_id=row.pop('dish_id'), date=row.pop('day'), **row)
+        for row in (
+            items.annotate(day=TruncDate('order__created_at', tzinfo=timezone.get_current_timezone()))
+            .values('dish_id', 'day')
+            .annotate(**totals)
+            .iterator()
+        )
+    ]
+    DishSales.objects.using(db_alias).all().delete()
+    DishDailySales.objects.using(db_alias).all().delete()
+    DishSales.objects.using(db_alias).bulk_create(lifetime, batch_size=BATCH_SIZE)
+    DishDailySales.objects.using(db_alias).bulk_create(daily, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_backfill_sales_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_dish_sales, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from tables.models import Table
 from menu.models import Dish
 
+ACTIVE_STATUSES = ('Pending', 'In Progress')
+
 
 class Order(models.Model):
     STATUS_CHOICES = (
@@ -21,6 +23,22 @@ class Order(models.Model):
     order_type = models.CharField(max_length=10, choices=ORDER_TYPE_CHOICES, default='Dine In')
     created_at = models.DateTimeField(auto_now_add=True)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('created_at',), name='order_created_idx'),
+            models.Index(fields=('status', 'created_at'), name='order_status_created_idx'),
+            models.Index(fields=('table', 'status'), name='order_table_status_idx'),
+            models.Index(fields=('customer_name', 'created_at'), name='order_customer_created_idx'),
+            # Partial index: the live dashboard and kitchen only ever look at
+            # the handful of open orders. Skipped on backends without support.
+            models.Index(
+                fields=('status', 'created_at'),
+                name='order_active_created_idx',
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+            ),
+        ]
 
     def __str__(self):
         return f"Order {self.id} for {self.customer_name}"
@@ -31,6 +49,7 @@ class OrderItem(models.Model):
     dish = models.ForeignKey(Dish, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField()
     price = models.DecimalField(max_digits=8, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.quantity} x {self.dish.name} in Order {self.order.id}"
@@ -41,6 +60,77 @@ class Earning(models.Model):
     date = models.DateField()
     completed_at = models.DateTimeField(null=True, blank=True)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('date',), name='earning_date_idx'),
+        ]
 
     def __str__(self):
         return f"Earnings on {self.date}: {self.amount}"
+
+
+class SalesRollup(models.Model):
+    PERIOD_CHOICES = (
+        ('day', 'Day'),
+        ('hour', 'Hour'),
+    )
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    bucket = models.DateTimeField()
+    date = models.DateField()
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    order_count = models.IntegerField(default=0)
+    customer_count = models.IntegerField(default=0)
+    dishes_sold = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ('period', 'bucket')
+        constraints = [
+            models.UniqueConstraint(fields=('period', 'bucket'), name='unique_sales_rollup_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=('period', 'date'), name='sales_rollup_period_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_period_display()} {self.bucket:%Y-%m-%d %H:%M}: {self.revenue}"
+
+
+class DishSales(models.Model):
+    """Lifetime sales counters for one dish, kept current from order_changed."""
+    dish = models.OneToOneField(Dish, on_delete=models.CASCADE, related_name='sales')
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    order_count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'dish sales'
+        indexes = [
+            models.Index(fields=('quantity',), name='dish_sales_quantity_idx'),
+            models.Index(fields=('revenue',), name='dish_sales_revenue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.dish_id}: {self.quantity} sold"
+
+
+class DishDailySales(models.Model):
+    """Per-day sales counters for one dish; rolling windows sum a few of these."""
+    dish = models.ForeignKey(Dish, on_delete=models.CASCADE, related_name='daily_sales')
+    date = models.DateField()
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    order_count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'dish daily sales'
+        constraints = [
+            models.UniqueConstraint(fields=('dish', 'date'), name='unique_dish_daily_sales'),
+        ]
+        indexes = [
+            models.Index(fields=('date', 'dish'), name='dish_daily_sales_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.dish_id} on {self.date}: {self.quantity} sold"
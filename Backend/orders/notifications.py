@@ -0,0 +1,29 @@
+from django.dispatch import receiver
+
+from core.events import publish
+from .signals import order_changed
+
+
+def order_payload(snapshot):
+    return {
+        'id': snapshot.pk,
+        'status': snapshot.status,
+        'order_type': snapshot.order_type,
+        'table': snapshot.table_id,
+        'customer_name': snapshot.customer_name,
+        'total_amount': snapshot.total_amount,
+    }
+
+
+@receiver(order_changed)
+def publish_order_events(sender, before=None, after=None, **kwargs):
+    if before is None:
+        publish('order.created', **order_payload(after))
+        return
+    if after is None:
+        publish('order.deleted', id=before.pk, table=before.table_id)
+        return
+    if before.status != after.status:
+        publish('order.status_changed', previous_status=before.status, **order_payload(after))
+    if sorted(before.items) != sorted(after.items):
+        publish('order.items_changed', **order_payload(after))
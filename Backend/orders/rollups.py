@@ -0,0 +1,123 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.dates import day_bounds
+from .models import Order, SalesRollup
+from .signals import order_changed
+
+
+def bucket_bounds(value, period):
+    """Return the local (start, end) datetimes of the bucket containing ``value``."""
+    local = timezone.localtime(value)
+    if period == 'day':
+        start = timezone.make_aware(datetime.combine(local.date(), time.min))
+        return start, start + timedelta(days=1)
+    start = local.replace(minute=0, second=0, microsecond=0)
+    return start, start + timedelta(hours=1)
+
+
+def _has_other_order(start, end, customer_name, exclude_pk):
+    return Order.objects.filter(
+        created_at__gte=start,
+        created_at__lt=end,
+        customer_name=customer_name,
+    ).exclude(pk=exclude_pk).exists()
+
+
+def _bucket_deltas(before, after, period):
+    deltas = defaultdict(lambda: {'revenue': Decimal('0'), 'order_count': 0, 'dishes_sold': 0, 'customer_count': 0})
+
+    for snapshot, sign in ((before, -1), (after, 1)):
+        if snapshot is None:
+            continue
+        delta = deltas[bucket_bounds(snapshot.created_at, period)]
+        delta['revenue'] += sign * snapshot.total_amount
+        delta['order_count'] += sign
+        delta['dishes_sold'] += sign * snapshot.dishes_sold
+
+    for (start, end), delta in deltas.items():
+        old_name = before.customer_name if before and bucket_bounds(before.created_at, period)[0] == start else None
+        new_name = after.customer_name if after and bucket_bounds(after.created_at, period)[0] == start else None
+        if old_name == new_name:
+            continue
+        pk = (after or before).pk
+        if old_name is not None and not _has_other_order(start, end, old_name, pk):
+            delta['customer_count'] -= 1
+        if new_name is not None and not _has_other_order(start, end, new_name, pk):
+            delta['customer_count'] += 1
+
+    return deltas
+
+
+def apply_order_change(before, after):
+    """Fold the difference between two order snapshots into the rollup rows."""
+    with transaction.atomic():
+        for period, _ in SalesRollup.PERIOD_CHOICES:
+            for (start, _end), delta in _bucket_deltas(before, after, period).items():
+                if not any(delta.values()):
+                    continue
+                row, _ = SalesRollup.objects.get_or_create(
+                    period=period,
+                    bucket=start,
+                    defaults={'date': start.date()},
+                )
+                SalesRollup.objects.filter(pk=row.pk).update(
+                    revenue=F('revenue') + delta['revenue'],
+                    order_count=F('order_count') + delta['order_count'],
+                    customer_count=F('customer_count') + delta['customer_count'],
+                    dishes_sold=F('dishes_sold') + delta['dishes_sold'],
+                )
+
+
+@receiver(order_changed)
+def update_sales_rollup(sender, before=None, after=None, **kwargs):
+    apply_order_change(before, after)
+
+
+def rebuild_rollups(since=None):
+    """
+    Recompute rollup rows from the order history, repairing drift from
+    writes that bypass order_changed (raw or bulk updates). Returns the
+    number of rows written. When ``since`` (a date) is given only buckets
+    from that day onwards are replaced.
+    """
+    orders = Order.objects.order_by('created_at').prefetch_related('items')
+    if since is not None:
+        orders = orders.filter(created_at__gte=day_bounds(since)[0])
+
+    totals = {}
+    customers = defaultdict(set)
+    for order in orders.iterator(chunk_size=2000):
+        dishes = sum(item.quantity for item in order.items.all())
+        for period, _ in SalesRollup.PERIOD_CHOICES:
+            key = (period, bucket_bounds(order.created_at, period)[0])
+            row = totals.setdefault(key, {'revenue': Decimal('0'), 'order_count': 0, 'dishes_sold': 0})
+            row['revenue'] += order.total_amount
+            row['order_count'] += 1
+            row['dishes_sold'] += dishes
+            customers[key].add(order.customer_name)
+
+    rows = [
+        SalesRollup(
+            period=period,
+            bucket=bucket,
+            date=bucket.date(),
+            customer_count=len(customers[(period, bucket)]),
+            **values,
+        )
+        for (period, bucket), values in totals.items()
+    ]
+
+    with transaction.atomic():
+        stale = SalesRollup.objects.all()
+        if since is not None:
+            stale = stale.filter(date__gte=since)
+        stale.delete()
+        SalesRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
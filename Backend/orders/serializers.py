@@ -1,37 +1,81 @@
+from collections import defaultdict
+
 from rest_framework import serializers
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from django.utils import timezone
+from core.serializers import EagerLoadingMixin, TimedSerializerMixin
+from core.sync import collect_tombstones
+from menu.cache import pricing_dishes
+from menu.models import Dish
 from .models import Order, OrderItem, Earning
-
-
-class OrderItemSerializer(serializers.ModelSerializer):
+from .signals import order_changed
+from .snapshots import snapshot_order
+
+
+class DishField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves dishes from the batch the parent OrderSerializer loaded up
+    front (see menu.cache.pricing_dishes), falling back to a per-row lookup when used on its own or
+    for a dish the snapshot doesn't know yet.
+    """
+
+    def to_internal_value(self, data):
+        dishes = getattr(self.root, 'dish_cache', None)
+        if dishes is not None:
+            try:
+                dish = dishes.get(int(data))
+            except (TypeError, ValueError):
+                dish = None
+            if dish is not None:
+                return dish
+        return super().to_internal_value(data)
+
+
+class OrderItemSerializer(TimedSerializerMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    dish = DishField(queryset=Dish.objects.all())
     dish_name = serializers.ReadOnlyField(source='dish.name')
 
     class Meta:
         model = OrderItem
         fields = ('id', 'dish', 'dish_name', 'quantity', 'price')
         read_only_fields = ('price',)
+        select_related_fields = ('dish',)
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(TimedSerializerMixin, EagerLoadingMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True)
 
     class Meta:
         model = Order
         fields = ('id', 'table', 'customer_name', 'status', 'order_type', 'created_at', 'total_amount', 'items')
 
-    def create(self, validated_data):
-        items_data = validated_data.pop('items')
-        order = Order.objects.create(**validated_data)
+    def to_internal_value(self, data):
+        # Load every dish referenced by the payload in one batch.
+        items = data.get('items') if hasattr(data, 'get') else None
+        dish_ids = set()
+        if isinstance(items, list):
+            for item in items:
+                try:
+                    dish_ids.add(int(item.get('dish')))
+                except (AttributeError, TypeError, ValueError):
+                    continue
+        self.dish_cache = pricing_dishes(dish_ids) if dish_ids else {}
+        return super().to_internal_value(data)
+
+    def price_items(self, items_data):
+        """Return (dish, quantity, line_price) tuples and the order total."""
+        lines = []
         total_amount = 0
         for item_data in items_data:
             dish = item_data['dish']
             quantity = item_data['quantity']
             price = dish.price * quantity
             total_amount += price
-            OrderItem.objects.create(order=order, **item_data, price=price)
-        order.total_amount = total_amount
-        order.save()
+            lines.append((dish, quantity, price))
+        return lines, total_amount
 
+    def sync_earning(self, order, previous_status=None):
         if order.status == 'Completed':
             Earning.objects.update_or_create(
                 order=order,
@@ -41,49 +85,104 @@ class OrderSerializer(serializers.ModelSerializer):
                     'amount': order.total_amount,
                 }
             )
+        elif previous_status == 'Completed':
+            Earning.objects.filter(order=order).delete()
+
+    def create(self, validated_data):
+        items_data = validated_data.pop('items')
+        lines, total_amount = self.price_items(items_data)
+        validated_data['total_amount'] = total_amount
+
+        with transaction.atomic():
+            order = Order.objects.create(**validated_data)
+            items = OrderItem.objects.bulk_create([
+                OrderItem(order=order, dish=dish, quantity=quantity, price=price)
+                for dish, quantity, price in lines
+            ])
+            self.sync_earning(order)
+            order_changed.send(sender=Order, before=None, after=snapshot_order(order, items=items))
+
+        self.reload_items(order)
         return order
 
     def update(self, instance, validated_data):
         previous_status = instance.status
         items_data = validated_data.pop('items', None)
 
-        # Update order fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
+        with transaction.atomic():
+            existing = list(instance.items.all())
+            before = snapshot_order(instance, items=existing)
 
-        total_amount = instance.total_amount
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
 
-        if items_data is not None:
-            # Replace items completely
-            instance.items.all().delete()
-            total_amount = 0
-            for item_data in items_data:
-                dish = item_data['dish']
-                quantity = item_data['quantity']
-                price = dish.price * quantity
-                total_amount += price
-                OrderItem.objects.create(order=instance, **item_data, price=price)
+            items = existing
+            if items_data is not None:
+                lines, instance.total_amount = self.price_items(items_data)
+                items = self.apply_item_diff(instance, existing, lines)
 
-        instance.total_amount = total_amount
-        instance.save()
-
-        new_status = instance.status
-        if new_status == 'Completed':
-            Earning.objects.update_or_create(
-                order=instance,
-                defaults={
-                    'date': timezone.localdate(),
-                    'completed_at': timezone.now(),
-                    'amount': instance.total_amount,
-                }
-            )
-        elif previous_status == 'Completed' and new_status != 'Completed':
-            Earning.objects.filter(order=instance).delete()
+            instance.save()
+            self.sync_earning(instance, previous_status)
+            order_changed.send(sender=Order, before=before, after=snapshot_order(instance, items=items))
 
+        self.reload_items(instance)
         return instance
 
-
-class EarningSerializer(serializers.ModelSerializer):
+    def reload_items(self, order):
+        # One query for the response's items and dishes instead of one per line.
+        getattr(order, '_prefetched_objects_cache', {}).pop('items', None)
+        prefetch_related_objects([order], Prefetch('items', queryset=OrderItem.objects.select_related('dish')))
+
+    def apply_item_diff(self, order, existing, lines):
+        """
+        Bring the order's items in line with ``lines`` touching only what
+        changed: identical lines are kept, lines for the same dish are
+        updated in place, and the rest are bulk inserted or deleted.
+        Returns the resulting items.
+        """
+        unmatched = defaultdict(list)
+        for item in existing:
+            unmatched[(item.dish_id, item.quantity, item.price)].append(item)
+
+        kept = []
+        pending = []
+        for dish, quantity, price in lines:
+            candidates = unmatched.get((dish.pk, quantity, price))
+            if candidates:
+                kept.append(candidates.pop())
+            else:
+                pending.append((dish, quantity, price))
+
+        leftovers = defaultdict(list)
+        for candidates in unmatched.values():
+            for item in candidates:
+                leftovers[item.dish_id].append(item)
+
+        changed = []
+        created = []
+        for dish, quantity, price in pending:
+            if leftovers[dish.pk]:
+                item = leftovers[dish.pk].pop()
+                item.quantity = quantity
+                item.price = price
+                item.updated_at = timezone.now()
+                changed.append(item)
+            else:
+                created.append(OrderItem(order=order, dish=dish, quantity=quantity, price=price))
+
+        removed = [item.pk for candidates in leftovers.values() for item in candidates]
+        if removed:
+            with collect_tombstones():
+                OrderItem.objects.filter(pk__in=removed).delete()
+        if changed:
+            OrderItem.objects.bulk_update(changed, ['quantity', 'price', 'updated_at'])
+        if created:
+            created = OrderItem.objects.bulk_create(created)
+
+        return kept + changed + created
+
+
+class EarningSerializer(TimedSerializerMixin, EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = Earning
         fields = '__all__'
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent whenever an order (or its items) is created, edited or removed.
+# Receivers get ``before`` and ``after`` OrderSnapshot values; ``before`` is
+# None for new orders and ``after`` is None for deleted ones.
+order_changed = Signal()
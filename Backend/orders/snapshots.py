@@ -0,0 +1,43 @@
+from decimal import Decimal
+from typing import NamedTuple, Optional, Tuple
+
+
+class ItemSnapshot(NamedTuple):
+    dish_id: int
+    quantity: int
+    price: Decimal
+
+
+class OrderSnapshot(NamedTuple):
+    pk: int
+    created_at: object
+    customer_name: str
+    status: str
+    order_type: str
+    table_id: Optional[int]
+    total_amount: Decimal
+    items: Tuple[ItemSnapshot, ...]
+
+    @property
+    def dishes_sold(self):
+        return sum(item.quantity for item in self.items)
+
+
+def snapshot_order(order, items=None):
+    """
+    Capture the fields of an order that derived data (rollups, counters)
+    depends on. ``items`` defaults to ``order.items.all()``; pass the rows
+    explicitly when a prefetch cache may be stale.
+    """
+    if items is None:
+        items = order.items.all()
+    return OrderSnapshot(
+        pk=order.pk,
+        created_at=order.created_at,
+        customer_name=order.customer_name,
+        status=order.status,
+        order_type=order.order_type,
+        table_id=order.table_id,
+        total_amount=Decimal(order.total_amount or 0),
+        items=tuple(ItemSnapshot(item.dish_id, item.quantity, item.price) for item in items),
+    )
@@ -1,3 +1,533 @@
-from django.test import TestCase
+import csv
+import importlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.models import Tombstone
+from menu.models import Category, Dish
+from userauth.models import User
+from .dashboard import dashboard_summary
+from .dish_sales import top_dishes
+from .kitchen import apply_change, get_queue, invalidate_queue
+from .models import DishDailySales, DishSales, Earning, Order, SalesRollup
+from .serializers import OrderSerializer
+from .snapshots import snapshot_order
+
+backfill_rollup = importlib.import_module('orders.migrations.0011_backfill_sales_rollup')
+backfill_dish_sales = importlib.import_module('orders.migrations.0012_backfill_dish_sales')
+
+
+class OrderFixturesMixin:
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Mains')
+        cls.dish = Dish.objects.create(name='Paneer Tikka', description='', price=Decimal('250.00'), category=category)
+        cls.other_dish = Dish.objects.create(name='Dal Makhani', description='', price=Decimal('180.00'), category=category)
+
+    def create_order(self, customer_name, quantity=1, status='Pending'):
+        serializer = OrderSerializer(data={
+            'customer_name': customer_name,
+            'status': status,
+            'items': [
+                {'dish': self.dish.pk, 'quantity': quantity},
+                {'dish': self.other_dish.pk, 'quantity': 1},
+            ],
+        })
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+
+class DashboardSummaryTests(OrderFixturesMixin, TestCase):
+    def test_summary_uses_two_queries(self):
+        for index in range(10):
+            self.create_order(f'Guest {index % 3}', status='In Progress' if index % 2 else 'Pending')
+
+        with self.assertNumQueries(2):
+            summary = dashboard_summary()
+
+        kpis = summary['today']
+        self.assertEqual(kpis['revenue'], Decimal('4300.00'))
+        self.assertEqual(kpis['event_count'], 10)
+        self.assertEqual(kpis['total_customer'], 3)
+        self.assertEqual(kpis['total_dishes'], 20)
+        self.assertEqual(kpis['in_progress'], 5)
+        self.assertEqual(kpis['active_orders'], 10)
+        self.assertEqual(summary['sales_details'][-1]['created_at__date'], timezone.localdate())
+
+    def test_summary_without_orders(self):
+        with self.assertNumQueries(2):
+            kpis = dashboard_summary()['today']
+        self.assertEqual(kpis['revenue'], 0)
+        self.assertEqual(kpis['active_orders'], 0)
+
+
+class OrderQueryCountTests(OrderFixturesMixin, APITestCase):
+    def assertConstantQueries(self, url, num):
+        self.create_order('First guest')
+        with self.assertNumQueries(num):
+            self.client.get(url)
+
+        for index in range(8):
+            self.create_order(f'Guest {index}')
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_order_list(self):
+        # ETag version + dependency versions, orders, items joined with their dishes
+        response = self.assertConstantQueries('/api/orders/', 4)
+        self.assertEqual(response.data['results'][0]['items'][0]['dish_name'], 'Paneer Tikka')
+
+    def test_order_item_list(self):
+        self.assertConstantQueries('/api/order-items/', 3)
+
+    def test_performance(self):
+        # rollup series, live counters, recent orders + their items, popular dishes
+        self.assertConstantQueries('/api/earnings/performance/', 5)
+
+
+class OrderFilterTests(APITestCase):
+    def setUp(self):
+        self.day = timezone.localdate() - timedelta(days=3)
+        midnight = timezone.make_aware(datetime.combine(self.day, datetime.min.time()))
+        for hour, status, order_type in ((0, 'Pending', 'Dine In'), (23, 'Completed', 'Takeaway'), (24, 'Pending', 'Takeaway')):
+            order = Order.objects.create(customer_name=f'Guest {hour}', status=status, order_type=order_type)
+            Order.objects.filter(pk=order.pk).update(created_at=midnight + timedelta(hours=hour, minutes=30))
+
+    def names(self, **params):
+        response = self.client.get('/api/orders/', params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(order['customer_name'] for order in response.data['results'])
+
+    def test_date_bounds_are_inclusive_local_days(self):
+        day = self.day.isoformat()
+        self.assertEqual(self.names(created_after=day, created_before=day), ['Guest 0', 'Guest 23'])
+        self.assertEqual(self.names(created_after=(self.day + timedelta(days=1)).isoformat()), ['Guest 24'])
+        moment = timezone.make_aware(datetime.combine(self.day, datetime.min.time()) + timedelta(hours=12)).isoformat()
+        self.assertEqual(self.names(created_before=moment), ['Guest 0'])
+
+    def test_status_and_type_filters(self):
+        self.assertEqual(self.names(status='Pending,Completed', order_type='Takeaway'), ['Guest 23', 'Guest 24'])
+        self.assertEqual(self.names(status='Pending'), ['Guest 0', 'Guest 24'])
+
+    def test_bad_input_is_rejected(self):
+        for params in (
+            {'created_before': 'last tuesday'},
+            {'created_after': '2026-02-30'},
+            {'status': 'Lost'},
+            {'order_type': 'Delivery'},
+            {'table': 'T1'},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/orders/', params).status_code, 400)
+
+    def test_cursor_pages_newest_first(self):
+        seen = []
+        url = '/api/orders/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            seen += [order['customer_name'] for order in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, ['Guest 24', 'Guest 23', 'Guest 0'])
+
+
+class OrderConditionalGetTests(OrderFixturesMixin, APITestCase):
+    def test_deleting_a_dependency_changes_the_etag(self):
+        order = self.create_order('Guest')
+        etag = self.client.get('/api/orders/')['ETag']
+        self.assertEqual(self.client.get('/api/orders/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Not the newest item, so only its tombstone can move the validators.
+        item = order.items.order_by('updated_at', 'pk').first()
+        self.assertEqual(self.client.delete(f'/api/order-items/{item.pk}/').status_code, 204)
+        response = self.client.get('/api/orders/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results'][0]['items']), 1)
+
+
+class OrderWriteTests(OrderFixturesMixin, APITestCase):
+    def payload(self, lines, **extra):
+        return {
+            'customer_name': 'Banquet',
+            'items': [{'dish': dish.pk, 'quantity': quantity} for dish, quantity in lines],
+            **extra,
+        }
+
+    def count_create_queries(self, lines):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/orders/', self.payload(lines), format='json')
+        self.assertEqual(response.status_code, 201)
+        return len(queries)
+
+    def test_create_query_count_independent_of_item_count(self):
+        self.count_create_queries([(self.dish, 1)])  # creates today's rollup rows
+        small = self.count_create_queries([(self.dish, 1), (self.other_dish, 2)])
+        large = self.count_create_queries([(self.dish, 1), (self.other_dish, 2)] * 10)
+        self.assertEqual(small, large)
+
+    def test_create_totals(self):
+        response = self.client.post('/api/orders/', self.payload([(self.dish, 2), (self.other_dish, 1)], total_amount='1.00'), format='json')
+        self.assertEqual(Decimal(response.data['total_amount']), Decimal('680.00'))
+        self.assertEqual([item['price'] for item in response.data['items']], ['500.00', '180.00'])
+
+    def test_update_diffs_items(self):
+        response = self.client.post('/api/orders/', self.payload([(self.dish, 2), (self.other_dish, 1)]), format='json')
+        order = Order.objects.get(pk=response.data['id'])
+        kept, changed = sorted(order.items.all(), key=lambda item: item.dish_id)
+
+        response = self.client.patch(
+            f'/api/orders/{order.pk}/',
+            {'items': [{'dish': self.dish.pk, 'quantity': 2}, {'dish': self.other_dish.pk, 'quantity': 3}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        items = {item.dish_id: item for item in order.items.all()}
+        self.assertEqual(items[self.dish.pk].pk, kept.pk)
+        self.assertEqual(items[self.other_dish.pk].pk, changed.pk)
+        self.assertEqual(items[self.other_dish.pk].quantity, 3)
+        order.refresh_from_db()
+        self.assertEqual(order.total_amount, Decimal('1040.00'))
+
+        self.client.patch(f'/api/orders/{order.pk}/', {'items': [{'dish': self.other_dish.pk, 'quantity': 1}]}, format='json')
+        self.assertEqual(list(order.items.values_list('dish_id', 'quantity')), [(self.other_dish.pk, 1)])
+
+    def test_update_total_without_items_is_kept(self):
+        order_id = self.client.post('/api/orders/', self.payload([(self.dish, 2)]), format='json').data['id']
+        url = f'/api/orders/{order_id}/'
+
+        response = self.client.patch(url, {'total_amount': '450.00'}, format='json')
+        self.assertEqual(response.data['total_amount'], '450.00')
+        self.assertEqual(Order.objects.get(pk=order_id).total_amount, Decimal('450.00'))
+
+        # New items always re-price the order.
+        response = self.client.patch(url, {'total_amount': '1.00', 'items': [{'dish': self.dish.pk, 'quantity': 1}]}, format='json')
+        self.assertEqual(response.data['total_amount'], '250.00')
+        self.assertEqual([item['quantity'] for item in response.data['items']], [1])
+
+    def tombstone_inserts(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 300)
+        return [query for query in queries if query['sql'].startswith('INSERT INTO "core_tombstone"')]
+
+    def test_deletes_write_tombstones_in_one_insert(self):
+        # Runs under the strict query detector, which rejects one INSERT per deleted row.
+        dishes = [
+            Dish.objects.create(name=f'Thali {index}', description='', price=100, category=self.dish.category)
+            for index in range(8)
+        ]
+        order = Order.objects.get(pk=self.client.post('/api/orders/', self.payload([(dish, 1) for dish in dishes]), format='json').data['id'])
+
+        trimmed = self.tombstone_inserts('patch', f'/api/orders/{order.pk}/', {'items': [{'dish': dishes[0].pk, 'quantity': 1}]})
+        self.assertEqual(len(trimmed), 1)
+        self.assertEqual(Tombstone.objects.filter(model='orders.orderitem').count(), 7)
+
+        deleted = self.tombstone_inserts('delete', f'/api/orders/{order.pk}/')
+        self.assertEqual(len(deleted), 1)
+        self.assertEqual(Tombstone.objects.filter(model='orders.order').count(), 1)
+        self.assertEqual(Tombstone.objects.filter(model='orders.orderitem').count(), 8)
+
+
+class BackfillEarningsTests(OrderFixturesMixin, TestCase):
+    def backfill(self, *args):
+        out = io.StringIO()
+        call_command('backfill_earnings', *args, stdout=out)
+        return out.getvalue()
+
+    def test_backfill_in_chunks(self):
+        orders = [self.create_order(f'Guest {index}', status='Completed') for index in range(5)]
+        self.create_order('Walk-in')
+        Earning.objects.filter(order__in=orders[:3]).delete()
+        Earning.objects.filter(order=orders[3]).update(amount=Decimal('1.00'))
+
+        output = self.backfill('--dry-run', '--chunk-size', '2')
+        self.assertIn('Would create 3', output)
+        self.assertEqual(Earning.objects.count(), 2)
+
+        # One read, one lookup and at most one insert + update per chunk of two.
+        with self.assertNumQueries(14):
+            output = self.backfill('--chunk-size', '2')
+        self.assertIn('Created 3', output)
+        self.assertIn('up to id %d' % orders[-1].pk, output)
+        self.assertEqual(Earning.objects.count(), 5)
+        self.assertFalse(Earning.objects.filter(amount=Decimal('1.00')).exists())
+        self.assertEqual(Earning.objects.get(order=orders[0]).amount, orders[0].total_amount)
+
+    def test_since_id_resumes_after_checkpoint(self):
+        orders = [self.create_order(f'Guest {index}', status='Completed') for index in range(3)]
+        Earning.objects.all().delete()
+
+        self.backfill('--since-id', str(orders[0].pk))
+        self.assertEqual(
+            set(Earning.objects.values_list('order_id', flat=True)),
+            {orders[1].pk, orders[2].pk},
+        )
+
+
+class ExplainOrderQueriesTests(TransactionTestCase):
+    def test_compare_restores_indexes(self):
+        out = io.StringIO()
+        call_command('explain_order_queries', '--compare', stdout=out)
+        self.assertIn('Without hot-path indexes', out.getvalue())
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Order._meta.db_table)
+        self.assertIn('order_created_idx', constraints)
+
+
+class KitchenQueueTests(OrderFixturesMixin, APITestCase):
+    def setUp(self):
+        invalidate_queue()
+
+    def create(self, customer_name, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/orders/', {
+                'customer_name': customer_name,
+                'items': [{'dish': self.dish.pk, 'quantity': 2}],
+                **extra,
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_open_tickets_takeaway_first(self):
+        dine_in = self.create('Early bird')
+        takeaway = self.create('Pickup', order_type='Takeaway')
+        self.create('Done', status='Completed')
+
+        response = self.client.get('/api/kitchen/')
+        self.assertEqual([ticket['id'] for ticket in response.data['tickets']], [takeaway, dine_in])
+        self.assertEqual(response.data['tickets'][0]['items'][0]['dish_name'], 'Paneer Tikka')
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/kitchen/')
+
+    def test_changes_are_applied_in_memory(self):
+        order_id = self.create('Guest')
+        version = self.client.get('/api/kitchen/').data['version']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/orders/{order_id}/', {'status': 'Completed'}, format='json')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/kitchen/')
+        self.assertNotEqual(response.data['version'], version)
+        self.assertEqual(response.data['tickets'], [])
+
+    def test_long_poll_wakes_on_change(self):
+        order = Order.objects.create(customer_name='Late', status='Pending')
+        version = get_queue().version
+        changed = snapshot_order(order, items=[])
+        timer = threading.Timer(0.2, apply_change, args=(None, changed))
+        timer.start()
+
+        started = time.monotonic()
+        response = self.client.get('/api/kitchen/', {'version': version, 'wait': 5})
+        timer.join()
+        self.assertLess(time.monotonic() - started, 4)
+        self.assertEqual([ticket['id'] for ticket in response.data['tickets']], [order.pk])
+
+    def test_long_poll_times_out_unchanged(self):
+        version = get_queue().version
+        response = self.client.get('/api/kitchen/', {'version': version, 'wait': 0.2})
+        self.assertEqual(response.data['version'], version)
+
+
+class ExportTests(OrderFixturesMixin, APITestCase):
+    def setUp(self):
+        self.recent = self.create_order('Recent', status='Completed')
+        self.old = self.create_order('Old', status='Completed')
+        Order.objects.filter(pk=self.old.pk).update(created_at=timezone.now() - timedelta(days=400))
+        call_command('backfill_earnings', stdout=io.StringIO())
+        admin = User.objects.create_user(
+            username='boss', email='boss@example.com', password='x', first_name='A', last_name='B', is_staff=True,
+        )
+        self.client.force_authenticate(admin)
+
+    def test_orders_csv_streams_one_line_per_item(self):
+        response = self.client.get('/api/exports/orders.csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['customer_name'] for row in rows], ['Recent', 'Recent', 'Old', 'Old'])
+        self.assertEqual(rows[0]['dish_name'], 'Paneer Tikka')
+
+    def test_earnings_ndjson_date_range(self):
+        start = (timezone.localdate() - timedelta(days=30)).isoformat()
+        response = self.client.get('/api/exports/earnings.ndjson', {'start': start})
+        records = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([record['order_id'] for record in records], [self.recent.pk])
+        self.assertEqual(records[0]['amount'], '430.00')
+
+    def test_rejects_bad_requests(self):
+        self.assertEqual(self.client.get('/api/exports/orders.xlsx').status_code, 404)
+        self.assertEqual(self.client.get('/api/exports/orders.csv', {'start': 'soon'}).status_code, 400)
+        for export in ('orders.csv', 'earnings.ndjson'):
+            response = self.client.get(f'/api/exports/{export}', {'start': '2026-02-30'})
+            self.assertEqual(response.status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/exports/orders.csv').status_code, 401)
+
+    def test_command_reads_in_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'orders.ndjson')
+            # One cursor over the orders, plus an items query per chunk.
+            with self.assertNumQueries(3):
+                call_command('export_data', 'orders', '--format', 'ndjson', '--chunk-size', '1', '-o', path, stderr=io.StringIO())
+            with open(path, encoding='utf-8') as output:
+                orders = [json.loads(line) for line in output]
+        self.assertEqual([len(order['items']) for order in orders], [2, 2])
+
+
+class SalesRollupTests(OrderFixturesMixin, APITestCase):
+    def rollups(self):
+        # Buckets emptied by edits keep a zero row; a rebuild doesn't recreate them.
+        return sorted(
+            SalesRollup.objects.exclude(order_count=0)
+            .values_list('period', 'bucket', 'revenue', 'order_count', 'customer_count', 'dishes_sold')
+        )
+
+    def assertMatchesRebuild(self):
+        maintained = self.rollups()
+        call_command('rebuild_sales_rollup', stdout=io.StringIO())
+        self.assertEqual(self.rollups(), maintained)
+        return maintained
+
+    def today(self):
+        return SalesRollup.objects.get(period='day', date=timezone.localdate())
+
+    def test_counters_follow_order_writes(self):
+        first = self.create_order('Asha', quantity=2)
+        self.create_order('Asha')
+        day = self.today()
+        self.assertEqual((day.revenue, day.order_count, day.customer_count, day.dishes_sold), (Decimal('1110.00'), 2, 1, 5))
+        self.assertMatchesRebuild()
+
+        self.client.patch(f'/api/orders/{first.pk}/', {'items': [{'dish': self.dish.pk, 'quantity': 1}]}, format='json')
+        self.assertEqual(self.today().dishes_sold, 3)
+        self.assertMatchesRebuild()
+
+        # Renaming the customer makes them a second customer of the day.
+        self.client.patch(f'/api/orders/{first.pk}/', {'customer_name': 'Ravi'}, format='json')
+        self.assertEqual(self.today().customer_count, 2)
+        self.assertMatchesRebuild()
+
+        self.client.delete(f'/api/orders/{first.pk}/')
+        day = self.today()
+        self.assertEqual((day.revenue, day.order_count, day.customer_count, day.dishes_sold), (Decimal('430.00'), 1, 1, 2))
+        self.assertMatchesRebuild()
+
+    def test_backfill_migration(self):
+        self.create_order('Asha', quantity=2)
+        Order.objects.create(customer_name='Ravi', total_amount=Decimal('80.00'))  # skips order_changed
+        call_command('rebuild_sales_rollup', stdout=io.StringIO())
+        rebuilt = self.rollups()
+        SalesRollup.objects.all().delete()
+
+        backfill_rollup.backfill_sales_rollup(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(self.rollups(), rebuilt)
+
+    def test_item_endpoint_and_admin_send_order_changed(self):
+        order = self.create_order('Asha', quantity=2)
+        kept, removed = sorted(order.items.all(), key=lambda item: item.dish_id != self.dish.pk)
+        self.client.patch(f'/api/order-items/{kept.pk}/', {'quantity': 5}, format='json')
+        self.client.delete(f'/api/order-items/{removed.pk}/')
+        self.assertEqual(self.today().dishes_sold, 5)
+        self.assertEqual(DishSales.objects.get(dish=self.other_dish).quantity, 0)
+        self.assertMatchesRebuild()
+
+        self.client.force_login(User.objects.create_superuser(
+            username='owner', email='owner@example.com', password='x', first_name='A', last_name='B',
+        ))
+        response = self.client.post(f'/admin/orders/order/{order.pk}/change/', {
+            'customer_name': 'Ravi',
+            'status': 'Pending',
+            'order_type': 'Dine In',
+            'total_amount': '500.00',
+            'items-TOTAL_FORMS': '1',
+            'items-INITIAL_FORMS': '1',
+            'items-0-id': kept.pk,
+            'items-0-order': order.pk,
+            'items-0-dish': self.dish.pk,
+            'items-0-quantity': '3',
+            'items-0-price': '750.00',
+        })
+        self.assertEqual(response.status_code, 302)
+        day = self.today()
+        self.assertEqual((day.revenue, day.dishes_sold), (Decimal('500.00'), 3))
+        self.assertEqual(DishSales.objects.get(dish=self.dish).quantity, 3)
+        self.assertMatchesRebuild()
+
+
+class DishSalesTests(OrderFixturesMixin, APITestCase):
+    def counters(self):
+        return (
+            sorted(DishSales.objects.values_list('dish_id', 'quantity', 'revenue', 'order_count')),
+            sorted(DishDailySales.objects.values_list('dish_id', 'date', 'quantity', 'revenue', 'order_count')),
+        )
+
+    def test_counters_follow_writes_and_match_rebuild(self):
+        first = self.create_order('Asha', quantity=3)
+        second = self.create_order('Ravi')
+        self.client.patch(f'/api/orders/{first.pk}/', {'items': [{'dish': self.other_dish.pk, 'quantity': 4}]}, format='json')
+        self.client.delete(f'/api/orders/{second.pk}/')
+
+        self.assertEqual(DishSales.objects.get(dish=self.other_dish).quantity, 4)
+        self.assertEqual(DishSales.objects.get(dish=self.dish).quantity, 0)
+        # Zeroed rows are kept by the counters but not recreated by a rebuild.
+        DishSales.objects.filter(quantity=0).delete()
+        DishDailySales.objects.filter(quantity=0).delete()
+        maintained = self.counters()
+        call_command('rebuild_dish_sales', stdout=io.StringIO())
+        self.assertEqual(self.counters(), maintained)
+
+    def test_backfill_migration(self):
+        self.create_order('Asha', quantity=3)
+        call_command('rebuild_dish_sales', stdout=io.StringIO())
+        rebuilt = self.counters()
+        DishSales.objects.all().delete()
+        DishDailySales.objects.all().delete()
+
+        backfill_dish_sales.backfill_dish_sales(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(self.counters(), rebuilt)
+        self.assertEqual(DishSales.objects.get(dish=self.dish).quantity, 3)
+
+    def test_windows_and_ranking(self):
+        self.create_order('Asha', quantity=3)
+        DishDailySales.objects.create(
+            dish=self.other_dish, date=timezone.localdate() - timedelta(days=10), quantity=50, revenue=Decimal('9000.00'),
+        )
+        DishSales.objects.filter(dish=self.other_dish).update(quantity=51, revenue=Decimal('9180.00'))
+
+        self.assertEqual([row['dish_name'] for row in top_dishes('7d')], ['Paneer Tikka', 'Dal Makhani'])
+        self.assertEqual([row['dish_name'] for row in top_dishes('30d')], ['Dal Makhani', 'Paneer Tikka'])
+        self.assertEqual(top_dishes('all', by='revenue', limit=1)[0]['revenue'], Decimal('9180.00'))
+
+        response = self.client.get('/api/earnings/popular-dishes/', {'window': 'today', 'by': 'revenue'})
+        self.assertEqual(response.data[0]['dish_name'], 'Paneer Tikka')
+        self.assertEqual(response.data[0]['revenue'], Decimal('750.00'))
+        self.assertEqual(self.client.get('/api/earnings/popular-dishes/', {'window': 'year'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/earnings/popular-dishes/', {'limit': '0'}).status_code, 400)
+
+    def test_performance_popular_dishes(self):
+        self.create_order('Asha')
+        self.create_order('Ravi', quantity=2)
+        response = self.client.get('/api/earnings/performance/')
+        self.assertEqual(response.data['popular_dishes'], [
+            {'dish__name': 'Dal Makhani', 'count': 2},
+            {'dish__name': 'Paneer Tikka', 'count': 2},
+        ])
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import OrderViewSet, OrderItemViewSet, EarningViewSet
+from .views import OrderViewSet, OrderItemViewSet, EarningViewSet, KitchenQueueView, ExportView
 
 router = DefaultRouter()
 router.register(r'orders', OrderViewSet)
@@ -9,4 +9,6 @@ router.register(r'earnings', EarningViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('exports/<str:dataset>.<str:export_format>', ExportView.as_view(), name='export'),
+    path('kitchen/', KitchenQueueView.as_view(), name='kitchen-queue'),
 ]
@@ -1,64 +1,190 @@
-from django.db.models import Sum, Count
-from django.utils import timezone
-from rest_framework import viewsets
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.mixins import ConditionalGetMixin, EagerLoadingViewSetMixin
+from core.sync import collect_tombstones
+from tables.booking import occupy_table
+from tables.notifications import publish_table_status
+from .dashboard import dashboard_summary
+from .dish_sales import RANKINGS, WINDOWS, top_dishes
+from .exports import EXPORTS, FORMATS
+from .filters import OrderFilterBackend
+from .kitchen import get_queue, wait_for_change
 from .models import Order, OrderItem, Earning
+from .pagination import OrderCursorPagination
 from .serializers import OrderSerializer, OrderItemSerializer, EarningSerializer
+from .signals import order_changed
+from .snapshots import snapshot_order
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ConditionalGetMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    conditional_dependencies = ('orders.OrderItem', 'menu.Dish')
+    pagination_class = OrderCursorPagination
+    filter_backends = [OrderFilterBackend]
 
     def perform_create(self, serializer):
-        order = serializer.save()
-        if order.table:
-            order.table.status = 'Occupied'
-            order.table.save()
+        table = serializer.validated_data.get('table')
+        with transaction.atomic():
+            # Claim the table first so a conflict (409) leaves no order behind.
+            if table is not None:
+                occupy_table(table, serializer.validated_data['customer_name'])
+            serializer.save()
+        if table is not None:
+            publish_table_status(table)
 
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        serializer = self.get_serializer(self.get_object(), data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        # Unlike UpdateModelMixin, keep the items the serializer reloaded on
+        # the instance; dropping its prefetch cache costs a query per item.
+        return Response(serializer.data)
 
-class OrderItemViewSet(viewsets.ModelViewSet):
+    def perform_destroy(self, instance):
+        with collect_tombstones():
+            before = snapshot_order(instance)
+            instance.delete()
+            order_changed.send(sender=Order, before=before, after=None)
+
+
+class OrderItemViewSet(ConditionalGetMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
+    conditional_dependencies = ('menu.Dish',)
+
+    def change_order(self, order, write):
+        # Item edits change the order, so derived data must hear about them too.
+        with transaction.atomic():
+            before = snapshot_order(order)
+            write()
+            order_changed.send(sender=Order, before=before, after=snapshot_order(order, items=order.items.all()))
+
+    def perform_update(self, serializer):
+        self.change_order(serializer.instance.order, serializer.save)
+
+    def perform_destroy(self, instance):
+        self.change_order(instance.order, instance.delete)
 
 
-class EarningViewSet(viewsets.ReadOnlyModelViewSet):
+class EarningViewSet(ConditionalGetMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Earning.objects.all()
     serializer_class = EarningSerializer
 
     @action(detail=False, methods=['get'], url_path='performance')
     def performance(self, request):
-        today = timezone.now().date()
+        summary = dashboard_summary()
+        kpis = summary['today']
 
-        revenue = Order.objects.filter(created_at__date=today).aggregate(total=Sum('total_amount'))['total'] or 0
-        total_customers = Order.objects.filter(created_at__date=today).values('customer_name').distinct().count()
-        event_count = Order.objects.filter(created_at__date=today).count()
-        sales_details = Order.objects.filter(created_at__date__gte=today - timezone.timedelta(days=30))             .values('created_at__date')             .annotate(daily_total=Sum('total_amount'))             .order_by('created_at__date')
+        recent = OrderSerializer.setup_eager_loading(Order.objects.order_by('-created_at'))[:5]
+        recent_orders = OrderSerializer(recent, many=True).data
 
-        today_earning = revenue
-        in_progress_orders = Order.objects.filter(status='In Progress').count()
-        total_dishes_ordered = OrderItem.objects.filter(order__created_at__date=today).aggregate(total=Sum('quantity'))['total'] or 0
-        active_orders = Order.objects.filter(status__in=['Pending', 'In Progress']).count()
-
-        recent_orders = OrderSerializer(Order.objects.order_by('-created_at')[:5], many=True).data
-
-        popular_dishes = OrderItem.objects.values('dish__name')             .annotate(count=Count('id'))             .order_by('-count')[:5]
+        popular_dishes = [
+            {'dish__name': row['dish_name'], 'count': row['order_count']}
+            for row in top_dishes(by='orders')
+        ]
 
         return Response({
             'overall_performance': {
-                'revenue': revenue,
-                'total_customer': total_customers,
-                'event_count': event_count,
+                'revenue': kpis['revenue'],
+                'total_customer': kpis['total_customer'],
+                'event_count': kpis['event_count'],
             },
-            'sales_details': sales_details,
+            'sales_details': summary['sales_details'],
             'todays_performance': {
-                'today_earning': today_earning,
-                'in_progress': in_progress_orders,
-                'total_customer': total_customers,
-                'total_dishes': total_dishes_ordered,
-                'active_orders': active_orders,
+                'today_earning': kpis['revenue'],
+                'in_progress': kpis['in_progress'],
+                'total_customer': kpis['total_customer'],
+                'total_dishes': kpis['total_dishes'],
+                'active_orders': kpis['active_orders'],
             },
             'recent_orders': recent_orders,
             'popular_dishes': popular_dishes,
         })
+
+    @action(detail=False, methods=['get'], url_path='popular-dishes')
+    def popular_dishes(self, request):
+        """
+        Top dishes from the maintained sales counters:
+        ?window=today|7d|30d|all  ?by=quantity|revenue|orders  ?limit=10
+        """
+        window = request.query_params.get('window', 'all')
+        by = request.query_params.get('by', 'quantity')
+        limit = request.query_params.get('limit', '10')
+        if window not in WINDOWS:
+            return Response({'error': f"window must be one of {', '.join(WINDOWS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        if by not in RANKINGS:
+            return Response({'error': f"by must be one of {', '.join(RANKINGS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        if not limit.isdigit() or not 0 < int(limit) <= 100:
+            return Response({'error': 'limit must be between 1 and 100'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(top_dishes(window=window, by=by, limit=int(limit)))
+
+
+class KitchenQueueView(APIView):
+    """
+    Open tickets (Pending / In Progress) with their items, Takeaway first
+    and then oldest first, served from the in-memory kitchen queue.
+
+    Long-poll with ?version=<last version>&wait=<seconds>: the response is
+    held until the queue changes or the wait (at most 30s) runs out.
+    """
+    MAX_WAIT = 30
+
+    def get(self, request):
+        version = request.query_params.get('version')
+        try:
+            wait = min(float(request.query_params.get('wait', 0)), self.MAX_WAIT)
+        except ValueError:
+            return Response({'error': 'wait must be a number of seconds'}, status=status.HTTP_400_BAD_REQUEST)
+        if version and wait > 0:
+            wait_for_change(version, wait)
+
+        queue = get_queue()
+        return Response({
+            'version': queue.version,
+            'tickets': [
+                {
+                    'id': ticket.id,
+                    'customer_name': ticket.customer_name,
+                    'table': ticket.table_id,
+                    'order_type': ticket.order_type,
+                    'status': ticket.status,
+                    'created_at': ticket.created_at,
+                    'items': [
+                        {'dish': item.dish_id, 'dish_name': item.dish_name, 'quantity': item.quantity}
+                        for item in ticket.items
+                    ],
+                }
+                for ticket in queue.ordered
+            ],
+        })
+
+
+class ExportView(APIView):
+    """
+    GET /api/exports/<orders|earnings>.<csv|ndjson>?start=2026-01-01&end=2026-12-31
+
+    Streams the full history (or the inclusive date range) row by row, read
+    from the database in chunks, so memory stays flat however many rows
+    there are. Orders CSV has one line per item; NDJSON nests the items.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, dataset, export_format):
+        if dataset not in EXPORTS or export_format not in FORMATS:
+            return Response({'error': 'Unknown export'}, status=status.HTTP_404_NOT_FOUND)
+        stream = EXPORTS[dataset](
+            export_format,
+            start=request.query_params.get('start'),
+            end=request.query_params.get('end'),
+        )
+        response = StreamingHttpResponse(stream, content_type=FORMATS[export_format])
+        response['Content-Disposition'] = f'attachment; filename="{dataset}.{export_format}"'
+        response['X-Accel-Buffering'] = 'no'
+        return response
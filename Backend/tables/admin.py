@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Table
+from .models import Reservation, Table
 
 
 @admin.register(Table)
@@ -8,3 +8,11 @@ class TableAdmin(admin.ModelAdmin):
     list_filter = ('status',)
     search_fields = ('table_number', 'customer_name')
     ordering = ('table_number',)
+
+
+@admin.register(Reservation)
+class ReservationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'table', 'customer_name', 'party_size', 'start', 'end', 'status')
+    list_filter = ('status',)
+    search_fields = ('customer_name', 'table__table_number')
+    date_hierarchy = 'start'
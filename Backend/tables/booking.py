@@ -0,0 +1,58 @@
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Table
+
+
+class TableUnavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = {'error': 'Table is not available'}
+    default_code = 'table_unavailable'
+
+
+def _transition(table, condition, **changes):
+    """
+    Apply ``changes`` with a single ``UPDATE ... WHERE <condition>`` so two
+    hosts racing for the same table can't both win. Returns whether the row
+    matched, refreshing ``table`` if it did.
+    """
+    updated = Table.objects.filter(condition, pk=table.pk).update(updated_at=timezone.now(), **changes)
+    if updated:
+        table.refresh_from_db()
+    return bool(updated)
+
+
+def book_table(table, customer_name, booking_time):
+    if not _transition(
+        table,
+        Q(status='Available'),
+        status='Booked',
+        customer_name=customer_name,
+        booking_time=booking_time,
+    ):
+        raise TableUnavailable({'error': 'Table is not available for booking'})
+    return table
+
+
+def free_table(table):
+    """Make the table Available. Returns False if it already was."""
+    return _transition(
+        table,
+        ~Q(status='Available'),
+        status='Available',
+        customer_name=None,
+        booking_time=None,
+    )
+
+
+def occupy_table(table, customer_name):
+    """Seat an order at the table: free, already seated, or booked under its name."""
+    if not _transition(
+        table,
+        Q(status__in=('Available', 'Occupied')) | Q(status='Booked', customer_name=customer_name),
+        status='Occupied',
+    ):
+        raise TableUnavailable({'error': 'Table is booked for another customer'})
+    return table
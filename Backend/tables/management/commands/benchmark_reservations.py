@@ -0,0 +1,112 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.benchmark import percentile
+from tables.models import Reservation, Table
+from tables.reservations import DaySchedule, available_tables
+
+
+class Command(BaseCommand):
+    help = "Benchmark reservation availability queries against a synthetic booking history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reservations", type=int, default=50_000, help="Reservations to create.")
+        parser.add_argument("--tables", type=int, default=300, help="Tables to create.")
+        parser.add_argument("--days", type=int, default=60, help="Days the reservations are spread over.")
+        parser.add_argument("--queries", type=int, default=200, help="Availability lookups to time.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Commit the generated data instead of rolling it back.",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with transaction.atomic():
+            self.seed(rng, options)
+            self.measure(rng, options)
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    def seed(self, rng, options):
+        started = time.monotonic()
+        tables = Table.objects.bulk_create([
+            Table(table_number=f"RB{number}", seats=rng.choice((2, 2, 4, 4, 4, 6, 8, 10)))
+            for number in range(1, options["tables"] + 1)
+        ])
+        first_day = timezone.localdate()
+        reservations = []
+        booked = {}
+        # Random lunch and dinner sittings, skipping any that would clash on
+        # the same table (create_reservation's rule), until the target is hit.
+        while len(reservations) < options["reservations"]:
+            table = rng.choice(tables)
+            day = first_day + timedelta(days=rng.randrange(options["days"]))
+            start = timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(
+                hours=rng.choice((11, 12, 13, 14, 17, 18, 19, 20, 21, 22)),
+                minutes=rng.choice((0, 15, 30, 45)),
+            )
+            end = start + timedelta(minutes=rng.choice((60, 90, 120)))
+            spans = booked.setdefault((table.pk, day), [])
+            if any(start < other_end and end > other_start for other_start, other_end in spans):
+                continue
+            spans.append((start, end))
+            reservations.append(Reservation(
+                table=table,
+                customer_name=f"Guest {rng.randint(1, 5000)}",
+                party_size=rng.randint(1, table.seats),
+                start=start,
+                end=end,
+            ))
+        Reservation.objects.bulk_create(reservations, batch_size=2000)
+        self.stdout.write(
+            f"Seeded {len(tables)} tables and {len(reservations)} reservations "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+        self.first_day = first_day
+
+    def timed(self, label, calls):
+        samples = []
+        for call in calls:
+            started = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        self.stdout.write(
+            f"{label:<38} n={len(samples):<5} p50={percentile(samples, 50):8.2f} ms"
+            f"  p95={percentile(samples, 95):8.2f} ms  max={samples[-1]:8.2f} ms"
+        )
+
+    def measure(self, rng, options):
+        windows = []
+        for _ in range(options["queries"]):
+            day = self.first_day + timedelta(days=rng.randrange(options["days"]))
+            start = timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(
+                hours=rng.randint(11, 22), minutes=rng.choice((0, 30)),
+            )
+            windows.append((start, start + timedelta(minutes=90), rng.randint(1, 8)))
+
+        self.timed("Tables free for a window (indexed)", [
+            lambda window=window: list(available_tables(*window)) for window in windows
+        ])
+        self.timed("Tables free for a window (unbounded)", [
+            lambda window=window: list(
+                Table.objects.filter(seats__gte=window[2]).exclude(
+                    pk__in=Reservation.objects.filter(
+                        status="Confirmed", start__lt=window[1], end__gt=window[0],
+                    ).values("table_id")
+                )
+            )
+            for window in windows
+        ])
+        days = [self.first_day + timedelta(days=rng.randrange(options["days"])) for _ in range(20)]
+        self.timed("Full day of 90 min slots every 30 min", [
+            lambda day=day: DaySchedule(day, rng.randint(1, 8)).slots(timedelta(minutes=90), timedelta(minutes=30))
+            for day in days
+        ])
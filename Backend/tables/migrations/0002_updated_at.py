@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tables', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='table',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -12,6 +12,7 @@ class Table(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Available')
     customer_name = models.CharField(max_length=100, blank=True, null=True)
     booking_time = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.table_number
@@ -21,3 +22,33 @@ class Table(models.Model):
             self.customer_name = None
             self.booking_time = None
         super().save(*args, **kwargs)
+
+
+class Reservation(models.Model):
+    STATUS_CHOICES = (
+        ('Confirmed', 'Confirmed'),
+        ('Cancelled', 'Cancelled'),
+    )
+    table = models.ForeignKey(Table, related_name='reservations', on_delete=models.CASCADE)
+    customer_name = models.CharField(max_length=100)
+    party_size = models.PositiveIntegerField()
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Confirmed')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Overlap lookups are a range scan on start (bounded below by
+            # MAX_RESERVATION_DURATION, see tables.reservations) per table or
+            # across all tables.
+            models.Index(fields=('table', 'start', 'end'), name='reservation_table_start_idx'),
+            models.Index(fields=('start', 'end'), name='reservation_start_end_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(end__gt=models.F('start')), name='reservation_end_after_start'),
+        ]
+
+    def __str__(self):
+        return f"{self.customer_name} at {self.table} from {self.start:%Y-%m-%d %H:%M}"
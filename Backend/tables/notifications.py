@@ -0,0 +1,18 @@
+from core.events import publish
+
+EVENT_TYPES = {
+    'Available': 'table.freed',
+    'Booked': 'table.booked',
+    'Occupied': 'table.occupied',
+}
+
+
+def publish_table_status(table):
+    publish(
+        EVENT_TYPES[table.status],
+        id=table.pk,
+        table_number=table.table_number,
+        status=table.status,
+        customer_name=table.customer_name,
+        booking_time=table.booking_time,
+    )
@@ -0,0 +1,101 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+
+from core.dates import day_bounds
+from .booking import TableUnavailable
+from .models import Reservation, Table
+
+# Longest a reservation may last. Bounding the length lets overlap queries use
+# an index range on ``start`` instead of scanning every earlier booking.
+MAX_RESERVATION_DURATION = timedelta(hours=6)
+
+
+def overlapping(start, end, queryset=None):
+    """Confirmed reservations intersecting [start, end)."""
+    queryset = Reservation.objects.all() if queryset is None else queryset
+    return queryset.filter(
+        status='Confirmed',
+        start__gt=start - MAX_RESERVATION_DURATION,
+        start__lt=end,
+        end__gt=start,
+    )
+
+
+def available_tables(start, end, party_size):
+    """Tables seating ``party_size`` with nothing booked in [start, end), in one query."""
+    return (
+        Table.objects.filter(seats__gte=party_size)
+        .exclude(pk__in=overlapping(start, end).values('table_id'))
+        .order_by('seats', 'table_number')
+    )
+
+
+def create_reservation(table, customer_name, party_size, start, end, exclude=None):
+    """
+    Book ``table`` for [start, end), raising TableUnavailable if it overlaps
+    another confirmed reservation. The table row is locked (where supported)
+    so concurrent requests for the same table are checked one at a time.
+    ``exclude`` is a reservation being moved (or a cancelled one being
+    reinstated), which doesn't clash with itself and ends up Confirmed.
+    """
+    with transaction.atomic():
+        Table.objects.select_for_update().filter(pk=table.pk).exists()
+        clashes = overlapping(start, end, Reservation.objects.filter(table=table))
+        if exclude is not None:
+            clashes = clashes.exclude(pk=exclude.pk)
+        if clashes.exists():
+            raise TableUnavailable({'error': 'Table is already reserved for that time'})
+        reservation = exclude or Reservation(table=table)
+        reservation.table = table
+        reservation.customer_name = customer_name
+        reservation.party_size = party_size
+        reservation.start = start
+        reservation.end = end
+        reservation.status = 'Confirmed'
+        reservation.save()
+    return reservation
+
+
+class DaySchedule:
+    """
+    A day's confirmed reservations, loaded in one query and kept per table as
+    sorted, non-overlapping intervals, so each slot check is a bisect.
+    """
+
+    def __init__(self, day, party_size=1):
+        self.day_start, self.day_end = day_bounds(day)
+        self.tables = list(
+            Table.objects.filter(seats__gte=party_size).order_by('seats', 'table_number').values('id', 'table_number', 'seats')
+        )
+        intervals = defaultdict(list)
+        rows = (
+            overlapping(self.day_start, self.day_end)
+            .filter(table__seats__gte=party_size)
+            .order_by('start')
+            .values_list('table_id', 'start', 'end')
+        )
+        for table_id, start, end in rows:
+            intervals[table_id].append((start, end))
+        self.starts = {table_id: [start for start, _ in spans] for table_id, spans in intervals.items()}
+        self.ends = {table_id: [end for _, end in spans] for table_id, spans in intervals.items()}
+
+    def is_free(self, table_id, start, end):
+        starts = self.starts.get(table_id)
+        if not starts:
+            return True
+        # The only candidate clash is the last reservation starting before ``end``.
+        index = bisect_left(starts, end)
+        return index == 0 or self.ends[table_id][index - 1] <= start
+
+    def slots(self, duration, step):
+        """[(start, end, [table, ...])] for every slot of ``duration`` every ``step``."""
+        slot = self.day_start
+        result = []
+        while slot + duration <= self.day_end:
+            slot_end = slot + duration
+            result.append((slot, slot_end, [table for table in self.tables if self.is_free(table['id'], slot, slot_end)]))
+            slot += step
+        return result
@@ -1,8 +1,52 @@
 from rest_framework import serializers
-from .models import Table
 
+from core.serializers import TimedSerializerMixin
+from .models import Reservation, Table
+from .reservations import MAX_RESERVATION_DURATION, create_reservation
 
-class TableSerializer(serializers.ModelSerializer):
+
+class TableSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Table
         fields = '__all__'
+
+
+class ReservationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Reservation
+        fields = ('id', 'table', 'customer_name', 'party_size', 'start', 'end', 'status', 'created_at', 'updated_at')
+        read_only_fields = ('created_at', 'updated_at')
+
+    def validate(self, attrs):
+        table = attrs.get('table', getattr(self.instance, 'table', None))
+        start = attrs.get('start', getattr(self.instance, 'start', None))
+        end = attrs.get('end', getattr(self.instance, 'end', None))
+        party_size = attrs.get('party_size', getattr(self.instance, 'party_size', None))
+        if start >= end:
+            raise serializers.ValidationError({'end': 'End must be after start.'})
+        if end - start > MAX_RESERVATION_DURATION:
+            raise serializers.ValidationError({'end': f'Reservations can last at most {MAX_RESERVATION_DURATION}.'})
+        if party_size > table.seats:
+            raise serializers.ValidationError({'party_size': f'Table {table} seats {table.seats}.'})
+        return attrs
+
+    def create(self, validated_data):
+        return create_reservation(
+            validated_data['table'],
+            validated_data['customer_name'],
+            validated_data['party_size'],
+            validated_data['start'],
+            validated_data['end'],
+        )
+
+    def update(self, instance, validated_data):
+        if validated_data.get('status', instance.status) == 'Cancelled':
+            return super().update(instance, validated_data)
+        return create_reservation(
+            validated_data.get('table', instance.table),
+            validated_data.get('customer_name', instance.customer_name),
+            validated_data.get('party_size', instance.party_size),
+            validated_data.get('start', instance.start),
+            validated_data.get('end', instance.end),
+            exclude=instance,
+        )
@@ -1,3 +1,208 @@
-from django.test import TestCase
+import io
+import threading
+from datetime import datetime, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+from menu.models import Category, Dish
+from orders.models import Order
+from .models import Reservation, Table
+from .reservations import DaySchedule, available_tables
+
+BOOKING = {'customer_name': 'Asha', 'booking_time': '2030-01-01T19:00:00Z'}
+
+
+class TableBookingTests(APITestCase):
+    def setUp(self):
+        self.table = Table.objects.create(table_number='T1', seats=4)
+        category = Category.objects.create(name='Mains')
+        self.dish = Dish.objects.create(name='Dal', description='', price=Decimal('180.00'), category=category)
+
+    def order(self, customer_name):
+        return self.client.post('/api/orders/', {
+            'table': self.table.pk,
+            'customer_name': customer_name,
+            'items': [{'dish': self.dish.pk, 'quantity': 1}],
+        }, format='json')
+
+    def test_book_then_conflict(self):
+        response = self.client.post(f'/api/tables/{self.table.pk}/book/', BOOKING, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'Booked')
+
+        response = self.client.post(f'/api/tables/{self.table.pk}/book/', BOOKING, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('error', response.data)
+
+    def test_booking_time_validation(self):
+        url = f'/api/tables/{self.table.pk}/book/'
+        for value in ('tonight', '2026-02-30T10:00:00'):
+            response = self.client.post(url, {'customer_name': 'Asha', 'booking_time': value}, format='json')
+            self.assertEqual(response.status_code, 400)
+
+        # A naive time is taken as local time.
+        response = self.client.post(url, {'customer_name': 'Asha', 'booking_time': '2030-01-01T19:00:00'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.table.refresh_from_db()
+        self.assertEqual(
+            self.table.booking_time,
+            timezone.make_aware(datetime(2030, 1, 1, 19)),
+        )
+
+    def test_free_is_idempotent(self):
+        self.client.post(f'/api/tables/{self.table.pk}/book/', BOOKING, format='json')
+        for _ in range(2):
+            response = self.client.post(f'/api/tables/{self.table.pk}/free/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['status'], 'Available')
+            self.assertIsNone(response.data['customer_name'])
+
+    def test_order_occupies_only_its_own_booking(self):
+        self.client.post(f'/api/tables/{self.table.pk}/book/', BOOKING, format='json')
+
+        response = self.order('Ravi')
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Order.objects.exists())
+
+        response = self.order('Asha')
+        self.assertEqual(response.status_code, 201)
+        self.table.refresh_from_db()
+        self.assertEqual(self.table.status, 'Occupied')
+
+        # Another round for the seated party.
+        self.assertEqual(self.order('Asha').status_code, 201)
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    def test_parallel_bookings_have_one_winner(self):
+        table = Table.objects.create(table_number='T1', seats=4)
+        workers = 8
+        barrier = threading.Barrier(workers)
+        statuses = []
+
+        def book(index):
+            try:
+                client = APIClient()
+                barrier.wait()
+                response = client.post(
+                    f'/api/tables/{table.pk}/book/',
+                    {'customer_name': f'Guest {index}', 'booking_time': BOOKING['booking_time']},
+                    format='json',
+                )
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(index,)) for index in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuses), [200] + [409] * (workers - 1))
+        table.refresh_from_db()
+        self.assertEqual(table.status, 'Booked')
+
+
+class ReservationTests(APITestCase):
+    def setUp(self):
+        self.small = Table.objects.create(table_number='T1', seats=2)
+        self.large = Table.objects.create(table_number='T2', seats=6)
+        self.day = timezone.localdate() + timedelta(days=1)
+        self.evening = timezone.make_aware(datetime.combine(self.day, datetime.min.time())) + timedelta(hours=19)
+
+    def reserve(self, table, start, minutes=90, party_size=2):
+        return self.client.post('/api/reservations/', {
+            'table': table.pk,
+            'customer_name': 'Asha',
+            'party_size': party_size,
+            'start': start.isoformat(),
+            'end': (start + timedelta(minutes=minutes)).isoformat(),
+        }, format='json')
+
+    def test_overlap_conflicts_and_adjacent_slots_fit(self):
+        self.assertEqual(self.reserve(self.small, self.evening).status_code, 201)
+
+        response = self.reserve(self.small, self.evening + timedelta(minutes=60))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.reserve(self.small, self.evening + timedelta(minutes=90)).status_code, 201)
+        self.assertEqual(self.reserve(self.large, self.evening).status_code, 201)
+
+    def test_validation(self):
+        self.assertEqual(self.reserve(self.small, self.evening, party_size=4).status_code, 400)
+        self.assertEqual(self.reserve(self.small, self.evening, minutes=8 * 60).status_code, 400)
+
+    def test_cancelled_reservation_frees_the_slot(self):
+        reservation_id = self.reserve(self.small, self.evening).data['id']
+        response = self.client.patch(f'/api/reservations/{reservation_id}/', {'status': 'Cancelled'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.reserve(self.small, self.evening).status_code, 201)
+
+    def test_reinstating_a_cancelled_reservation_checks_overlaps(self):
+        reservation_id = self.reserve(self.small, self.evening).data['id']
+        url = f'/api/reservations/{reservation_id}/'
+        self.client.patch(url, {'status': 'Cancelled'}, format='json')
+        other_id = self.reserve(self.small, self.evening).data['id']
+
+        self.assertEqual(self.client.patch(url, {'status': 'Confirmed'}, format='json').status_code, 409)
+        self.assertEqual(Reservation.objects.get(pk=reservation_id).status, 'Cancelled')
+
+        self.client.patch(f'/api/reservations/{other_id}/', {'status': 'Cancelled'}, format='json')
+        response = self.client.patch(url, {'status': 'Confirmed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'Confirmed')
+        self.assertEqual(Reservation.objects.get(pk=reservation_id).status, 'Confirmed')
+
+    def test_availability_for_window(self):
+        self.reserve(self.small, self.evening)
+        response = self.client.get('/api/reservations/availability/', {
+            'start': (self.evening + timedelta(minutes=30)).isoformat(),
+            'end': (self.evening + timedelta(minutes=120)).isoformat(),
+            'party_size': 2,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([table['id'] for table in response.data], [self.large.pk])
+
+    def test_day_slots_agree_with_window_query(self):
+        self.reserve(self.small, self.evening)
+        self.reserve(self.large, self.evening + timedelta(hours=1), party_size=5)
+
+        response = self.client.get('/api/reservations/availability/', {'date': self.day.isoformat(), 'duration': 90, 'step': 30})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 46)
+        for slot in DaySchedule(self.day).slots(timedelta(minutes=90), timedelta(minutes=30)):
+            start, end, tables = slot
+            self.assertEqual(
+                [table['id'] for table in tables],
+                list(available_tables(start, end, 1).values_list('pk', flat=True)),
+            )
+
+    def test_list_by_date(self):
+        self.reserve(self.small, self.evening)
+        self.reserve(self.small, self.evening + timedelta(days=2))
+        response = self.client.get('/api/reservations/', {'date': self.day.isoformat()})
+        self.assertEqual(len(response.data), 1)
+
+        for value in ('tomorrow', '2026-02-30'):
+            response = self.client.get('/api/reservations/', {'date': value})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('date', response.data)
+
+    def test_availability_rejects_impossible_dates(self):
+        url = '/api/reservations/availability/'
+        self.assertEqual(self.client.get(url, {'date': '2026-02-30'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2026-02-30T10:00', 'end': '2026-03-01T10:00'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2026-03-01T10:00', 'end': '2026-02-30T12:00'}).status_code, 400)
+
+
+class ReservationBenchmarkTests(TestCase):
+    def test_benchmark_rolls_back(self):
+        out = io.StringIO()
+        call_command('benchmark_reservations', '--reservations', '200', '--tables', '5', '--queries', '5', stdout=out)
+        self.assertIn('Seeded 5 tables and 200 reservations', out.getvalue())
+        self.assertFalse(Reservation.objects.exists())
@@ -1,37 +1,131 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from .models import Table
-from .serializers import TableSerializer
+from core.dates import day_bounds
+from core.mixins import ConditionalGetMixin, TombstoneBatchMixin
+from .booking import TableUnavailable, book_table, free_table
+from .models import Reservation, Table
+from .notifications import publish_table_status
+from .reservations import DaySchedule, available_tables, overlapping
+from .serializers import ReservationSerializer, TableSerializer
 
 
-class TableViewSet(viewsets.ModelViewSet):
+class TableViewSet(ConditionalGetMixin, TombstoneBatchMixin, viewsets.ModelViewSet):
     queryset = Table.objects.all()
     serializer_class = TableSerializer
 
+    def perform_update(self, serializer):
+        previous_status = serializer.instance.status
+        table = serializer.save()
+        if table.status != previous_status:
+            publish_table_status(table)
+
     @action(detail=True, methods=['post'])
     def book(self, request, pk=None):
         table = self.get_object()
-        if table.status != 'Available':
-            return Response({'error': 'Table is not available for booking'}, status=status.HTTP_400_BAD_REQUEST)
 
         customer_name = request.data.get('customer_name')
         booking_time = request.data.get('booking_time')
 
         if not customer_name or not booking_time:
             return Response({'error': 'Customer name and booking time are required'}, status=status.HTTP_400_BAD_REQUEST)
+        booking_time = _aware(str(booking_time))
+        if booking_time is None:
+            return Response({'error': 'Booking time must be an ISO 8601 datetime'}, status=status.HTTP_400_BAD_REQUEST)
 
-        table.status = 'Booked'
-        table.customer_name = customer_name
-        table.booking_time = booking_time
-        table.save()
+        try:
+            book_table(table, customer_name, booking_time)
+        except TableUnavailable as exc:
+            return Response(exc.detail, status=exc.status_code)
+        publish_table_status(table)
         return Response(self.get_serializer(table).data)
 
     @action(detail=True, methods=['post'])
     def free(self, request, pk=None):
         table = self.get_object()
-        table.status = 'Available'
-        table.customer_name = None
-        table.booking_time = None
-        table.save()
+        if free_table(table):
+            publish_table_status(table)
         return Response(self.get_serializer(table).data)
+
+
+def _aware(value):
+    """An aware datetime (naive ones are local time), or None if ``value`` isn't one."""
+    try:
+        moment = parse_datetime(value) if value else None
+    except ValueError:
+        # Well formed but impossible, like 2026-02-30T10:00.
+        return None
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def _date(value):
+    try:
+        return parse_date(value) if value else None
+    except ValueError:
+        return None
+
+
+def _positive_int(value, default):
+    try:
+        number = int(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+class ReservationViewSet(ConditionalGetMixin, TombstoneBatchMixin, viewsets.ModelViewSet):
+    """
+    Reservations, filterable by ?date=YYYY-MM-DD (local day) and ?table=<id>.
+    Overlapping bookings for a table are rejected with 409.
+    """
+    queryset = Reservation.objects.order_by('start')
+    serializer_class = ReservationSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        if self.request.query_params.get('date'):
+            day = _date(self.request.query_params['date'])
+            if day is None:
+                raise ValidationError({'date': 'Enter a date (YYYY-MM-DD).'})
+            queryset = overlapping(*day_bounds(day), queryset=queryset)
+        table = self.request.query_params.get('table')
+        if table and table.isdigit():
+            queryset = queryset.filter(table_id=int(table))
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """
+        ?start=&end=&party_size=  tables free for that window, or
+        ?date=&party_size=&duration=90&step=30  free tables per slot of the day.
+        """
+        params = request.query_params
+        party_size = _positive_int(params.get('party_size'), 1)
+        if party_size is None:
+            return Response({'error': 'party_size must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if params.get('date'):
+            day = _date(params['date'])
+            duration = _positive_int(params.get('duration'), 90)
+            step = _positive_int(params.get('step'), 30)
+            if day is None or duration is None or step is None:
+                return Response({'error': 'Expected date=YYYY-MM-DD and positive duration/step minutes'}, status=status.HTTP_400_BAD_REQUEST)
+            schedule = DaySchedule(day, party_size)
+            return Response([
+                {'start': start, 'end': end, 'tables': [table['id'] for table in tables]}
+                for start, end, tables in schedule.slots(timedelta(minutes=duration), timedelta(minutes=step))
+            ])
+
+        start, end = _aware(params.get('start')), _aware(params.get('end'))
+        if start is None or end is None or start >= end:
+            return Response({'error': 'Expected ISO 8601 start and end with start before end'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(TableSerializer(available_tables(start, end, party_size), many=True).data)
@@ -286,9 +286,20 @@ export const addCategory = async (
   return mapCategoryFromApi(response.data);
 };
 
-export const getOrders = async (tables: Table[]): Promise<Order[]> => {
-  const response = await api.get(`${API_BASE_URL}/orders/`);
-  return response.data.map((order: OrderApi) => mapOrderFromApi(order, tables));
+type OrderFilters = {
+  status?: string;
+  order_type?: string;
+  table?: string | number;
+  created_after?: string;
+  created_before?: string;
+  page_size?: number;
+};
+
+// /orders/ is cursor-paginated (newest first); only the first page is loaded.
+export const getOrders = async (tables: Table[], filters: OrderFilters = {}): Promise<Order[]> => {
+  const response = await api.get(`${API_BASE_URL}/orders/`, { params: { page_size: 100, ...filters } });
+  const rows: OrderApi[] = Array.isArray(response.data) ? response.data : response.data.results;
+  return rows.map((order: OrderApi) => mapOrderFromApi(order, tables));
 };
 
 export const getEarnings = async (): Promise<Earning[]> => {
@@ -347,32 +358,27 @@ export const deleteOrder = async (orderId: string): Promise<void> => {
   await api.delete(`${API_BASE_URL}/orders/${orderId}/`);
 };
 
-// Customers are still mocked for now.
-
-let initialCustomers: Customer[] = [
-  {
-    id: "1",
-    name: "Ankur Nanaware",
-    email: "ankur@example.com",
-    phone: "123-456-7890",
-    totalOrders: 5,
-    createdAt: new Date(),
-    updatedAt: new Date(),
-  },
-  {
-    id: "2",
-    name: "John Doe",
-    email: "john@example.com",
-    phone: "098-765-4321",
-    totalOrders: 3,
-    createdAt: new Date(),
-    updatedAt: new Date(),
-  },
-];
-
-const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
-
-export const getCustomers = async (): Promise<Customer[]> => {
-  await sleep(500);
-  return initialCustomers;
+type CustomerApi = {
+  id: number;
+  name: string;
+  phone: string;
+  first_visit: string;
+  last_visit: string;
+  visit_count: number;
+  lifetime_spend: string;
+};
+
+const mapCustomerFromApi = (customer: CustomerApi): Customer => ({
+  id: String(customer.id),
+  name: customer.name,
+  phone: customer.phone || undefined,
+  totalOrders: customer.visit_count,
+  createdAt: new Date(customer.first_visit),
+  updatedAt: new Date(customer.last_visit),
+});
+
+export const getCustomers = async (search?: string): Promise<Customer[]> => {
+  const response = await api.get(`${API_BASE_URL}/customers/`, { params: { page_size: 200, search } });
+  const rows: CustomerApi[] = Array.isArray(response.data) ? response.data : response.data.results;
+  return rows.map(mapCustomerFromApi);
 };